@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from omni_utils.decorators.cache import forget
 from omni_shared import globals
+from core.response_cache import response_cache
 
 class Mutations(BaseModel):
     @staticmethod
@@ -9,6 +10,7 @@ class Mutations(BaseModel):
         try:
             forget(key)
             globals.update()
+            response_cache.clear()
             return True
         except Exception as e:
             print(f"Error invalidating cache: {str(e)}")
@@ -20,6 +22,7 @@ class Mutations(BaseModel):
             for key in keys:
                 forget(key)
             globals.update()
+            response_cache.clear()
             return True
         except Exception as e:
             print(f"Error invalidating multiple cache: {str(e)}")
@@ -28,7 +31,8 @@ class Mutations(BaseModel):
     @staticmethod
     def invalidate_timesheet_cache(after: datetime, before: datetime):
         try:
-            globals.omni_datasets.timesheets.memory.invalidate(after, before)
+            globals.omni_datasets.timesheets.invalidate(after, before)
+            response_cache.clear()
             return True
         except Exception as e:
             print(f"Error invalidating timesheet cache: {str(e)}")
@@ -38,6 +42,7 @@ class Mutations(BaseModel):
     def force_update_globals():
         try:
             globals.update()
+            response_cache.clear()
             return True
         except Exception as e:
             print(f"Error restarting globals: {str(e)}")
@@ -1,5 +1,6 @@
 from ariadne import QueryType, ObjectType
 from core.decorators import collection
+from core.filters import LazyItems
 from omni_shared import globals
 from omni_utils.decorators import cache
 from .models import User, CacheItem
@@ -23,7 +24,7 @@ def resolve_admin_users(obj, info):
         for worker in source
         if worker.email != None
     ]
-    return [User.from_domain(worker) for worker in users]
+    return LazyItems(users, User.from_domain)
 
 @admin.field("user")
 def resolve_admin_user(obj, info, id: str = None, slug: str = None, email: str = None):
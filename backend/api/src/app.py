@@ -7,7 +7,7 @@ from typing import Union, List, Dict, Callable, Tuple
 src_dir = Path(__file__).parent
 sys.path.insert(0, str(src_dir))
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from ariadne import make_executable_schema, graphql_sync, snake_case_fallback_resolvers, QueryType, ObjectType
 from ariadne.explorer import ExplorerGraphiQL
@@ -15,6 +15,8 @@ from ariadne.explorer import ExplorerGraphiQL
 from team.resolvers import team_resolvers
 from engagements.resolvers import engagements_resolvers
 from timesheet.resolvers import query as timesheet_query
+from timesheet.appointments import EXPORT_FORMATS, parse_export_arguments
+from timesheet.service import export_appointments
 from marketing_and_sales.resolvers import marketing_and_sales_resolvers
 from ontology.resolvers import ontology_resolvers
 from admin.resolvers import admin_resolvers
@@ -28,11 +30,13 @@ from financial.schema import init as financial_init
 from admin.schema import init as admin_init
 
 from core.generator import generate_base_schema, GlobalTypeRegistry, to_snake_case
+from core.response_cache import execute_cached, cache_stats
 from omni_shared.settings import auth_settings
 from omni_shared.settings import graphql_settings
+from omni_shared.settings import timesheet_settings
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Total-Count", "X-Next-Cursor"])
 
 def create_schema():
     # Initialize schemas
@@ -104,33 +108,49 @@ schema = create_schema()
 @app.route("/graphql", methods=["POST"])
 def graphql_server():
     data = request.get_json()
+    context = {"request": request}
+
+    def execute(operation):
+        return graphql_sync(
+            schema,
+            operation,
+            context_value=context,
+            debug=app.debug
+        )
 
     # Handle batch requests
     if isinstance(data, list):
         results = []
         for operation in data:
-            success, result = graphql_sync(
-                schema,
-                operation,
-                context_value=request,
-                debug=app.debug
-            )
+            success, result = execute_cached(operation, execute)
             results.append(result)
         return jsonify(results), 200
 
     # Handle single request
-    success, result = graphql_sync(
-        schema,
-        data,
-        context_value=request,
-        debug=app.debug
-    )
+    success, result = execute_cached(data, execute)
     status_code = 200 if success else 400
     return jsonify(result), status_code
 
+@app.route("/graphql/cache", methods=["GET"])
+def graphql_cache_stats():
+    return jsonify(cache_stats()), 200
+
 @app.route("/graphql", methods=["GET"])
 def graphql_playground():
     return ExplorerGraphiQL().html(None), 200
 
+# Appointments straight from the timesheet frame, for grids and exports:
+# ?format=ndjson|arrow|json&filters=[...]&limit=N&cursor=... (next page cursor in X-Next-Cursor)
+@app.route("/timesheet/<slug>/appointments", methods=["GET"])
+def timesheet_appointments_export(slug):
+    try:
+        arguments = parse_export_arguments(request.args, timesheet_settings["export_page_size"])
+        page = export_appointments(slug, arguments["filters"], arguments["cursor"], arguments["limit"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = page.serialize(arguments["format"], timesheet_settings["export_chunk_rows"])
+    return Response(body, mimetype=EXPORT_FORMATS[arguments["format"]], headers=page.headers())
+
 if __name__ == '__main__':
     app.run(debug=True, host="0.0.0.0", port=5001)
@@ -0,0 +1,129 @@
+import asyncio
+import dataclasses
+import decimal
+import inspect
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+
+from ariadne import graphql
+from ariadne.explorer import ExplorerGraphiQL
+from ariadne.resolvers import is_default_resolver
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+from werkzeug.http import http_date
+
+from app import schema
+from core.response_cache import execute_cached_async, cache_stats
+from omni_shared.settings import graphql_settings, timesheet_settings
+from timesheet.appointments import EXPORT_FORMATS, parse_export_arguments
+from timesheet.service import export_appointments
+
+# Datasets and analytics are synchronous and block on upstream APIs; they run
+# here so the event loop keeps serving the other requests in the meantime
+executor = ThreadPoolExecutor(
+    max_workers=graphql_settings["worker_threads"],
+    thread_name_prefix="graphql-resolver"
+)
+
+def offload_blocking_resolvers(resolver, obj, info, **kwargs):
+    """Runs synchronous resolvers in the worker pool; async, default (attribute) and batched resolvers run inline"""
+    if is_default_resolver(resolver) or inspect.iscoroutinefunction(resolver) or getattr(resolver, "_loads_in_batches", False):
+        return resolver(obj, info, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, partial(resolver, obj, info, **kwargs))
+
+def _encode(value):
+    """Values graphql-core hands over as they are, since the DateTime and Date scalars have no serializer"""
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class GraphQLResponse(JSONResponse):
+    """Encodes results as Flask's jsonify did, so both entry points answer alike (dates as HTTP dates)"""
+    def render(self, content) -> bytes:
+        return json.dumps(content, default=_encode, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+async def execute(operation, context: dict, debug: bool):
+    async def run(operation):
+        return await graphql(
+            schema,
+            operation,
+            context_value=context,
+            middleware=[offload_blocking_resolvers],
+            debug=debug
+        )
+    return await execute_cached_async(operation, run)
+
+async def graphql_server(request: Request):
+    data = await request.json()
+    debug = request.app.debug
+    # Shared by the operations of a batch, so they also share entity loaders
+    context = {"request": request}
+
+    # Handle batch requests, running the operations concurrently
+    if isinstance(data, list):
+        outcomes = await asyncio.gather(*(execute(operation, context, debug) for operation in data))
+        return GraphQLResponse([result for _, result in outcomes], status_code=200)
+
+    # Handle single request
+    success, result = await execute(data, context, debug)
+    status_code = 200 if success else 400
+    return GraphQLResponse(result, status_code=status_code)
+
+async def graphql_playground(request: Request):
+    return HTMLResponse(ExplorerGraphiQL().html(None))
+
+async def graphql_cache_stats(request: Request):
+    return JSONResponse(cache_stats())
+
+async def timesheet_appointments_export(request: Request):
+    try:
+        arguments = parse_export_arguments(request.query_params, timesheet_settings["export_page_size"])
+        loop = asyncio.get_running_loop()
+        page = await loop.run_in_executor(executor, partial(
+            export_appointments,
+            request.path_params["slug"],
+            arguments["filters"],
+            arguments["cursor"],
+            arguments["limit"]
+        ))
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    # Chunks are serialized on Starlette's thread pool as they are sent
+    body = page.serialize(arguments["format"], timesheet_settings["export_chunk_rows"])
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[arguments["format"]], headers=page.headers())
+
+app = Starlette(
+    routes=[
+        Route("/graphql", graphql_server, methods=["POST"]),
+        Route("/graphql", graphql_playground, methods=["GET"]),
+        Route("/graphql/cache", graphql_cache_stats, methods=["GET"]),
+        Route("/timesheet/{slug}/appointments", timesheet_appointments_export, methods=["GET"])
+    ],
+    middleware=[Middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Total-Count", "X-Next-Cursor"]
+    )]
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=5001)
@@ -1,14 +1,15 @@
 from functools import wraps
-from typing import Callable, TypeVar, List
+from typing import Callable, TypeVar, List, Union
 
-from .filters import process_collection, FilterInput, SortInput, PaginationInput
+from .filters import process_collection, FilterInput, SortInput, PaginationInput, LazyItems
 
 T = TypeVar('T')
 
-def collection(func: Callable[..., List[T]]) -> Callable:
+def collection(func: Callable[..., Union[List[T], LazyItems[T]]]) -> Callable:
     """
     Decorator that wraps a resolver to handle collection processing.
-    The wrapped function should return a list of items.
+    The wrapped function should return a list of items, or LazyItems so that
+    only the items that end up in the page are converted.
     The decorator will handle filtering, sorting and pagination.
     """
     @wraps(func)
@@ -1,5 +1,6 @@
 from enum import Enum
-from typing import Any, Dict, List, Optional, TypeVar, Generic
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar, Generic, Union
+import operator
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
@@ -48,51 +49,78 @@ class Collection(BaseModel, Generic[T]):
     data: List[T]
     metadata: CollectionMetadata
 
+class LazyItems(Generic[T]):
+    """Domain objects paired with their conversion to the GraphQL model.
+
+    Returned by @collection resolvers so that, when nothing has to be filtered
+    or sorted on the converted fields, only the requested page is converted.
+    """
+    def __init__(self, items: Iterable[Any], convert: Callable[[Any], T]):
+        self.items = list(items)
+        self.convert = convert
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def materialize(self, items: Optional[List[Any]] = None) -> List[T]:
+        return [self.convert(item) for item in (self.items if items is None else items)]
+
+def _to_attribute_name(field: str) -> str:
+    return "".join(["_" + c.lower() if c.isupper() else c for c in field]).lstrip("_").replace(".", "_")
+
+def compile_filter(filter_: FilterInput) -> Callable[[Any], bool]:
+    """Turns a FilterInput tree into a predicate, resolving field names and operators once"""
+    if filter_.and_:
+        predicates = [compile_filter(f) for f in filter_.and_]
+        return lambda item: all(predicate(item) for predicate in predicates)
+    if filter_.or_:
+        predicates = [compile_filter(f) for f in filter_.or_]
+        return lambda item: any(predicate(item) for predicate in predicates)
+    if filter_.not_:
+        predicate = compile_filter(filter_.not_)
+        return lambda item: not predicate(item)
+
+    if not filter_.field or not filter_.value:
+        return lambda item: True
+
+    field_name = _to_attribute_name(filter_.field)
+    op = filter_.value
+
+    # The first operator that is set and applies to the value decides, as numeric
+    # and text operators are skipped for values of other types
+    checks = []
+    if op.eq is not None:
+        checks.append(lambda value: value == op.eq)
+    if op.neq is not None:
+        checks.append(lambda value: value != op.neq)
+    for bound, compare in ((op.gt, operator.gt), (op.gte, operator.ge), (op.lt, operator.lt), (op.lte, operator.le)):
+        if bound is not None:
+            checks.append(lambda value, bound=bound, compare=compare: compare(value, bound) if isinstance(value, (int, float)) else None)
+    if op.contains is not None:
+        needle = op.contains.lower()
+        checks.append(lambda value: needle in value.lower() if isinstance(value, str) else None)
+    if op.range is not None:
+        low, high = op.range.min, op.range.max
+        checks.append(lambda value: not ((low is not None and value < low) or (high is not None and value > high)))
+    if op.is_ is not None:
+        checks.append(lambda value: bool(value) == op.is_)
+
+    def predicate(item: Any) -> bool:
+        value = getattr(item, field_name, None)
+        for check in checks:
+            result = check(value)
+            if result is not None:
+                return result
+        return True
+
+    return predicate
+
 def apply_filters(items: List[T], filter_input: Optional[FilterInput] = None) -> List[T]:
     if not filter_input:
         return items
 
-    def evaluate_filter(item: Any, filter_: FilterInput) -> bool:
-        if filter_.and_:
-            return all(evaluate_filter(item, f) for f in filter_.and_)
-        if filter_.or_:
-            return any(evaluate_filter(item, f) for f in filter_.or_)
-        if filter_.not_:
-            return not evaluate_filter(item, filter_.not_)
-        
-        if not filter_.field or not filter_.value:
-            return True
-
-        field_name = "".join(["_" + c.lower() if c.isupper() else c for c in filter_.field]).lstrip("_").replace(".", "_")
-        value = getattr(item, field_name, None)
-        op = filter_.value
-
-        if op.eq is not None:
-            return value == op.eq
-        if op.neq is not None:
-            return value != op.neq
-        if op.gt is not None and isinstance(value, (int, float)):
-            return value > op.gt
-        if op.gte is not None and isinstance(value, (int, float)):
-            return value >= op.gte
-        if op.lt is not None and isinstance(value, (int, float)):
-            return value < op.lt
-        if op.lte is not None and isinstance(value, (int, float)):
-            return value <= op.lte
-        if op.contains is not None and isinstance(value, str):
-            return op.contains.lower() in value.lower()
-        if op.range is not None:
-            if op.range.min is not None and value < op.range.min:
-                return False
-            if op.range.max is not None and value > op.range.max:
-                return False
-            return True 
-        if op.is_ is not None:
-            return bool(value) == op.is_
-        
-        return True
-
-    return [item for item in items if evaluate_filter(item, filter_input)]
+    predicate = compile_filter(filter_input)
+    return [item for item in items if predicate(item)]
 
 def apply_sort(items: List[T], sort_input: Optional[SortInput] = None) -> List[T]:
     if not sort_input:
@@ -113,12 +141,24 @@ def apply_pagination(items: List[T], pagination_input: Optional[PaginationInput]
     return items[start:end]
 
 def process_collection(
-    items: List[T],
+    items: Union[List[T], LazyItems[T]],
     filter_input: Optional[FilterInput] = None,
     sort_input: Optional[SortInput] = None,
     pagination_input: Optional[PaginationInput] = None
 ) -> Collection[T]:
     total = len(items)
+
+    if isinstance(items, LazyItems):
+        if not filter_input and not sort_input:
+            # Nothing depends on the converted fields: page first, then convert
+            return Collection(
+                data=items.materialize(apply_pagination(items.items, pagination_input)),
+                metadata=CollectionMetadata(
+                    total=total,
+                    filtered=total
+                )
+            )
+        items = items.materialize()
     
     # Apply operations in sequence
     filtered_items = apply_filters(items, filter_input)
@@ -133,4 +173,4 @@ def process_collection(
             total=total,
             filtered=filtered_count
         )
-    ) 
\ No newline at end of file
+    )
@@ -5,6 +5,7 @@ import inspect
 import re
 
 from omni_shared import globals
+from .loaders import get_loaders
 
 class GlobalRepository:
     _instance = None
@@ -44,16 +45,59 @@ class GlobalRepository:
             from engagements.models import Case
             return Case.from_domain(globals.omni_models.cases.get_by_slug(slug))
     
+    def get_many_by_id(self, type_name: str, ids: List[str]) -> Dict[str, Any]:
+        if type_name == "Client":
+            entities = globals.omni_models.clients.get_many_by_id(ids)
+        elif type_name == "Case":
+            entities = globals.omni_models.cases.get_many_by_id(ids)
+        else:
+            return {id: None for id in ids}
+
+        return {
+            id: entity if entity is not None else KeyError(f'No {type_name.lower()} with id {id}')
+            for id, entity in entities.items()
+        }
+
+    def get_many_by_slug(self, type_name: str, slugs: List[str]) -> Dict[str, Any]:
+        if type_name == "AccountManager":
+            from team.models import AccountManager
+            return self._convert_many(AccountManager.from_domain, globals.omni_models.workers.get_many_by_slug(slugs))
+        elif type_name == "ConsultantOrEngineer":
+            from team.models import ConsultantOrEngineer
+            return self._convert_many(ConsultantOrEngineer.from_domain, globals.omni_models.workers.get_many_by_slug(slugs))
+        elif type_name == "Client":
+            from engagements.models import Client
+            return self._convert_many(Client.from_domain, globals.omni_models.clients.get_many_by_slug(slugs))
+        elif type_name == "Sponsor":
+            from engagements.models import Sponsor
+            return self._convert_many(Sponsor.from_domain, globals.omni_models.sponsors.get_many_by_slug(slugs))
+        elif type_name == "Case":
+            from engagements.models import Case
+            return self._convert_many(Case.from_domain, globals.omni_models.cases.get_many_by_slug(slugs))
+        return {slug: None for slug in slugs}
+
+    def _convert_many(self, convert: Callable[[Any], Any], entities: Dict[str, Any]) -> Dict[str, Any]:
+        """Converts each entity found; a failed conversion is returned as its exception so it only fails its own field"""
+        result = {}
+        for key, entity in entities.items():
+            try:
+                result[key] = convert(entity)
+            except Exception as e:
+                result[key] = e
+        return result
+
     def get_resolver_by_id(self, entity_name: str, field_name: str):
         def resolver(parent, info):
             value = self._get_value(parent, field_name)
-            return self._instance.get_by_id(entity_name, value) if value else None
+            return get_loaders(info, self._instance).by_id(entity_name).load(value) if value else None
+        resolver._loads_in_batches = True
         return resolver
 
     def get_resolver_by_slug(self, entity_name: str, field_name: str):
         def resolver(parent, info):
             value = self._get_value(parent, field_name)
-            return self._instance.get_by_slug(entity_name, value) if value else None
+            return get_loaders(info, self._instance).by_slug(entity_name).load(value) if value else None
+        resolver._loads_in_batches = True
         return resolver
               
 
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class DataLoader:
+    """
+    Request-scoped loader for entities referenced from many parents.
+    Each key is looked up once per request and the result is cached.
+    Under async execution, the keys requested while the current field level
+    is being resolved are collected and fetched together in one batch, off
+    the event loop. Without a running loop (graphql_sync) the lookup happens
+    right away.
+    """
+    def __init__(self, batch_load: Callable[[List[Hashable]], Dict[Hashable, Any]]):
+        self.batch_load = batch_load
+        self.cache: Dict[Hashable, Any] = {}
+        self.pending: Dict[Hashable, asyncio.Future] = {}
+
+    def load(self, key: Hashable) -> Any:
+        if key in self.cache:
+            return self.cache[key]
+
+        loop = self._running_loop()
+        if loop is None:
+            value = self.batch_load([key]).get(key)
+            if isinstance(value, Exception):
+                raise value
+            self.cache[key] = value
+            return value
+
+        future = loop.create_future()
+        self.cache[key] = future
+        if not self.pending:
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch(loop)))
+        self.pending[key] = future
+        return future
+
+    @staticmethod
+    def _running_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop):
+        batch, self.pending = self.pending, {}
+        try:
+            values = await loop.run_in_executor(None, self.batch_load, list(batch))
+        except Exception as e:
+            for key, future in batch.items():
+                self.cache.pop(key, None)
+                future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            value = values.get(key)
+            if isinstance(value, Exception):
+                self.cache.pop(key, None)
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+
+class EntityLoaders:
+    """The DataLoaders of one request, one per entity type and lookup field"""
+    def __init__(self, repository):
+        self.repository = repository
+        self.loaders: Dict[tuple, DataLoader] = {}
+
+    def by_id(self, type_name: str) -> DataLoader:
+        return self._get('id', type_name, self.repository.get_many_by_id)
+
+    def by_slug(self, type_name: str) -> DataLoader:
+        return self._get('slug', type_name, self.repository.get_many_by_slug)
+
+    def _get(self, field: str, type_name: str, get_many: Callable) -> DataLoader:
+        loader = self.loaders.get((field, type_name))
+        if loader is None:
+            loader = DataLoader(lambda keys: get_many(type_name, keys))
+            self.loaders[(field, type_name)] = loader
+        return loader
+
+
+def get_loaders(info, repository) -> EntityLoaders:
+    """Loaders of the request being resolved, kept in the context dict"""
+    context = info.context
+    if not isinstance(context, dict):
+        return EntityLoaders(repository)
+
+    loaders = context.get('loaders')
+    if loaders is None:
+        loaders = context['loaders'] = EntityLoaders(repository)
+    return loaders
@@ -0,0 +1,72 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+    def as_result(self) -> Dict:
+        return {"errors": [{"message": str(self), "extensions": {"code": self.code}}]}
+
+
+class PersistedQueries:
+    """
+    Query documents registered by their SHA-256, following Apollo's automatic
+    persisted queries protocol: a client sends only
+    `extensions.persistedQuery.sha256Hash` and, when the hash is unknown,
+    retries once with the full query, which registers it.
+    """
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._queries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, operation: Dict) -> Dict:
+        """Returns the operation with its query document filled in; raises PersistedQueryError"""
+        persisted = (operation.get("extensions") or {}).get("persistedQuery")
+        if not isinstance(persisted, dict):
+            return operation
+
+        sha256 = persisted.get("sha256Hash")
+        query = operation.get("query")
+        if query:
+            if query_hash(query) != sha256:
+                raise PersistedQueryError("provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH")
+            self._register(sha256, query)
+            return operation
+
+        query = self._get(sha256)
+        if query is None:
+            raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        return {**operation, "query": query}
+
+    def _get(self, sha256: str) -> Optional[str]:
+        with self._lock:
+            query = self._queries.get(sha256)
+            if query is None:
+                self.misses += 1
+                return None
+            self._queries.move_to_end(sha256)
+            self.hits += 1
+            return query
+
+    def _register(self, sha256: str, query: str):
+        with self._lock:
+            self._queries[sha256] = query
+            self._queries.move_to_end(sha256)
+            while len(self._queries) > self.max_entries:
+                self._queries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._queries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,153 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from graphql import GraphQLError, OperationType, get_operation_ast, parse
+
+from omni_shared import globals
+from omni_shared.settings import graphql_settings
+from .persisted_queries import PersistedQueries, PersistedQueryError, query_hash
+
+logger = logging.getLogger(__name__)
+
+
+def data_version() -> Hashable:
+    """Identifies the data responses are computed from; timesheet refetches and invalidations change it"""
+    return globals.omni_datasets.timesheets.get_data_version()
+
+
+class ResponseCache:
+    """
+    Responses of read-only GraphQL operations, keyed by query hash, operation
+    name, variables and data version, bounded by LRU and by age. A rebuild of
+    the models (globals.update) clears it.
+    """
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Dict]]' = OrderedDict()
+        self._operation_kinds: Dict[Tuple[str, Optional[str]], Optional[OperationType]] = {}
+        self._scope = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, operation: Dict) -> Optional[Hashable]:
+        """Cache key of an operation, or None when its response must not be cached"""
+        query = operation.get("query")
+        if not isinstance(query, str):
+            return None
+
+        sha256 = query_hash(query)
+        operation_name = operation.get("operationName")
+        if self._operation_kind(sha256, query, operation_name) != OperationType.QUERY:
+            return None
+
+        try:
+            variables = json.dumps(operation.get("variables") or {}, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return sha256, operation_name, variables, data_version()
+
+    def _operation_kind(self, sha256: str, query: str, operation_name: Optional[str]) -> Optional[OperationType]:
+        kind_key = (sha256, operation_name)
+        if kind_key not in self._operation_kinds:
+            if len(self._operation_kinds) >= 4 * self.max_entries:
+                self._operation_kinds.clear()
+            try:
+                operation = get_operation_ast(parse(query), operation_name)
+            except GraphQLError:
+                operation = None
+            self._operation_kinds[kind_key] = operation.operation if operation else None
+        return self._operation_kinds[kind_key]
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            self._check_scope()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, result: Dict):
+        with self._lock:
+            self._check_scope()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_scope(self):
+        if globals.omni_models is not self._scope:
+            self._entries.clear()
+            self._scope = globals.omni_models
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        logger.info("GraphQL response cache cleared")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+persisted_queries = PersistedQueries(graphql_settings["persisted_queries_size"])
+response_cache = ResponseCache(graphql_settings["response_cache_size"], graphql_settings["response_cache_ttl_seconds"])
+
+
+def _prepare(operation: Any) -> Tuple[Any, Optional[Hashable], Optional[Tuple[bool, Dict]]]:
+    """Resolves a persisted query and looks its response up; the last item is set when execution can be skipped"""
+    if not isinstance(operation, dict):
+        return operation, None, None
+
+    try:
+        operation = persisted_queries.resolve(operation)
+    except PersistedQueryError as e:
+        # A miss is answered with 200, as clients only retry with the full query on a successful response
+        return operation, None, (e.code == "PERSISTED_QUERY_NOT_FOUND", e.as_result())
+
+    key = response_cache.key_for(operation)
+    cached = response_cache.get(key) if key is not None else None
+    return operation, key, ((True, cached) if cached is not None else None)
+
+def _store(key: Optional[Hashable], success: bool, result: Dict):
+    if key is not None and success and not result.get("errors"):
+        response_cache.put(key, result)
+
+def execute_cached(operation: Any, execute: Callable[[Any], Tuple[bool, Dict]]) -> Tuple[bool, Dict]:
+    operation, key, response = _prepare(operation)
+    if response is not None:
+        return response
+
+    success, result = execute(operation)
+    _store(key, success, result)
+    return success, result
+
+async def execute_cached_async(operation: Any, execute: Callable[[Any], Awaitable[Tuple[bool, Dict]]]) -> Tuple[bool, Dict]:
+    operation, key, response = _prepare(operation)
+    if response is not None:
+        return response
+
+    success, result = await execute(operation)
+    _store(key, success, result)
+    return success, result
+
+def cache_stats() -> Dict:
+    return {
+        "response_cache": response_cache.stats(),
+        "persisted_queries": persisted_queries.stats()
+    }
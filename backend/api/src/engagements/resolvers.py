@@ -1,6 +1,7 @@
 from ariadne import QueryType, ObjectType
 from .models import Client, Sponsor, Case, Project
 from core.decorators import collection
+from core.filters import LazyItems
 from omni_shared import globals
 from timesheet.resolvers import compute_timesheet, build_fields_map
 query = QueryType()
@@ -20,7 +21,7 @@ def resolve_engagements(*_):
 @collection
 def resolve_engagements_clients(obj, info):
     source = globals.omni_models.clients.get_all().values()
-    return [Client.from_domain(client) for client in source]
+    return LazyItems(source, Client.from_domain)
 
 @engagements.field("client")
 def resolve_engagements_client(obj, info, id: str = None, slug: str = None):
@@ -40,7 +41,7 @@ def resolve_engagements_client(obj, info, id: str = None, slug: str = None):
 @collection
 def resolve_engagements_sponsors(obj, info):
     source = globals.omni_models.sponsors.get_all().values()
-    return [Sponsor.from_domain(sponsor) for sponsor in source]
+    return LazyItems(source, Sponsor.from_domain)
 
 @engagements.field("sponsor")
 def resolve_engagements_sponsor(obj, info, id: str = None, slug: str = None):
@@ -60,7 +61,7 @@ def resolve_engagements_sponsor(obj, info, id: str = None, slug: str = None):
 @collection
 def resolve_engagements_cases(obj, info):
     source = globals.omni_models.cases.get_all().values()
-    return [Case.from_domain(case) for case in source]
+    return LazyItems(source, Case.from_domain)
 
 @engagements.field("case")
 def resolve_engagements_case(obj, info, id: str = None, slug: str = None):
@@ -80,7 +81,7 @@ def resolve_engagements_case(obj, info, id: str = None, slug: str = None):
 @collection
 def resolve_engagements_projects(obj, info):
     source = globals.omni_models.tracker.all_projects.values()
-    return [Project.from_domain(project) for project in source]
+    return LazyItems(source, Project.from_domain)
 
 @engagements.field("project")
 def resolve_engagements_project(obj, info, id: str = None, slug: str = None):
@@ -118,11 +119,10 @@ def resolve_client_timesheet(obj, info, slug: str = None, filters = None):
 def resolve_client_active_cases(obj, info):
     source = globals.omni_models.cases.get_all().values()
     source = filter(lambda case: case.client_id == obj["id"], source)
-    return [
-        Case.from_domain(case) 
-        for case in source
-        if case.is_active
-    ]
+    return LazyItems(
+        (case for case in source if case.is_active),
+        Case.from_domain
+    )
     
     
 @sponsor.field("timesheet")
@@ -1,6 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from omni_shared import globals
-import holidays
+from omni_utils.helpers.business_calendar import get_holidays, get_working_days
 
 def compute_staleliness(worker_slug: str = None):
     from .models import Staleliness, StalelinessCaseInfo
@@ -115,7 +115,7 @@ def compute_allocation(start_date=None, end_date=None, filters=None):
     by_kind = {normalized: [] for normalized in kind_map.values()}
 
     # Process allocations in one pass
-    daily_allocation = df.groupby(['Date', 'Kind'])['TimeInHs'].sum()
+    daily_allocation = df.groupby(['Date', 'Kind'], observed=True)['TimeInHs'].sum()
     
     for (date, kind), hours in daily_allocation.items():
         if normalized_kind := kind_map.get(kind):
@@ -139,29 +139,14 @@ def compute_business_calendar(start, end):
         start = datetime.strptime(start, '%Y-%m-%d').date()
     if isinstance(end, str):
         end = datetime.strptime(end, '%Y-%m-%d').date()
-        
-    br_holidays = holidays.BR()
-    
-    working_days = []
-    current = start
-    while current <= end:
-        if current not in br_holidays and current.weekday() < 5:
-            working_days.append(current)
-        current += timedelta(days=1)
-    
-    holidays_in_range = []
-    current = start 
-    while current <= end:
-        if current in br_holidays:
-            holidays_in_range.append(
-                Holiday(
-                    date=current,
-                    reason=br_holidays.get(current)
-                )
-            )
-        current += timedelta(days=1)
-    
+
     return BusinessCalendar(
-        working_days=working_days,
-        holidays=holidays_in_range
-    )
\ No newline at end of file
+        working_days=get_working_days(start, end),
+        holidays=[
+            Holiday(
+                date=day,
+                reason=reason
+            )
+            for day, reason in get_holidays(start, end)
+        ]
+    )
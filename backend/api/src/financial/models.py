@@ -6,7 +6,7 @@ from core.decorators import namespace
 from omni_models.analytics.revenue_tracking import RevenueTracking, compute_revenue_tracking
 from omni_models.analytics.forecast import RevenueForecast, compute_forecast
 
-from omni_utils.helpers.dates import get_working_days_in_month
+from omni_utils.helpers.business_calendar import count_working_days_in_month
 from omni_utils.helpers.dates import get_last_day_of_month
 
 from datetime import datetime
@@ -38,7 +38,7 @@ class YearlyRevenueForecast(BaseModel):
 @namespace
 class Financial(BaseModel):
     def revenue_tracking(self, date_of_interest: date = None, filters: Optional[List[FilterableField]] = None) -> RevenueTracking:
-        return compute_revenue_tracking(date_of_interest, filters)
+        return compute_revenue_tracking(date_of_interest, filters=filters)
     
     def revenue_forecast(self, date_of_interest: date = None, filters: Optional[List[FilterableField]] = None) -> RevenueForecast:           
         return compute_forecast(date_of_interest, filters)
@@ -89,7 +89,7 @@ class Financial(BaseModel):
             month_data = YearlyRevenueForecastByMonth(
                 month=m,
                 goal=goal,
-                working_days=len(get_working_days_in_month(y, m)),
+                working_days=count_working_days_in_month(y, m),
                 expected_consulting_fee=reference.by_kind.consulting.totals.expected,
                 expected_squad_fee=reference.by_kind.squad.totals.in_analysis,
                 expected_hands_on_fee=reference.by_kind.hands_on.totals.in_analysis,
@@ -105,7 +105,7 @@ class Financial(BaseModel):
             
             main_goal -= discount
             
-        total_working_days = sum(len(get_working_days_in_month(y, m)) for m in range(1, 13))
+        total_working_days = sum(count_working_days_in_month(y, m) for m in range(1, 13))
         
         realized_working_days = 0
         current_date = datetime.now()
@@ -115,10 +115,9 @@ class Financial(BaseModel):
             m = month - 1 if month > 1 else 12
             
             if y < current_date.year or (y == current_date.year and m < current_date.month):
-                realized_working_days += len(get_working_days_in_month(y, m))
+                realized_working_days += count_working_days_in_month(y, m)
             elif y == current_date.year and m == current_date.month:
-                working_days = get_working_days_in_month(y, m)
-                realized_working_days += sum(1 for day in working_days if day.date() <= current_date.date())
+                realized_working_days += count_working_days_in_month(y, m, current_date.day)
         
         return YearlyRevenueForecast(
             year=year,
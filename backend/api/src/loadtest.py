@@ -0,0 +1,109 @@
+"""Measures GraphQL throughput and latency of a running API server.
+
+Run it against the Flask server (`python app.py`) and the ASGI one
+(`uvicorn asgi:app --port 5001`) with the same arguments to compare them:
+
+    python loadtest.py --url http://localhost:5001/graphql --concurrency 16 --requests 400
+    python loadtest.py --query-file forecast.graphql --batch 4
+
+By default it mixes a cheap query with a slow one, which is where a blocked
+worker shows up as latency on everything else.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_QUERIES = [
+    "{ version }",
+    "{ financial { yearlyRevenueForecast(year: %d) { goal workingDays realizedWorkingDays } } }" % time.localtime().tm_year
+]
+
+
+def post(url: str, payload, timeout: float) -> Optional[str]:
+    """Sends one request; returns an error description, or None when it succeeded"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return f"HTTP {e.code}"
+    except Exception as e:
+        return type(e).__name__
+
+    results = body if isinstance(body, list) else [body]
+    if any(result.get("errors") for result in results):
+        return "GraphQL errors"
+    return None
+
+
+def run(url: str, queries: List[str], concurrency: int, total: int, batch: int, timeout: float) -> Dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(i: int):
+        operations = [{"query": queries[(i + j) % len(queries)]} for j in range(batch)]
+        payload = operations if batch > 1 else operations[0]
+
+        started = time.perf_counter()
+        error = post(url, payload, timeout)
+        elapsed = time.perf_counter() - started
+
+        with lock:
+            latencies.append(elapsed)
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": total,
+        "operations": total * batch,
+        "duration_s": round(duration, 2),
+        "requests_per_s": round(total / duration, 2),
+        "p50_ms": round(quantiles[49] * 1000, 1),
+        "p95_ms": round(quantiles[94] * 1000, 1),
+        "p99_ms": round(quantiles[98] * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1),
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5001/graphql")
+    parser.add_argument("--query", action="append", help="GraphQL query to send; repeat to mix several")
+    parser.add_argument("--query-file", action="append", help="File holding one GraphQL query; repeat to mix several")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--batch", type=int, default=1, help="Operations per request; above 1 sends batched requests")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    queries = list(args.query or [])
+    for filename in args.query_file or []:
+        with open(filename) as f:
+            queries.append(f.read())
+
+    report = run(args.url, queries or DEFAULT_QUERIES, args.concurrency, args.requests, args.batch, args.timeout)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 from ariadne import QueryType, ObjectType
 from .models import Offer, ActiveDeal
 from core.decorators import collection
+from core.filters import LazyItems
 from omni_shared import globals
 
 from engagements.models import Client
@@ -20,10 +21,10 @@ def resolve_marketing_and_sales(*_):
 @marketing_and_sales.field("offers")
 @collection
 def resolve_marketing_and_sales_offers(obj, info):
-    return [
-        Offer.from_domain(offer)
-        for offer in globals.omni_models.products_or_services.get_all().values()
-    ]
+    return LazyItems(
+        globals.omni_models.products_or_services.get_all().values(),
+        Offer.from_domain
+    )
 
 @marketing_and_sales.field("offer")
 def resolve_marketing_and_sales_offer(obj, info, id=None, slug=None):
@@ -42,10 +43,10 @@ def resolve_marketing_and_sales_offer(obj, info, id=None, slug=None):
 @marketing_and_sales.field("activeDeals")
 @collection
 def resolve_marketing_and_sales_active_deals(obj, info):
-    return [
-        ActiveDeal.from_domain(active_deal)
-        for active_deal in globals.omni_models.active_deals.get_all()
-    ]
+    return LazyItems(
+        globals.omni_models.active_deals.get_all(),
+        ActiveDeal.from_domain
+    )
 
 @offer.field("timesheet")
 def resolve_offer_timesheet(obj, info, slug: str = None, filters = None):
@@ -1,5 +1,6 @@
 from ariadne import QueryType, ObjectType
 from core.decorators import collection
+from core.filters import LazyItems
 from .models import Class
 
 from omni_shared import globals
@@ -24,7 +25,7 @@ def resolve_ontology(*_):
 @collection
 def resolve_classes(obj, info):
     classes = globals.omni_models.ontology.classes
-    return [convert_ontology_class_to_model(c) for c in classes]
+    return LazyItems(classes, convert_ontology_class_to_model)
 
 @ontology.field("class")
 def resolve_class(obj, info, id: str = None, slug: str = None):
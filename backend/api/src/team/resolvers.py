@@ -6,6 +6,7 @@ from utils.fields import build_fields_map
 from omni_shared import globals
 from omni_models.domain import WorkerKind
 from core.decorators import collection
+from core.filters import LazyItems
 
 query = QueryType()
 team = ObjectType("Team")
@@ -56,7 +57,7 @@ def resolve_consultant_or_engineer_timesheet(obj, info, slug: str = None, filter
 @collection
 def resolve_team_account_managers(obj, info):
     source = globals.omni_models.workers.get_all(WorkerKind.ACCOUNT_MANAGER).values()
-    return [AccountManager.from_domain(worker) for worker in source]
+    return LazyItems(source, AccountManager.from_domain)
 
 @team.field("accountManager")
 def resolve_team_account_manager(obj, info, id: str = None, slug: str = None):
@@ -79,7 +80,7 @@ def resolve_team_consultants_or_engineers(obj, info):
         worker for worker in globals.omni_models.workers.get_all().values()
         if worker.kind == WorkerKind.CONSULTANT
     ]
-    return [ConsultantOrEngineer.from_domain(worker) for worker in source]
+    return LazyItems(source, ConsultantOrEngineer.from_domain)
 
 @team.field("consultantOrEngineer")
 def resolve_team_consultant_or_engineer(obj, info, id: str = None, slug: str = None):
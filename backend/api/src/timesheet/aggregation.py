@@ -0,0 +1,325 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.generator import to_camel_case, to_snake_case
+
+from .models import (
+    TimesheetSummary,
+    TimesheetByKind,
+    NamedTimesheetSummary,
+    TitledTimesheetSummary,
+    WeekTimesheetSummary,
+    WeeklyHours
+)
+
+# Columns behind the unique_* counts
+UNIQUE_COLUMNS = {
+    'unique_clients': 'ClientId',
+    'unique_workers': 'WorkerSlug',
+    'unique_cases': 'CaseId',
+    'unique_working_days': 'Date',
+    'unique_sponsors': 'Sponsor',
+    'unique_account_managers': 'AccountManagerSlug',
+    'unique_weeks': 'Week'
+}
+
+# Columns behind the average_hours_per_* / std_dev_hours_per_* pairs. These
+# have always been the mean and deviation of the entries of the first group
+# (in key order) of the column, and are kept that way.
+PER_GROUP_COLUMNS = {
+    'day': 'Date',
+    'worker': 'WorkerSlug',
+    'client': 'ClientId',
+    'case': 'CaseId',
+    'sponsor': 'Sponsor',
+    'account_manager': 'AccountManagerSlug',
+    'week': 'Week'
+}
+
+KIND_TOTALS = {
+    'total_squad_hours': 'Squad',
+    'total_consulting_hours': 'Consulting',
+    'total_internal_hours': 'Internal',
+    'total_hands_on_hours': 'HandsOn'
+}
+
+# byKind lists the kinds in this order, under these labels
+KIND_LABELS = {
+    'Internal': 'internal',
+    'Consulting': 'consulting',
+    'Squad': 'squad',
+    'HandsOn': 'hands_on'
+}
+
+KIND_FIELDS = {kind: to_camel_case(label) for kind, label in KIND_LABELS.items()}
+
+ALL_FIELDS = frozenset(TimesheetSummary.model_fields)
+
+
+def requested_fields(map: Optional[Dict]) -> Set[str]:
+    """Summary attributes selected by a fields map; everything when there is no map"""
+    if map is None:
+        return set(ALL_FIELDS)
+    return {to_snake_case(field) for field in map}
+
+def _item_selection(map: Optional[Dict]) -> Optional[Dict]:
+    """Fields selected on the items of a collection field (`byWorker { data { ... } }`)"""
+    if map is None:
+        return None
+    return map.get('data') or {}
+
+def _week_start_key(week: str) -> Tuple[int, int]:
+    day, month = week.split(' - ')[0].split('/')
+    return int(month), int(day)
+
+
+@dataclass
+class Groups:
+    """
+    A partition of (some of) the frame rows. `ids` holds the group of each
+    row in `rows`, which stay in frame order; `parents` holds, for each
+    group, the group it was split from.
+    """
+    rows: np.ndarray
+    ids: np.ndarray
+    count: int
+    keys: List[Any]
+    parents: np.ndarray
+
+
+class TimesheetAggregator:
+    """
+    Computes the timesheet summaries of a frame for every requested dimension
+    and nested dimension. Each grouping column is factorized once; each level
+    of nesting is then summarized for all of its groups together, and only
+    the fields present in the fields map are computed.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.hours = df['TimeInHs'].to_numpy(dtype=float)
+        self._factorized: Dict[str, Tuple[np.ndarray, List[Any]]] = {}
+
+        n = len(df)
+        self.root = Groups(
+            rows=np.arange(n),
+            ids=np.zeros(n, dtype=np.intp),
+            count=1 if n else 0,
+            keys=[None] if n else [],
+            parents=np.zeros(1 if n else 0, dtype=np.intp)
+        )
+
+    def summary(self, map: Optional[Dict]) -> TimesheetSummary:
+        if self.root.count == 0:
+            return TimesheetSummary()
+        return TimesheetSummary(**self._stats(self.root, requested_fields(map))[0])
+
+    def by_kind(self, map: Optional[Dict]) -> TimesheetByKind:
+        if self.root.count == 0:
+            return TimesheetByKind()
+        return self._by_kind(self.root, map)[0]
+
+    def by_group(
+        self,
+        column: str,
+        map: Optional[Dict],
+        name_key: str = "name",
+        summary_class: type = NamedTimesheetSummary
+    ) -> List[NamedTimesheetSummary]:
+        if self.root.count == 0:
+            return []
+        return self._by_group(self.root, column, map, name_key, summary_class)[0]
+
+    def by_week(self, map: Optional[Dict]) -> List[WeekTimesheetSummary]:
+        if self.root.count == 0:
+            return []
+        return self._by_week(self.root, map)[0]
+
+    def _factorize(self, column: str) -> Tuple[np.ndarray, List[Any]]:
+        """Codes of a column in key order, as groupby sorts them; missing values get -1"""
+        if column not in self._factorized:
+            codes, uniques = pd.factorize(self.df[column], sort=True)
+            self._factorized[column] = (codes, pd.Index(uniques).tolist())
+        return self._factorized[column]
+
+    def _pairs(self, groups: Groups, column: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """(group, code) of the rows that have a value, packed into one integer, and the mask of those rows"""
+        codes, uniques = self._factorize(column)
+        codes = codes[groups.rows]
+        valid = codes >= 0
+        width = max(len(uniques), 1)
+        return groups.ids[valid].astype(np.int64) * width + codes[valid], valid, width
+
+    def _split(self, groups: Groups, column: str) -> Groups:
+        """Splits every group by the values of a column"""
+        pairs, valid, width = self._pairs(groups, column)
+        unique_pairs, ids = np.unique(pairs, return_inverse=True)
+        uniques = self._factorize(column)[1]
+        return Groups(
+            rows=groups.rows[valid],
+            ids=ids.reshape(-1),
+            count=len(unique_pairs),
+            keys=[uniques[code] for code in (unique_pairs % width).tolist()],
+            parents=(unique_pairs // width).astype(np.intp)
+        )
+
+    @staticmethod
+    def _mean_std(ids: np.ndarray, hours: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean and sample deviation of each group; 0 where they are undefined"""
+        entries = np.bincount(ids, minlength=count)
+        sums = np.bincount(ids, weights=hours, minlength=count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sums / entries
+            deviations = hours - mean[ids]
+            std = np.sqrt(np.bincount(ids, weights=deviations * deviations, minlength=count) / (entries - 1))
+        mean = np.where(np.isfinite(mean), mean, 0.0)
+        std = np.where((entries > 1) & np.isfinite(std), std, 0.0)
+        return mean, std
+
+    def _stats(self, groups: Groups, fields: Set[str]) -> List[Dict[str, Any]]:
+        """Summary attributes of every group, limited to the requested fields"""
+        count, ids = groups.count, groups.ids
+        hours = self.hours[groups.rows]
+
+        columns = {
+            'total_entries': np.bincount(ids, minlength=count),
+            'total_hours': np.bincount(ids, weights=hours, minlength=count)
+        }
+
+        if fields & {'average_hours_per_entry', 'std_dev_hours_per_entry'}:
+            columns['average_hours_per_entry'], columns['std_dev_hours_per_entry'] = self._mean_std(ids, hours, count)
+
+        for field, column in UNIQUE_COLUMNS.items():
+            if field in fields:
+                pairs, _, width = self._pairs(groups, column)
+                columns[field] = np.bincount(np.unique(pairs) // width, minlength=count)
+
+        for suffix, column in PER_GROUP_COLUMNS.items():
+            mean_field, std_field = f'average_hours_per_{suffix}', f'std_dev_hours_per_{suffix}'
+            if mean_field in fields or std_field in fields:
+                codes = self._factorize(column)[0][groups.rows]
+                valid = codes >= 0
+                first = np.full(count, np.iinfo(codes.dtype).max, dtype=codes.dtype)
+                np.minimum.at(first, ids[valid], codes[valid])
+                selected = valid & (codes == first[ids])
+                columns[mean_field], columns[std_field] = self._mean_std(ids[selected], hours[selected], count)
+
+        kind_fields = [field for field in KIND_TOTALS if field in fields]
+        if kind_fields:
+            codes, uniques = self._factorize('Kind')
+            codes = codes[groups.rows]
+            for field in kind_fields:
+                kind = KIND_TOTALS[field]
+                selected = codes == uniques.index(kind) if kind in uniques else np.zeros(len(codes), dtype=bool)
+                columns[field] = np.bincount(ids[selected], weights=hours[selected], minlength=count)
+
+        stats = [{} for _ in range(count)]
+        for field, values in columns.items():
+            for group_stats, value in zip(stats, values.tolist()):
+                group_stats[field] = value
+
+        if 'weekly_hours' in fields:
+            pairs, valid, width = self._pairs(groups, 'Week')
+            unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+            sums = np.bincount(inverse.reshape(-1), weights=hours[valid], minlength=len(unique_pairs))
+            weeks = self._factorize('Week')[1]
+            for group_stats in stats:
+                group_stats['weekly_hours'] = []
+            for pair, total in zip(unique_pairs.tolist(), sums.tolist()):
+                stats[pair // width]['weekly_hours'].append(WeeklyHours(week=weeks[pair % width], hours=total))
+
+        return stats
+
+    def _by_kind(self, groups: Groups, map: Optional[Dict]) -> List[TimesheetByKind]:
+        """byKind of every group, for the kinds in the map (every kind without one)"""
+        if map is None:
+            kind_maps = dict.fromkeys(KIND_LABELS)
+        else:
+            kind_maps = {kind: map[field] for kind, field in KIND_FIELDS.items() if field in map}
+        kinds = list(kind_maps)
+        fields = set().union(*(requested_fields(kind_map) for kind_map in kind_maps.values()))
+
+        kind_groups = self._split(groups, 'Kind')
+        stats = self._stats(kind_groups, fields)
+
+        found = [{} for _ in range(groups.count)]
+        for parent, kind, kind_stats in zip(kind_groups.parents.tolist(), kind_groups.keys, stats):
+            if kind in kinds:
+                found[parent][kind] = TimesheetSummary(**kind_stats)
+
+        return [
+            TimesheetByKind(**{KIND_LABELS[kind]: summaries[kind] for kind in kinds if kind in summaries})
+            for summaries in found
+        ]
+
+    def _by_week(self, groups: Groups, map: Optional[Dict]) -> List[List[WeekTimesheetSummary]]:
+        result = self._by_group(groups, 'Week', map, "week", WeekTimesheetSummary)
+        for summaries in result:
+            summaries.sort(key=lambda s: _week_start_key(s.week))
+        return result
+
+    def _by_group(
+        self,
+        groups: Groups,
+        column: str,
+        map: Optional[Dict],
+        name_key: str,
+        summary_class: type
+    ) -> List[List[NamedTimesheetSummary]]:
+        """Summaries of the values of a column within every group, by total hours"""
+        children = self._split(groups, column)
+        selection = _item_selection(map)
+        stats = self._stats(children, requested_fields(selection))
+
+        nested: Dict[str, List[Any]] = {}
+        if selection and 'byKind' in selection:
+            nested['by_kind'] = self._by_kind(children, selection['byKind'])
+        if column != 'Week' and selection and 'byWeek' in selection:
+            nested['by_week'] = self._by_week(children, selection['byWeek'])
+        if column == 'CaseTitle' and selection:
+            if 'workers' in selection:
+                nested['workers'] = self._workers(children)
+            if 'workersByTrackingProject' in selection:
+                nested['workers_by_tracking_project'] = self._workers_by_tracking_project(children)
+            if 'byWorker' in selection:
+                nested['by_worker'] = self._by_group(children, 'WorkerName', selection['byWorker'], "name", NamedTimesheetSummary)
+
+        result = [[] for _ in range(groups.count)]
+        for i, (parent, key) in enumerate(zip(children.parents.tolist(), children.keys)):
+            summary = summary_class(**stats[i], **{name_key: key})
+            for attribute, values in nested.items():
+                setattr(summary, attribute, values[i])
+            result[parent].append(summary)
+
+        # Rounded, so that equal totals summed in a different order still tie and keep key order
+        for summaries in result:
+            summaries.sort(key=lambda s: round(s.total_hours, 9), reverse=True)
+        return result
+
+    def _workers(self, groups: Groups) -> List[List[str]]:
+        """Worker names of every group, in order of appearance"""
+        pairs, valid, width = self._pairs(groups, 'WorkerName')
+        unique_pairs, first_seen = np.unique(pairs, return_index=True)
+        names = self._factorize('WorkerName')[1]
+
+        workers = [[] for _ in range(groups.count)]
+        for pair in unique_pairs[np.lexsort((first_seen, unique_pairs // width))].tolist():
+            workers[pair // width].append(names[pair % width])
+        return workers
+
+    def _workers_by_tracking_project(self, groups: Groups) -> List[List[Dict[str, Any]]]:
+        """Sorted worker names of every tracking project of every group"""
+        projects = self._split(groups, 'ProjectId')
+        pairs, _, width = self._pairs(projects, 'WorkerName')
+        names = self._factorize('WorkerName')[1]
+
+        workers = [[] for _ in range(projects.count)]
+        for pair in np.unique(pairs).tolist():
+            workers[pair // width].append(names[pair % width])
+
+        result = [[] for _ in range(groups.count)]
+        for parent, project_id, project_workers in zip(projects.parents.tolist(), projects.keys, workers):
+            result[parent].append({'project_id': project_id, 'workers': sorted(project_workers)})
+        return result
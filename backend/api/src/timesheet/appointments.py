@@ -0,0 +1,207 @@
+import base64
+import binascii
+import hashlib
+import io
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+# TimesheetAppointment input (by alias) -> frame column
+APPOINTMENT_FIELDS = {
+    'date': 'Date',
+    'time_in_hs': 'TimeInHs',
+    'worker_slug': 'WorkerSlug',
+    'client_id': 'ClientId',
+    'case_id': 'CaseId',
+    'project_id': 'ProjectId',
+    'products_or_services': 'ProductsOrServices',
+    'kind': 'Kind',
+    'sponsor': 'Sponsor',
+    'account_manager_slug': 'AccountManagerSlug',
+    'week': 'Week',
+    'comment': 'Comment'
+}
+
+# Exported column -> frame column
+EXPORT_COLUMNS = {
+    'date': 'Date',
+    'time_in_hs': 'TimeInHs',
+    'worker_name': 'WorkerName',
+    'worker_slug': 'WorkerSlug',
+    'client_id': 'ClientId',
+    'client_name': 'ClientName',
+    'case_id': 'CaseId',
+    'case_title': 'CaseTitle',
+    'project_id': 'ProjectId',
+    'products_or_services': 'ProductsOrServices',
+    'kind': 'Kind',
+    'sponsor': 'Sponsor',
+    'account_manager_name': 'AccountManagerName',
+    'account_manager_slug': 'AccountManagerSlug',
+    'week': 'Week',
+    'comment': 'Comment'
+}
+
+# Exported ids that are not numeric columns may mix integer ids with "N/A" markers (ClientId does)
+EXPORT_ID_COLUMNS = ['client_id', 'case_id', 'project_id']
+
+EXPORT_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'arrow': 'application/vnd.apache.arrow.stream'
+}
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def parse_export_arguments(args, default_page_size: int) -> Dict[str, Any]:
+    """
+    Reads `format`, `filters` (JSON list of DatasetFilterInput), `cursor` and
+    `limit` from query-string arguments; raises ValueError when one is invalid.
+    JSON pages default to `default_page_size` rows; streamed formats to all.
+    """
+    format = args.get("format") or "ndjson"
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    filters = None
+    if args.get("filters"):
+        try:
+            filters = json.loads(args["filters"])
+        except ValueError:
+            raise ValueError("filters must be a JSON list of {field, selectedValues}")
+        if not isinstance(filters, list) or not all(isinstance(f, dict) and "field" in f for f in filters):
+            raise ValueError("filters must be a JSON list of {field, selectedValues}")
+
+    limit = default_page_size if format == "json" else None
+    if args.get("limit"):
+        try:
+            limit = int(args["limit"])
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+
+    return {"format": format, "filters": filters, "cursor": args.get("cursor") or None, "limit": limit}
+
+
+def appointment_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Appointment attributes of every row, read column by column; missing values become None"""
+    columns = []
+    for column in APPOINTMENT_FIELDS.values():
+        series = df[column]
+        columns.append(series.astype(object).where(series.notna(), None).tolist())
+    return [dict(zip(APPOINTMENT_FIELDS, values)) for values in zip(*columns)]
+
+
+def query_fingerprint(slug: str, filters: Optional[List[Dict]]) -> str:
+    """Identifies a slug and filters combination, so a cursor is only honored by the query that issued it"""
+    payload = json.dumps([slug, filters or []], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def encode_cursor(offset: int, fingerprint: str, version: Hashable) -> str:
+    payload = json.dumps({"offset": offset, "query": fingerprint, "version": str(version)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, fingerprint: str, version: Hashable) -> int:
+    """Offset a cursor points at; raises InvalidCursorError when it is malformed, foreign or stale"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["offset"])
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("malformed cursor")
+
+    if payload.get("query") != fingerprint:
+        raise InvalidCursorError("cursor was issued for another slug or filters")
+    if payload.get("version") != str(version):
+        raise InvalidCursorError("timesheet changed since the cursor was issued; start over without a cursor")
+    return max(offset, 0)
+
+
+@dataclass
+class AppointmentsPage:
+    """
+    A slice of the appointments of a filtered timesheet, serialized straight
+    from the frame columns, a chunk of rows at a time.
+    """
+    frame: pd.DataFrame
+    total: int
+    next_cursor: Optional[str]
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        offset: int,
+        limit: Optional[int],
+        fingerprint: str,
+        version: Hashable
+    ) -> 'AppointmentsPage':
+        end = len(df) if limit is None else min(offset + limit, len(df))
+        frame = df.iloc[offset:end][list(EXPORT_COLUMNS.values())].set_axis(list(EXPORT_COLUMNS), axis=1)
+        next_cursor = encode_cursor(end, fingerprint, version) if end < len(df) else None
+        return cls(frame=frame, total=len(df), next_cursor=next_cursor)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"X-Total-Count": str(self.total)}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        return headers
+
+    def serialize(self, format: str, chunk_rows: int) -> Iterator[bytes]:
+        if format == 'json':
+            return iter([self.to_json()])
+        if format == 'arrow':
+            return self.iter_arrow(chunk_rows)
+        return self.iter_ndjson(chunk_rows)
+
+    def to_json(self) -> bytes:
+        """The page as `{"columns": {name: [values]}, "total", "next_cursor"}`"""
+        columns = ",".join(
+            f'{json.dumps(name)}:{self.frame[name].to_json(orient="values", date_format="iso")}'
+            for name in self.frame.columns
+        )
+        return (
+            f'{{"columns":{{{columns}}},"total":{self.total},"next_cursor":{json.dumps(self.next_cursor)}}}'
+        ).encode("utf-8")
+
+    def iter_ndjson(self, chunk_rows: int) -> Iterator[bytes]:
+        for start in range(0, len(self.frame), chunk_rows):
+            chunk = self.frame.iloc[start:start + chunk_rows]
+            yield chunk.to_json(orient="records", lines=True, date_format="iso").encode("utf-8")
+
+    def iter_arrow(self, chunk_rows: int) -> Iterator[bytes]:
+        """
+        An Arrow IPC stream, one record batch per chunk. Ids are sent as
+        strings, and the schema comes from the whole page before the stream
+        starts, so a page Arrow cannot type fails before any response is sent.
+        """
+        frame = self.frame.assign(**{
+            column: self.frame[column].map(str, na_action='ignore')
+            for column in EXPORT_ID_COLUMNS
+            if not pd.api.types.is_numeric_dtype(self.frame[column])
+        })
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        return self._arrow_batches(frame, schema, chunk_rows)
+
+    def _arrow_batches(self, frame: pd.DataFrame, schema: pa.Schema, chunk_rows: int) -> Iterator[bytes]:
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for start in range(0, len(frame), chunk_rows):
+                chunk = frame.iloc[start:start + chunk_rows]
+                writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+                yield self._drain(sink)
+        yield self._drain(sink)
+
+    @staticmethod
+    def _drain(sink: io.BytesIO) -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
@@ -53,7 +53,7 @@ class TimesheetSummary(BaseModel):
     weekly_hours: List[WeeklyHours] = []
 
 class GroupSummary(TimesheetSummary):
-    by_kind: Optional[Dict[str, TimesheetSummary]] = None
+    by_kind: Optional[TimesheetByKind] = None
     by_week: Optional[List[WeekTimesheetSummary]] = None
     by_worker: Optional[List[NamedTimesheetSummary]] = None
 
@@ -107,4 +107,8 @@ class Timesheet(BaseModel):
     by_offer: Optional[List[NamedTimesheetSummary]] = None
     appointments: Optional[List[TimesheetAppointment]] = None 
     filterable_fields: Optional[List[FilterableField]] = None
-    
+
+# The group summaries nest each other; resolve those references so the
+# schema generator sees the nested types
+for model in (GroupSummary, NamedTimesheetSummary, TitledTimesheetSummary, DateTimesheetSummary, WeekTimesheetSummary):
+    model.model_rebuild(force=True)
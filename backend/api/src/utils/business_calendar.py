@@ -1,7 +1,7 @@
-
-import holidays
 from datetime import datetime, timedelta
 
+from omni_utils.helpers.business_calendar import get_holidays, get_working_days, is_working_day
+
 def resolve_business_calendar(_, info, start, end):
     return compute_business_calendar(start, end)
     
@@ -10,27 +10,35 @@ def compute_business_calendar(start, end):
         start = datetime.strptime(start, '%Y-%m-%d').date()
     if isinstance(end, str):
         end = datetime.strptime(end, '%Y-%m-%d').date()
-        
-    br_holidays = holidays.BR()
-    
-    working_days = []
-    current = start
-    while current <= end:
-        if current not in br_holidays and current.weekday() < 5:
-            working_days.append(current)
-        current += timedelta(days=1)
-    
-    holidays_in_range = []
-    current = start 
-    while current <= end:
-        if current in br_holidays:
-            holidays_in_range.append({
-                'date': current,
-                'reason': br_holidays.get(current)
-            })
-        current += timedelta(days=1)
-    
+    if isinstance(start, datetime):
+        start = start.date()
+    if isinstance(end, datetime):
+        end = end.date()
+
+    working_days = get_working_days(start, end)
+    holidays_in_range = [
+        {
+            'date': day,
+            'reason': reason
+        }
+        for day, reason in get_holidays(start, end)
+    ]
+    holiday_names = {holiday['date']: holiday['reason'] for holiday in holidays_in_range}
+
+    days = []
+    for i in range((end - start).days + 1):
+        current = start + timedelta(days=i)
+        days.append({
+            'date': datetime.combine(current, datetime.min.time()),
+            'is_business_day': is_working_day(current),
+            'is_holiday': current in holiday_names,
+            'holiday_name': holiday_names.get(current)
+        })
+
     return {
         'working_days': working_days,
-        'holidays': holidays_in_range
+        'holidays': holidays_in_range,
+        'days': days,
+        'total_business_days': len(working_days),
+        'total_holidays': len(holidays_in_range)
     }
@@ -0,0 +1,41 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import omni_shared
+
+# The entry points (app, asgi) are top-level modules of src, as in the image
+SRC = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC))
+
+
+def _is_project_module(module) -> bool:
+    name = module.__name__.split('.')[0]
+    path = getattr(module, '__file__', None) or ''
+    return name in ('omni_models', 'omni_shared') or path.startswith(str(SRC))
+
+
+@pytest.fixture(scope='module')
+def stub_globals():
+    """
+    An empty omni_shared.globals for the modules a test file imports, which
+    would otherwise build every model, and connect to their APIs, on import.
+    Modules first imported under the stub are unloaded afterwards, so nothing
+    collected later sees them bound to it.
+    """
+    stub = types.ModuleType('omni_shared.globals')
+    loaded = set(sys.modules)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(sys.modules, 'omni_shared.globals', stub)
+        patch.setattr(omni_shared, 'globals', stub, raising=False)
+        yield stub
+
+    for name in sorted(set(sys.modules) - loaded, reverse=True):
+        if not _is_project_module(sys.modules[name]):
+            continue
+        del sys.modules[name]
+        parent, _, child = name.rpartition('.')
+        if parent in sys.modules and isinstance(getattr(sys.modules[parent], child, None), types.ModuleType):
+            delattr(sys.modules[parent], child)
@@ -0,0 +1,81 @@
+import importlib
+import math
+import sys
+import types
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from ariadne import QueryType, make_executable_schema
+from flask import Flask, jsonify
+from starlette.testclient import TestClient
+
+# Declared as the generator declares them: no serializer, so resolvers' values pass through
+TYPE_DEFS = """
+scalar DateTime
+scalar Date
+scalar JSON
+
+type Day {
+    date: Date
+    createdAt: DateTime
+}
+
+type Query {
+    days: [Day]
+    stats: JSON
+}
+"""
+
+DAYS = [
+    {'date': date(2024, 3, 1), 'createdAt': datetime(2024, 3, 2, 10, 30)},
+    {'date': None, 'createdAt': datetime(2024, 3, 4, 8, 0, 15)}
+]
+
+
+def build_schema():
+    query = QueryType()
+    query.set_field('days', lambda *_: DAYS)
+    query.set_field('stats', lambda *_: {'hours': float('nan'), 'updatedAt': date(2024, 3, 5)})
+    return make_executable_schema(TYPE_DEFS, query)
+
+
+@pytest.fixture(scope='module')
+def client(stub_globals):
+    stub_globals.omni_models = object()
+    stub_globals.omni_datasets = SimpleNamespace(timesheets=SimpleNamespace(get_data_version=lambda: 0))
+
+    # The Flask module builds the full schema, with every resolver, on import
+    app = types.ModuleType('app')
+    app.schema = build_schema()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(sys.modules, 'app', app)
+        asgi = importlib.import_module('asgi')
+        with TestClient(asgi.app) as client:
+            yield client
+
+
+def flask_json(value):
+    with Flask(__name__).app_context():
+        return jsonify(value).get_json()
+
+
+def test_dates_are_encoded_as_flask_did(client):
+    response = client.post('/graphql', json={'query': '{ days { date createdAt } }'})
+
+    assert response.status_code == 200
+    assert response.json() == {'data': {'days': [
+        {'date': 'Fri, 01 Mar 2024 00:00:00 GMT', 'createdAt': 'Sat, 02 Mar 2024 10:30:00 GMT'},
+        {'date': None, 'createdAt': 'Mon, 04 Mar 2024 08:00:15 GMT'}
+    ]}}
+    assert response.json() == flask_json({'data': {'days': DAYS}})
+
+
+def test_batches_and_json_scalars_are_encoded_too(client):
+    response = client.post('/graphql', json=[{'query': '{ stats }'}, {'query': '{ days { date } }'}])
+
+    assert response.status_code == 200
+    stats, days = response.json()
+    assert stats['data']['stats']['updatedAt'] == 'Tue, 05 Mar 2024 00:00:00 GMT'
+    assert math.isnan(stats['data']['stats']['hours'])
+    assert days['data']['days'][0]['date'] == 'Fri, 01 Mar 2024 00:00:00 GMT'
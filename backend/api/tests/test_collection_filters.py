@@ -0,0 +1,185 @@
+import importlib
+import random
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def filters(stub_globals):
+    return importlib.import_module('core.filters')
+
+
+@pytest.fixture(scope='module')
+def decorators(stub_globals):
+    return importlib.import_module('core.decorators')
+
+
+def baseline_evaluate(item, filter_):
+    """The per-item evaluation compile_filter replaced, kept as the oracle"""
+    if filter_.and_:
+        return all(baseline_evaluate(item, f) for f in filter_.and_)
+    if filter_.or_:
+        return any(baseline_evaluate(item, f) for f in filter_.or_)
+    if filter_.not_:
+        return not baseline_evaluate(item, filter_.not_)
+
+    if not filter_.field or not filter_.value:
+        return True
+
+    field_name = "".join(["_" + c.lower() if c.isupper() else c for c in filter_.field]).lstrip("_").replace(".", "_")
+    value = getattr(item, field_name, None)
+    op = filter_.value
+
+    if op.eq is not None:
+        return value == op.eq
+    if op.neq is not None:
+        return value != op.neq
+    if op.gt is not None and isinstance(value, (int, float)):
+        return value > op.gt
+    if op.gte is not None and isinstance(value, (int, float)):
+        return value >= op.gte
+    if op.lt is not None and isinstance(value, (int, float)):
+        return value < op.lt
+    if op.lte is not None and isinstance(value, (int, float)):
+        return value <= op.lte
+    if op.contains is not None and isinstance(value, str):
+        return op.contains.lower() in value.lower()
+    if op.range is not None:
+        if op.range.min is not None and value < op.range.min:
+            return False
+        if op.range.max is not None and value > op.range.max:
+            return False
+        return True
+    if op.is_ is not None:
+        return bool(value) == op.is_
+
+    return True
+
+
+def build_items(rnd, count=80):
+    """Items whose `code` is a number or a text, so numeric and text operators get skipped"""
+    return [
+        SimpleNamespace(
+            id=i,
+            name=rnd.choice(['Ana', 'Bruno', 'Carla', 'ana maria', '']),
+            hours=rnd.choice([0, 1.5, 4, 8, 12.25]),
+            code=rnd.choice([1, 5, 10, 'A1', 'b5', None]),
+            is_active=rnd.choice([True, False, None]),
+            account_manager_name=rnd.choice(['Ana', None])
+        )
+        for i in range(count)
+    ]
+
+
+def build_operator(rnd, field):
+    """One or two operators, so the precedence between them is exercised too"""
+    candidates = {
+        'eq': lambda: rnd.choice(['Ana', 4, 1, True]),
+        'neq': lambda: rnd.choice(['Ana', 4, None]),
+        'gt': lambda: rnd.choice([0, 4, 8]),
+        'gte': lambda: rnd.choice([0, 4, 8]),
+        'lt': lambda: rnd.choice([1, 5, 10]),
+        'lte': lambda: rnd.choice([1, 5, 10]),
+        'contains': lambda: rnd.choice(['an', 'A', 'b']),
+        'is': lambda: rnd.choice([True, False])
+    }
+    if field == 'hours':
+        # A range compares any value, so it is only asked of a numeric field
+        candidates['range'] = lambda: {'min': rnd.choice([None, 1, 4]), 'max': rnd.choice([None, 8, 12])}
+    names = rnd.sample(sorted(candidates), rnd.randint(1, 2))
+    return {name: candidates[name]() for name in names}
+
+
+def build_filter(rnd, depth=0):
+    kind = rnd.choice(['field'] * 3 + (['and', 'or', 'not'] if depth < 3 else []))
+    if kind == 'and' or kind == 'or':
+        return {kind: [build_filter(rnd, depth + 1) for _ in range(rnd.randint(1, 3))]}
+    if kind == 'not':
+        return {'not': build_filter(rnd, depth + 1)}
+    field = rnd.choice(['name', 'hours', 'code', 'isActive', 'accountManager.name', 'missing'])
+    return {'field': field, 'value': build_operator(rnd, field)}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_compiled_filters_match_the_per_item_evaluation(filters, seed):
+    rnd = random.Random(seed)
+    items = build_items(rnd)
+
+    for _ in range(25):
+        filter_input = filters.FilterInput.model_validate(build_filter(rnd))
+        expected = [item for item in items if baseline_evaluate(item, filter_input)]
+        assert filters.apply_filters(items, filter_input) == expected
+
+
+def test_a_numeric_operator_is_skipped_for_other_values(filters):
+    items = [SimpleNamespace(code='A1'), SimpleNamespace(code=3), SimpleNamespace(code=30)]
+    filter_input = filters.FilterInput.model_validate({'field': 'code', 'value': {'gt': 10, 'contains': 'a'}})
+
+    assert [item.code for item in filters.apply_filters(items, filter_input)] == ['A1', 30]
+
+
+def test_an_empty_filter_keeps_everything(filters):
+    items = build_items(random.Random(0), count=5)
+
+    assert filters.apply_filters(items, filters.FilterInput.model_validate({'field': 'name'})) == items
+    assert filters.apply_filters(items, None) is items
+
+
+class Converted(SimpleNamespace):
+    pass
+
+
+def lazy(filters, items):
+    converted = []
+
+    def convert(item):
+        converted.append(item.id)
+        return Converted(**vars(item))
+
+    return filters.LazyItems(iter(items), convert), converted
+
+
+def test_only_the_page_is_converted_when_nothing_is_filtered_or_sorted(filters):
+    items = build_items(random.Random(1), count=50)
+    source, converted = lazy(filters, items)
+
+    result = filters.process_collection(source, pagination_input=filters.PaginationInput(limit=10, offset=20))
+
+    assert converted == list(range(20, 30))
+    assert [item.id for item in result.data] == list(range(20, 30))
+    assert (result.metadata.total, result.metadata.filtered) == (50, 50)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_lazy_items_are_processed_as_converted_lists(filters, seed):
+    rnd = random.Random(seed)
+    items = build_items(rnd)
+    filter_input = rnd.choice([None, filters.FilterInput.model_validate(build_filter(rnd))])
+    sort_input = rnd.choice([None, filters.SortInput(field='hours', order=rnd.choice(['ASC', 'DESC']))])
+    pagination_input = rnd.choice([None, filters.PaginationInput(limit=rnd.randint(1, 30), offset=rnd.randint(0, 90))])
+
+    eager = filters.process_collection([Converted(**vars(item)) for item in items], filter_input, sort_input, pagination_input)
+    source, _ = lazy(filters, items)
+    result = filters.process_collection(source, filter_input, sort_input, pagination_input)
+
+    assert result.metadata == eager.metadata
+    assert [vars(item) for item in result.data] == [vars(item) for item in eager.data]
+
+
+def test_collection_resolvers_accept_lists_and_lazy_items(filters, decorators):
+    items = [SimpleNamespace(name=name, hours=hours) for name, hours in [('Ana', 8), ('Bruno', 2), ('Carla', 5), ('Davi', 1)]]
+    arguments = dict(filter={'field': 'hours', 'value': {'gte': 2}}, sort={'field': 'name', 'order': 'DESC'}, pagination={'limit': 2})
+
+    @decorators.collection
+    def eager(obj, info):
+        return [SimpleNamespace(**vars(item)) for item in items]
+
+    @decorators.collection
+    def deferred(obj, info):
+        return filters.LazyItems(items, lambda item: SimpleNamespace(**vars(item)))
+
+    expected = {'data': [SimpleNamespace(name='Carla', hours=5), SimpleNamespace(name='Bruno', hours=2)], 'metadata': {'total': 4, 'filtered': 3}}
+    assert eager(None, None, **arguments) == expected
+    assert deferred(None, None, **arguments) == expected
+    assert deferred(None, None, pagination={'offset': 3})['data'] == [SimpleNamespace(name='Davi', hours=1)]
@@ -0,0 +1,162 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def loaders(stub_globals):
+    return importlib.import_module('core.loaders')
+
+
+class Repository:
+    """Entities by id and slug; lookups of keys starting with 'bad' fail"""
+
+    def __init__(self):
+        self.batches = []
+
+    def get_many_by_id(self, type_name, ids):
+        self.batches.append(('id', type_name, list(ids)))
+        return {id: ValueError(f'no {type_name} {id}') if id.startswith('bad') else f'{type_name}:{id}' for id in ids}
+
+    def get_many_by_slug(self, type_name, slugs):
+        self.batches.append(('slug', type_name, list(slugs)))
+        return {slug: f'{type_name}/{slug}' for slug in slugs}
+
+
+def test_sync_loads_are_looked_up_once(loaders):
+    repository = Repository()
+    entities = loaders.EntityLoaders(repository)
+
+    assert entities.by_id('Worker').load('1') == 'Worker:1'
+    assert entities.by_id('Worker').load('1') == 'Worker:1'
+    assert entities.by_id('Client').load('1') == 'Client:1'
+    assert entities.by_slug('Worker').load('ana') == 'Worker/ana'
+    assert repository.batches == [('id', 'Worker', ['1']), ('id', 'Client', ['1']), ('slug', 'Worker', ['ana'])]
+
+
+def test_sync_failures_only_fail_their_key_and_are_retried(loaders):
+    repository = Repository()
+    loader = loaders.EntityLoaders(repository).by_id('Worker')
+
+    with pytest.raises(ValueError, match='bad1'):
+        loader.load('bad1')
+    with pytest.raises(ValueError):
+        loader.load('bad1')
+    assert loader.load('2') == 'Worker:2'
+    assert len(repository.batches) == 3
+
+
+def test_async_loads_of_a_level_are_fetched_in_one_batch(loaders):
+    repository = Repository()
+    loader = loaders.EntityLoaders(repository).by_id('Case')
+
+    async def resolve_level():
+        # Sibling fields ask for their references before any of them is awaited
+        futures = [loader.load(key) for key in ['1', '2', '1', '3']]
+        first = await asyncio.gather(*futures)
+        again = await asyncio.gather(loader.load('2'), loader.load('4'))
+        return first, again
+
+    first, again = asyncio.run(resolve_level())
+
+    assert first == ['Case:1', 'Case:2', 'Case:1', 'Case:3']
+    assert again == ['Case:2', 'Case:4']
+    assert repository.batches == [('id', 'Case', ['1', '2', '3']), ('id', 'Case', ['4'])]
+
+
+def test_async_failures_only_fail_their_key(loaders):
+    repository = Repository()
+    loader = loaders.EntityLoaders(repository).by_id('Case')
+
+    async def resolve_level():
+        return await asyncio.gather(loader.load('1'), loader.load('bad2'), return_exceptions=True)
+
+    found, failed = asyncio.run(resolve_level())
+
+    assert found == 'Case:1'
+    assert isinstance(failed, ValueError)
+    assert 'bad2' not in loader.cache and loader.cache['1'].result() == 'Case:1'
+
+
+def test_a_failed_batch_fails_every_key_and_is_retried(loaders):
+    calls = []
+
+    def batch_load(keys):
+        calls.append(list(keys))
+        if len(calls) == 1:
+            raise ConnectionError('upstream is down')
+        return {key: key.upper() for key in keys}
+
+    loader = loaders.DataLoader(batch_load)
+
+    async def resolve_level():
+        return await asyncio.gather(loader.load('a'), loader.load('b'), return_exceptions=True)
+
+    assert [type(outcome) for outcome in asyncio.run(resolve_level())] == [ConnectionError, ConnectionError]
+    assert asyncio.run(resolve_level()) == ['A', 'B']
+    assert calls == [['a', 'b'], ['a', 'b']]
+
+
+def test_loaders_are_shared_through_the_request_context(loaders):
+    repository = Repository()
+    info = SimpleNamespace(context={'request': None})
+
+    assert loaders.get_loaders(info, repository) is loaders.get_loaders(info, repository)
+    assert info.context['loaders'].repository is repository
+
+    # A context that cannot hold them gets loaders of its own
+    request = SimpleNamespace(context=object())
+    assert loaders.get_loaders(request, repository) is not loaders.get_loaders(request, repository)
+
+
+
+class Domain:
+    """A repository of the models whose batched lookups are counted"""
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.batches = []
+
+    def get_many_by_id(self, ids):
+        self.batches.append(list(ids))
+        return {id: self.entities.get(id) for id in ids}
+
+    def get_many_by_slug(self, slugs):
+        self.batches.append(list(slugs))
+        return {slug: next((entity for entity in self.entities.values() if entity.slug == slug), None) for slug in slugs}
+
+
+@pytest.fixture
+def omni_models(stub_globals):
+    worker = SimpleNamespace(
+        id=1, slug='ana', name='Ana', email='ana@eximia.co', ontology_url=None, photo_url=None,
+        is_recognized=True, position='Consultant', errors=[]
+    )
+    omni_models = SimpleNamespace(
+        workers=Domain({1: worker}),
+        clients=Domain({'7': SimpleNamespace(slug='acme')}),
+        cases=Domain({})
+    )
+    stub_globals.omni_models = omni_models
+    return omni_models
+
+
+@pytest.fixture(scope='module')
+def repository(stub_globals):
+    return importlib.import_module('core.generator').GlobalRepository()
+
+
+def test_a_batch_of_references_is_one_lookup_per_type(repository, omni_models):
+    found = repository.get_many_by_id('Client', ['7', '8'])
+    assert found['7'] is omni_models.clients.entities['7']
+    assert isinstance(found['8'], KeyError)
+
+    managers = repository.get_many_by_slug('AccountManager', ['ana', 'bruno'])
+    assert (managers['ana'].slug, managers['bruno']) == ('ana', None)
+    # An entity that cannot be converted only fails its own key
+    assert isinstance(repository.get_many_by_slug('Client', ['acme'])['acme'], Exception)
+
+    assert omni_models.workers.batches == [['ana', 'bruno']]
+    assert omni_models.clients.batches == [['7', '8'], ['acme']]
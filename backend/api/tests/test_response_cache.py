@@ -0,0 +1,152 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from ariadne import MutationType, QueryType, graphql_sync, make_executable_schema
+
+TYPE_DEFS = """
+type Query {
+    hours(worker: String): Float
+}
+
+type Mutation {
+    refresh: Boolean
+}
+"""
+
+QUERY = 'query Hours($worker: String) { hours(worker: $worker) }'
+
+
+class Timesheets:
+    """Hours per worker, with the data version the dataset bumps on every refetch"""
+
+    def __init__(self):
+        self.hours = {'ana': 8.0, 'bruno': 4.0}
+        self.version = 0
+        self.reads = 0
+
+    def get_data_version(self):
+        return self.version
+
+
+@pytest.fixture(scope='module')
+def module(stub_globals):
+    return importlib.import_module('core.response_cache')
+
+
+@pytest.fixture
+def timesheets(stub_globals):
+    timesheets = Timesheets()
+    stub_globals.omni_models = object()
+    stub_globals.omni_datasets = SimpleNamespace(timesheets=timesheets)
+    return timesheets
+
+
+@pytest.fixture
+def run(module, timesheets, monkeypatch):
+    """Executes operations as the servers do, through fresh caches"""
+    monkeypatch.setattr(module, 'response_cache', module.ResponseCache())
+    monkeypatch.setattr(module, 'persisted_queries', module.PersistedQueries())
+
+    def resolve_hours(*_, worker=None):
+        timesheets.reads += 1
+        return timesheets.hours.get(worker)
+
+    def resolve_refresh(*_):
+        timesheets.version += 1
+        return True
+
+    query, mutation = QueryType(), MutationType()
+    query.set_field('hours', resolve_hours)
+    mutation.set_field('refresh', resolve_refresh)
+    schema = make_executable_schema(TYPE_DEFS, query, mutation)
+
+    return lambda operation: module.execute_cached(operation, lambda operation: graphql_sync(schema, operation))
+
+
+def persisted(query_hash, query=None, **operation):
+    extensions = {'persistedQuery': {'version': 1, 'sha256Hash': query_hash}}
+    return {**operation, **({'query': query} if query else {}), 'extensions': extensions}
+
+
+def test_a_query_is_registered_and_then_sent_by_hash(module, run):
+    sha256 = module.query_hash(QUERY)
+
+    success, result = run(persisted(sha256, variables={'worker': 'ana'}))
+    assert success and result['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_FOUND'
+
+    assert run(persisted(sha256, QUERY, variables={'worker': 'ana'})) == (True, {'data': {'hours': 8.0}})
+    assert run(persisted(sha256, variables={'worker': 'bruno'})) == (True, {'data': {'hours': 4.0}})
+
+
+def test_a_query_that_does_not_match_its_hash_is_rejected(module, run, timesheets):
+    other = module.query_hash('{ hours }')
+
+    success, result = run(persisted(other, QUERY, variables={'worker': 'ana'}))
+
+    assert not success
+    assert result['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_HASH_MISMATCH'
+    assert timesheets.reads == 0
+    # Nor was the query registered under the hash it was sent with
+    assert run(persisted(other))[1]['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_FOUND'
+    assert module.persisted_queries.stats()['entries'] == 0
+
+
+def test_responses_are_cached_by_variables(module, run, timesheets):
+    for worker in ('ana', 'bruno', 'ana', 'bruno'):
+        run({'query': QUERY, 'variables': {'worker': worker}})
+
+    assert timesheets.reads == 2
+    assert module.response_cache.stats() == {'entries': 2, 'hits': 2, 'misses': 2, 'hit_rate': 0.5}
+
+
+def test_a_new_data_version_is_not_answered_from_the_cache(run, timesheets):
+    operation = {'query': QUERY, 'variables': {'worker': 'ana'}}
+    assert run(operation) == (True, {'data': {'hours': 8.0}})
+
+    timesheets.hours['ana'] = 10.0
+    assert run(operation) == (True, {'data': {'hours': 8.0}})
+
+    timesheets.version += 1
+    assert run(operation) == (True, {'data': {'hours': 10.0}})
+    assert timesheets.reads == 2
+
+
+def test_mutations_run_every_time_and_invalidate_what_they_change(run, timesheets):
+    query = {'query': QUERY, 'variables': {'worker': 'ana'}}
+    run(query)
+    timesheets.hours['ana'] = 10.0
+
+    assert run({'query': 'mutation { refresh }'}) == (True, {'data': {'refresh': True}})
+    assert run({'query': 'mutation { refresh }'}) == (True, {'data': {'refresh': True}})
+
+    assert timesheets.version == 2
+    assert run(query) == (True, {'data': {'hours': 10.0}})
+
+
+def test_a_rebuild_of_the_models_clears_the_cache(run, timesheets, stub_globals):
+    operation = {'query': QUERY, 'variables': {'worker': 'ana'}}
+    run(operation)
+    timesheets.hours['ana'] = 10.0
+
+    stub_globals.omni_models = object()
+
+    assert run(operation) == (True, {'data': {'hours': 10.0}})
+
+
+def test_responses_with_errors_are_not_cached(module, run):
+    operation = {'query': '{ hours(worker: 1) }'}
+
+    assert not run(operation)[0]
+    assert module.response_cache.stats()['entries'] == 0
+
+
+def test_entries_expire(module, run, timesheets):
+    # Already stale when stored
+    module.response_cache.ttl_seconds = -1
+    operation = {'query': QUERY, 'variables': {'worker': 'ana'}}
+
+    run(operation)
+    run(operation)
+
+    assert timesheets.reads == 2
@@ -0,0 +1,249 @@
+import importlib
+import math
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from omni_utils.helpers.weeks import Weeks
+
+# Multiples of .5 sum exactly in any order, so groups with equal totals tie in both implementations
+HOURS = [0.5, 1.0, 1.5, 2.0, 4.0, 7.5]
+
+
+@pytest.fixture(scope='module')
+def models(stub_globals):
+    return importlib.import_module('timesheet.models')
+
+
+@pytest.fixture(scope='module')
+def aggregation(stub_globals):
+    return importlib.import_module('timesheet.aggregation')
+
+
+def build_frame(seed, rows=400):
+    """A month of appointments whose workers, cases and clients repeat across kinds and weeks"""
+    rnd = random.Random(seed)
+    cases = [(f'c{i}', f'Case {i % 7}', f'cl{i % 4}', rnd.choice(['Sponsor A', 'Sponsor B', None]), f'am{i % 3}') for i in range(9)]
+    workers = [f'Worker {i}' for i in range(6)]
+    appointments = []
+    for _ in range(rows):
+        case_id, title, client_id, sponsor, account_manager = rnd.choice(cases)
+        worker = rnd.choice(workers)
+        appointments.append({
+            'Date': date(2024, 3, 1) + timedelta(days=rnd.randint(0, 30)),
+            'TimeInHs': rnd.choice(HOURS),
+            'Kind': rnd.choice(['Consulting', 'Squad', 'Internal', 'HandsOn']),
+            'WorkerName': worker,
+            'WorkerSlug': worker.lower().replace(' ', '-'),
+            'CaseId': case_id,
+            'CaseTitle': title,
+            'ClientId': client_id,
+            'ClientName': f'Client {client_id}',
+            'Sponsor': sponsor,
+            'AccountManagerName': account_manager.upper(),
+            'AccountManagerSlug': account_manager,
+            'ProjectId': f'{case_id}-{rnd.randint(1, 2)}',
+            'ProductsOrServices': rnd.choice(['Offer X', 'Offer Y'])
+        })
+    df = pd.DataFrame(appointments)
+    df['Week'] = Weeks.week_labels(df['Date'])
+    categories = ['Kind', 'WorkerName', 'WorkerSlug', 'CaseTitle', 'Week'] if seed % 2 else []
+    return df.astype({column: 'category' for column in categories})
+
+
+class Baseline:
+    """The per-group pandas summaries the aggregator replaced, kept as the oracle"""
+
+    def __init__(self, models):
+        self.models = models
+
+    def summarize(self, df):
+        m = self.models
+        if len(df) == 0:
+            return m.TimesheetSummary()
+
+        group_operations = {
+            "date": df.groupby("Date", observed=True)["TimeInHs"],
+            "worker": df.groupby("WorkerSlug", observed=True)["TimeInHs"],
+            "client": df.groupby("ClientId", observed=True)["TimeInHs"],
+            "case": df.groupby("CaseId", observed=True)["TimeInHs"],
+            "sponsor": df.groupby("Sponsor", observed=True)["TimeInHs"],
+            "account_manager": df.groupby("AccountManagerSlug", observed=True)["TimeInHs"],
+            "week": df.groupby("Week", observed=True)["TimeInHs"]
+        }
+        group_results = {k: g.agg(['sum', 'mean', 'std']) for k, g in group_operations.items()}
+
+        total_hours = float(df["TimeInHs"].sum())
+        weekly_summary = group_operations['week'].sum().reset_index()
+        weeks = [m.WeeklyHours(week=row['Week'], hours=float(row['TimeInHs'])) for _, row in weekly_summary.iterrows()]
+
+        def get_agg_value(group, agg, default=0.0):
+            try:
+                value = group_results[group][agg]
+                if pd.isna(value.iloc[0]) or np.isinf(value.iloc[0]) or pd.isna(float(value.iloc[0])):
+                    return default
+                return float(value.iloc[0])
+            except (KeyError, IndexError, ValueError, TypeError):
+                return default
+
+        per_group = {}
+        for group, suffix in [
+            ('date', 'day'), ('worker', 'worker'), ('client', 'client'), ('case', 'case'),
+            ('sponsor', 'sponsor'), ('account_manager', 'account_manager'), ('week', 'week')
+        ]:
+            per_group[f'average_hours_per_{suffix}'] = get_agg_value(group, 'mean')
+            per_group[f'std_dev_hours_per_{suffix}'] = get_agg_value(group, 'std')
+
+        return m.TimesheetSummary(
+            total_entries=len(df),
+            total_hours=total_hours,
+            unique_clients=df["ClientId"].nunique(),
+            unique_workers=df["WorkerSlug"].nunique(),
+            unique_cases=df["CaseId"].nunique(),
+            unique_working_days=df["Date"].nunique(),
+            unique_sponsors=df["Sponsor"].nunique(),
+            unique_account_managers=df["AccountManagerSlug"].nunique(),
+            unique_weeks=df["Week"].nunique(),
+            average_hours_per_entry=total_hours / len(df),
+            std_dev_hours_per_entry=float(df["TimeInHs"].std()) if not pd.isna(df["TimeInHs"].std()) else 0.0,
+            **per_group,
+            total_squad_hours=float(df[df['Kind'] == 'Squad']['TimeInHs'].sum() or 0.0),
+            total_consulting_hours=float(df[df['Kind'] == 'Consulting']['TimeInHs'].sum() or 0.0),
+            total_internal_hours=float(df[df['Kind'] == 'Internal']['TimeInHs'].sum() or 0.0),
+            total_hands_on_hours=float(df[df['Kind'] == 'HandsOn']['TimeInHs'].sum() or 0.0),
+            weekly_hours=weeks
+        )
+
+    def by_kind(self, df, map):
+        result = {}
+        for kind in ['Internal', 'Consulting', 'Squad', 'HandsOn']:
+            kind_in_map = 'handsOn' if kind == 'HandsOn' else kind.lower()
+            df_kind = df[df['Kind'] == kind]
+            if kind_in_map in map and len(df_kind) > 0:
+                result['hands_on' if kind == 'HandsOn' else kind.lower()] = self.summarize(df_kind)
+        return result
+
+    def by_group(self, df, group_column, name_key="name", summary_class=None):
+        summary_class = summary_class or self.models.NamedTimesheetSummary
+        summaries = []
+        for group_value, group_df in df.groupby(group_column, observed=True):
+            summaries.append(summary_class(**self.summarize(group_df).model_dump(), **{name_key: group_value}))
+        return sorted(summaries, key=lambda x: x.total_hours, reverse=True)
+
+    def by_week(self, df):
+        summaries = self.by_group(df, 'Week', "week", self.models.WeekTimesheetSummary)
+        return sorted(summaries, key=lambda x: datetime.strptime(x.week.split(' - ')[0], '%d/%m'))
+
+
+def assert_same(actual, expected, path='result'):
+    """Equal structures, floats compared with a relative tolerance"""
+    if isinstance(expected, float):
+        assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9), path
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_same(actual[key], expected[key], f'{path}.{key}')
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_same(a, e, f'{path}[{i}]')
+    else:
+        assert actual == expected, path
+
+
+def dump(value):
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    return value.model_dump(exclude_none=True)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_summary_matches_baseline(models, aggregation, seed):
+    df = build_frame(seed)
+
+    assert_same(dump(aggregation.TimesheetAggregator(df).summary(None)), dump(Baseline(models).summarize(df)))
+
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('column, name_key, summary_class', [
+    ('CaseTitle', 'title', 'TitledTimesheetSummary'),
+    ('WorkerName', 'name', 'NamedTimesheetSummary'),
+    ('Sponsor', 'name', 'NamedTimesheetSummary'),
+    ('Date', 'date', 'DateTimesheetSummary')
+])
+def test_groups_match_baseline(models, aggregation, seed, column, name_key, summary_class):
+    df = build_frame(seed)
+    summary_class = getattr(models, summary_class)
+
+    actual = aggregation.TimesheetAggregator(df).by_group(column, None, name_key, summary_class)
+
+    assert_same(dump(actual), dump(Baseline(models).by_group(df, column, name_key, summary_class)))
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_weeks_match_baseline(models, aggregation, seed):
+    df = build_frame(seed)
+
+    assert_same(dump(aggregation.TimesheetAggregator(df).by_week(None)), dump(Baseline(models).by_week(df)))
+
+
+@pytest.mark.parametrize('kinds', [['consulting', 'handsOn', 'squad', 'internal'], ['squad']])
+def test_kinds_match_baseline(models, aggregation, kinds):
+    df = build_frame(3)
+    map = {kind: {field: {} for field in ['totalHours', 'averageHoursPerDay', 'uniqueCases', 'weeklyHours']} for kind in kinds}
+
+    fields = {'total_entries', 'total_hours', 'average_hours_per_day', 'unique_cases', 'weekly_hours'}
+    actual = aggregation.TimesheetAggregator(df).by_kind(map).model_dump(exclude_none=True, include={kind: fields for kind in models.TimesheetByKind.model_fields})
+    expected = {label: summary.model_dump(include=fields) for label, summary in Baseline(models).by_kind(df, map).items()}
+
+    assert_same(actual, expected)
+
+
+def test_empty_frames_summarize_to_nothing(models, aggregation):
+    aggregator = aggregation.TimesheetAggregator(build_frame(0).iloc[0:0])
+
+    assert aggregator.summary(None) == models.TimesheetSummary()
+    assert aggregator.by_group('CaseTitle', None) == []
+    assert aggregator.by_week(None) == []
+
+
+@pytest.fixture(scope='module')
+def service(stub_globals):
+    df = build_frame(5)
+    stub_globals.omni_datasets = SimpleNamespace(
+        get_by_slug=lambda slug: SimpleNamespace(data=df),
+        get_dataset_source_by_slug=lambda slug: None,
+        get_dates=lambda slug: (datetime(2024, 3, 1), datetime(2024, 3, 31)),
+        apply_filters=lambda source, df, filters: (df, {'filterable_fields': []})
+    )
+    return importlib.import_module('timesheet.service'), df
+
+
+def test_cases_nest_workers_and_their_weeks(models, service):
+    service, df = service
+    baseline = Baseline(models)
+    week_map = {'data': {'week': {}, 'totalHours': {}, 'totalEntries': {}, 'uniqueCases': {}}}
+    map = {'byCase': {'data': {
+        'title': {}, 'totalHours': {},
+        'byWorker': {'data': {'name': {}, 'totalHours': {}, 'averageHoursPerEntry': {}, 'byWeek': week_map}}
+    }}}
+
+    timesheet = service.compute_timesheet(map, 'this-month')
+
+    assert [case.title for case in timesheet.by_case] == [case.title for case in baseline.by_group(df, 'CaseTitle', 'title', models.TitledTimesheetSummary)]
+    for case in timesheet.by_case:
+        case_df = df[df['CaseTitle'] == case.title]
+        expected_workers = baseline.by_group(case_df, 'WorkerName')
+        assert [w.name for w in case.by_worker] == [w.name for w in expected_workers]
+        for worker, expected in zip(case.by_worker, expected_workers):
+            assert_same(worker.total_hours, expected.total_hours)
+            assert_same(worker.average_hours_per_entry, expected.average_hours_per_entry)
+            expected_weeks = baseline.by_week(case_df[case_df['WorkerName'] == worker.name])
+            fields = {'week', 'total_hours', 'total_entries', 'unique_cases'}
+            assert_same(
+                [week.model_dump(include=fields) for week in worker.by_week],
+                [week.model_dump(include=fields) for week in expected_weeks]
+            )
@@ -0,0 +1,184 @@
+import importlib
+import io
+import json
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pydantic import ValidationError
+
+
+@pytest.fixture(scope='module')
+def appointments(stub_globals):
+    return importlib.import_module('timesheet.appointments')
+
+
+@pytest.fixture(scope='module')
+def service(stub_globals):
+    return importlib.import_module('timesheet.service')
+
+
+def build_frame(rows=5):
+    """Appointments as the timesheet dataset holds them: python dates, ids of clients as strings"""
+    return pd.DataFrame({
+        'Date': [date(2024, 3, day) for day in range(1, rows + 1)],
+        'TimeInHs': [1.5 * day for day in range(rows)],
+        'WorkerName': ['Ana'] * rows,
+        'WorkerSlug': ['ana'] * rows,
+        'ClientId': [str(10 + day % 2) for day in range(rows)],
+        'ClientName': ['Client'] * rows,
+        'CaseId': [f'c{day}' for day in range(rows)],
+        'CaseTitle': ['Case'] * rows,
+        'ProjectId': ['ev:1'] * rows,
+        'ProductsOrServices': ['Offer'] * rows,
+        'Kind': pd.Categorical(['Consulting', 'Squad'] * (rows // 2) + ['Consulting'] * (rows % 2)),
+        'Sponsor': ['Sponsor'] * rows,
+        'AccountManagerName': ['Bruno'] * rows,
+        'AccountManagerSlug': ['bruno'] * rows,
+        'Week': ['03/03 - 09/03'] * rows,
+        'Comment': [None, 'review', None, 'pairing', None][:rows]
+    })
+
+
+def per_row_appointments(service, df):
+    """What get_appointments returned before: one validated model per row"""
+    return [
+        service.TimesheetAppointment(
+            date=row['Date'], time_in_hs=row['TimeInHs'], worker_slug=row['WorkerSlug'],
+            client_id=row['ClientId'], case_id=row['CaseId'], project_id=row['ProjectId'],
+            products_or_services=row['ProductsOrServices'], kind=row['Kind'], sponsor=row['Sponsor'],
+            account_manager_slug=row['AccountManagerSlug'], week=row['Week'], comment=row['Comment']
+        )
+        for _, row in df.iterrows()
+    ]
+
+
+def test_appointments_are_coerced_as_per_row_models_were(service):
+    df = build_frame()
+
+    result = service.get_appointments(df)
+
+    assert result == per_row_appointments(service, df)
+    assert result[0].date == datetime(2024, 3, 1)
+    assert result[0].client_id == 10
+
+
+def test_invalid_appointments_are_still_rejected(service):
+    df = build_frame().assign(ClientId='N/A')
+
+    with pytest.raises(ValidationError):
+        service.get_appointments(df)
+
+
+@pytest.mark.parametrize('args, expected', [
+    ({}, {'format': 'ndjson', 'filters': None, 'cursor': None, 'limit': None}),
+    ({'format': 'json'}, {'format': 'json', 'filters': None, 'cursor': None, 'limit': 100}),
+    (
+        {'format': 'arrow', 'limit': '20', 'cursor': 'abc', 'filters': '[{"field": "Kind", "selectedValues": ["Squad"]}]'},
+        {'format': 'arrow', 'filters': [{'field': 'Kind', 'selectedValues': ['Squad']}], 'cursor': 'abc', 'limit': 20}
+    )
+])
+def test_parse_export_arguments(appointments, args, expected):
+    assert appointments.parse_export_arguments(args, 100) == expected
+
+
+@pytest.mark.parametrize('args, message', [
+    ({'format': 'csv'}, 'format'),
+    ({'filters': 'Kind=Squad'}, 'filters'),
+    ({'filters': '{"field": "Kind"}'}, 'filters'),
+    ({'filters': '[{"selectedValues": []}]'}, 'filters'),
+    ({'limit': 'ten'}, 'limit'),
+    ({'limit': '0'}, 'limit')
+])
+def test_parse_export_arguments_rejects(appointments, args, message):
+    with pytest.raises(ValueError, match=message):
+        appointments.parse_export_arguments(args, 100)
+
+
+def test_cursor_round_trip(appointments):
+    cursor = appointments.encode_cursor(40, 'query', (3, 1))
+
+    assert appointments.decode_cursor(cursor, 'query', (3, 1)) == 40
+
+
+@pytest.mark.parametrize('cursor, fingerprint, version, message', [
+    ('not a cursor!', 'query', 1, 'malformed'),
+    ('e30', 'query', 1, 'malformed'),
+    (None, 'other', 1, 'another slug'),
+    (None, 'query', 2, 'changed')
+])
+def test_foreign_and_stale_cursors_are_rejected(appointments, cursor, fingerprint, version, message):
+    cursor = cursor or appointments.encode_cursor(40, 'query', 1)
+
+    with pytest.raises(appointments.InvalidCursorError, match=message):
+        appointments.decode_cursor(cursor, fingerprint, version)
+
+
+def test_pages_chain_cursors_to_the_end(appointments):
+    df = build_frame()
+    fingerprint = appointments.query_fingerprint('timesheet-this-month', None)
+
+    first = appointments.AppointmentsPage.from_frame(df, 0, 3, fingerprint, 7)
+    offset = appointments.decode_cursor(first.next_cursor, fingerprint, 7)
+    last = appointments.AppointmentsPage.from_frame(df, offset, 3, fingerprint, 7)
+
+    assert first.headers() == {'X-Total-Count': '5', 'X-Next-Cursor': first.next_cursor}
+    assert last.headers() == {'X-Total-Count': '5'}
+    assert first.frame['case_id'].tolist() + last.frame['case_id'].tolist() == df['CaseId'].tolist()
+
+
+@pytest.fixture
+def page(appointments):
+    return appointments.AppointmentsPage.from_frame(build_frame(), 1, None, 'query', 1)
+
+
+def test_json_page(page):
+    body = json.loads(b''.join(page.serialize('json', 2)))
+
+    assert body['total'] == 5 and body['next_cursor'] is None
+    assert body['columns']['date'] == [f'2024-03-0{day}T00:00:00.000' for day in range(2, 6)]
+    assert body['columns']['comment'] == ['review', None, 'pairing', None]
+    assert body['columns']['kind'] == ['Squad', 'Consulting', 'Squad', 'Consulting']
+
+
+def test_ndjson_page(page):
+    chunks = list(page.serialize('ndjson', 3))
+    rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+
+    assert len(chunks) == 2
+    assert [row['date'] for row in rows] == [f'2024-03-0{day}T00:00:00.000' for day in range(2, 6)]
+    assert rows[0] == {**rows[0], 'time_in_hs': 1.5, 'client_id': '11', 'kind': 'Squad', 'comment': 'review'}
+
+
+def test_arrow_page(page):
+    chunks = list(page.serialize('arrow', 3))
+    table = pa.ipc.open_stream(io.BytesIO(b''.join(chunks))).read_all()
+
+    assert table.num_rows == 4
+    assert table.column_names == list(page.frame.columns)
+    pd.testing.assert_frame_equal(table.to_pandas(), page.frame.reset_index(drop=True))
+
+
+def test_arrow_page_of_ids_mixing_integers_and_markers(appointments):
+    df = build_frame()
+    # As enrichment leaves them: client ids where a case has a client, "N/A" elsewhere
+    df['ClientId'] = pd.Series([11, 'N/A', 12, 'N/A', None], dtype=object)
+    page = appointments.AppointmentsPage.from_frame(df, 0, None, 'query', 1)
+
+    chunks = page.serialize('arrow', 2)
+    table = pa.ipc.open_stream(io.BytesIO(b''.join(chunks))).read_all()
+
+    assert table.schema.field('client_id').type == pa.string()
+    assert table.column('client_id').to_pylist() == ['11', 'N/A', '12', 'N/A', None]
+    assert table.column('case_id').to_pylist() == df['CaseId'].tolist()
+    assert page.frame['client_id'].tolist()[:2] == [11, 'N/A']
+
+
+def test_arrow_page_that_cannot_be_typed_fails_before_streaming(appointments):
+    df = build_frame()
+    df['Comment'] = pd.Series([1, 'N/A', None, 2.5, 'x'], dtype=object)
+    page = appointments.AppointmentsPage.from_frame(df, 0, None, 'query', 1)
+
+    with pytest.raises((pa.ArrowInvalid, pa.ArrowTypeError)):
+        page.serialize('arrow', 2)
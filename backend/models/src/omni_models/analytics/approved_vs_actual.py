@@ -4,6 +4,13 @@ from datetime import datetime, date
 from omni_utils.helpers.weeks import Weeks
 from omni_shared import globals
 from dataclasses import dataclass
+from omni_utils.decorators.singleflight import singleflight
+
+CASE_COLUMNS = [
+    'client_id', 'id', 'title', 'start_of_contract', 'end_of_contract',
+    'weekly_approved_hours', 'is_active', 'pre_contracted_value'
+]
+RECORD_COLUMNS = CASE_COLUMNS + ['actual', 'number_of_days', 'approved_hours']
 
 @dataclass
 class WeekData:
@@ -38,6 +45,7 @@ class ApprovedVsActualResult:
     number_of_cases: int
     cases: List[CaseData]
 
+@singleflight
 def compute_approved_vs_actual(start: str | datetime, end: str | datetime) -> ApprovedVsActualResult:
     raw_data = _compute_raw_data(start, end)
     unique_cases = _process_raw_data(raw_data)
@@ -115,7 +123,7 @@ def _compute_raw_data(start, end):
     if isinstance(end, str):
         end = datetime.fromisoformat(end)
 
-    s, ew = Weeks.get_week_dates(start)
+    s, _ = Weeks.get_week_dates(start)
     _, e = Weeks.get_week_dates(end)
 
     result = {
@@ -124,41 +132,53 @@ def _compute_raw_data(start, end):
         'weeks': []
     }
 
-    while s < e:
-        timesheet = _summarize_consulting_timesheet(s, ew)
-        df = _list_cases_with_approved_hours_and_actual(s, ew, timesheet)
+    number_of_weeks = max(((e - s).days + 1) // 7, 0)
+    if number_of_weeks == 0:
+        return result
+
+    starts = pd.date_range(s, periods=number_of_weeks, freq='7D')
+    weeks = pd.DataFrame({
+        'week': range(number_of_weeks),
+        'start_of_week': starts,
+        'end_of_week': starts + pd.Timedelta(days=7) - pd.Timedelta(microseconds=1)
+    })
+
+    # Every case live at some point of the range, against every week of it
+    df = weeks.merge(_list_cases_with_approved_hours(s, e), how='cross')
+    df = df[
+        (df['start_of_contract'].isna() | (df['start_of_contract'] <= df['end_of_week'])) &
+        (df['end_of_contract'].isna() | (df['end_of_contract'] >= df['start_of_week']))
+    ]
 
-        df['start_of_week'] = df['start_of_contract'].apply(lambda x: max(s, x) if pd.notna(x) else s)
-        df['end_of_week'] = df['end_of_contract'].apply(lambda x: min(ew, x) if pd.notna(x) else ew)
-        df['number_of_days'] = (df['end_of_week'] - df['start_of_week']).dt.days + 1
-        df['approved_hours'] = df['weekly_approved_hours'] * df['number_of_days'] / 7
+    df = df.merge(_summarize_consulting_timesheet(s, e), on=['week', 'id'], how='left')
+    df['actual'] = df['actual'].fillna(0)
 
-        df['start_of_contract'] = df['start_of_contract'].apply(lambda x: None if pd.isna(x) or x is pd.NaT else x)
-        df['end_of_contract'] = df['end_of_contract'].apply(lambda x: None if pd.isna(x) or x is pd.NaT else x)
+    start_of_week = df['start_of_contract'].where(df['start_of_contract'] > df['start_of_week'], df['start_of_week'])
+    end_of_week = df['end_of_contract'].where(df['end_of_contract'] < df['end_of_week'], df['end_of_week'])
+    df['number_of_days'] = (end_of_week - start_of_week).dt.days + 1
+    df['approved_hours'] = df['weekly_approved_hours'] * df['number_of_days'] / 7
 
-        # Convert datetime columns to ISO format strings
-        df['start_of_week'] = df['start_of_week'].apply(lambda x: x.isoformat() if pd.notna(x) else None)
-        df['end_of_week'] = df['end_of_week'].apply(lambda x: x.isoformat() if pd.notna(x) else None)
-        df['start_of_contract'] = df['start_of_contract'].apply(lambda x: x.isoformat() if pd.notna(x) else None)
-        df['end_of_contract'] = df['end_of_contract'].apply(lambda x: x.isoformat() if pd.notna(x) else None)
+    for column in ['start_of_contract', 'end_of_contract']:
+        df[column] = df[column].dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object).where(df[column].notna(), None)
 
-        week_data = df.to_dict(orient='records')
+    week_data = [[] for _ in range(number_of_weeks)]
+    for week, record in zip(df['week'].tolist(), df[RECORD_COLUMNS].to_dict(orient='records')):
+        week_data[week].append(record)
 
+    for week in weeks.itertuples():
+        week_start = week.start_of_week.to_pydatetime()
         result['weeks'].append(
             {
-                'start': s.isoformat(),
-                'end': ew.isoformat(),
-                'title': Weeks.get_week_string(s),
-                'data': week_data
+                'start': week_start.isoformat(),
+                'end': week.end_of_week.to_pydatetime().isoformat(),
+                'title': Weeks.get_week_string(week_start),
+                'data': week_data[week.week]
             }
         )
 
-        s = ew + pd.Timedelta(days=1)
-        s, ew = Weeks.get_week_dates(s)
-
     return result
 
-def _list_cases_with_approved_hours_and_actual(start_date, end_date, consulting_timesheet_summary):
+def _list_cases_with_approved_hours(start_date, end_date):
     cases = globals.omni_models.cases.get_live_cases_with_approved_hours(start_date, end_date)
 
     df = pd.DataFrame(
@@ -171,30 +191,26 @@ def _list_cases_with_approved_hours_and_actual(start_date, end_date, consulting_
             'weekly_approved_hours': case.weekly_approved_hours,
             'is_active': case.is_active,
             'pre_contracted_value': case.pre_contracted_value
-        } for case in cases]
+        } for case in cases],
+        columns=CASE_COLUMNS
     )
 
     df['start_of_contract'] = pd.to_datetime(df['start_of_contract'])
     df['end_of_contract'] = pd.to_datetime(df['end_of_contract'])
-
-    if consulting_timesheet_summary is not None and not consulting_timesheet_summary.empty:
-        df = pd.merge(df, consulting_timesheet_summary, on='id', how='left')
-        df['actual'] = df['actual'].fillna(0)
-    else:
-        df['actual'] = 0
-
     return df
 
 def _summarize_consulting_timesheet(start, end):
-    timesheet = globals.omni_datasets.timesheets.get(start, end)
-    timesheet_df = timesheet.data
+    """Consulting hours per case in each week from `start`, read from a single fetch of the range"""
+    timesheet_df = globals.omni_datasets.timesheets.get(start, end).data
     if not timesheet_df.empty:
         timesheet_df = timesheet_df[timesheet_df['Kind'] == 'Consulting']
 
     if timesheet_df.empty:
-        return pd.DataFrame()
+        return pd.DataFrame({'week': pd.Series(dtype='int64'), 'id': pd.Series(dtype=object), 'actual': pd.Series(dtype='float64')})
 
-    summary = timesheet_df.groupby(['CaseId'])['TimeInHs'].sum().reset_index()
+    week = ((pd.to_datetime(timesheet_df['Date']) - start).dt.days // 7).rename('week')
+    summary = timesheet_df.groupby([week, 'CaseId'], observed=True)['TimeInHs'].sum().reset_index()
+    summary['CaseId'] = summary['CaseId'].astype(object)
     return summary.rename(
         columns={
             'CaseId': 'id',
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional
-from omni_utils.helpers.dates import get_same_day_one_month_ago, get_same_day_one_month_later, get_last_day_of_month, get_working_days_in_month
+from omni_utils.helpers.dates import get_same_day_one_month_ago, get_same_day_one_month_later, get_last_day_of_month
+from omni_utils.helpers.business_calendar import count_working_days_in_month, is_working_day
 from datetime import datetime, date
 import calendar
 from pydantic import BaseModel
@@ -8,6 +9,7 @@ from omni_models.analytics.revenue_tracking import RevenueTracking
 from omni_shared import globals
 from omni_models.analytics.revenue_tracking import compute_revenue_tracking
 from omni_models.analytics import forecast_types
+from omni_utils.decorators.singleflight import singleflight
 
 
 labels_suffix_future = [
@@ -84,26 +86,26 @@ class RevenueForecastNumberOfWorkingDays(BaseModel):
     @classmethod
     def build(cls, date_of_interest: datetime, forecast_dates: RevenueForecastDates) -> 'RevenueForecastNumberOfWorkingDays':
         return cls(
-            in_analysis=len(get_working_days_in_month(date_of_interest.year, date_of_interest.month)),
-            in_analysis_partial=len([d for d in get_working_days_in_month(date_of_interest.year, date_of_interest.month) if d.day <= date_of_interest.day]),
+            in_analysis=count_working_days_in_month(date_of_interest.year, date_of_interest.month),
+            in_analysis_partial=count_working_days_in_month(date_of_interest.year, date_of_interest.month, date_of_interest.day),
             
-            one_month_ago=len(get_working_days_in_month(forecast_dates.same_day_one_month_ago.year, forecast_dates.same_day_one_month_ago.month)),
-            same_day_one_month_ago=len([d for d in get_working_days_in_month(forecast_dates.same_day_one_month_ago.year, forecast_dates.same_day_one_month_ago.month) if d.day <= date_of_interest.day]),
+            one_month_ago=count_working_days_in_month(forecast_dates.same_day_one_month_ago.year, forecast_dates.same_day_one_month_ago.month),
+            same_day_one_month_ago=count_working_days_in_month(forecast_dates.same_day_one_month_ago.year, forecast_dates.same_day_one_month_ago.month, date_of_interest.day),
             
-            two_months_ago=len(get_working_days_in_month(forecast_dates.same_day_two_months_ago.year, forecast_dates.same_day_two_months_ago.month)),
-            same_day_two_months_ago=len([d for d in get_working_days_in_month(forecast_dates.same_day_two_months_ago.year, forecast_dates.same_day_two_months_ago.month) if d.day <= date_of_interest.day]),
+            two_months_ago=count_working_days_in_month(forecast_dates.same_day_two_months_ago.year, forecast_dates.same_day_two_months_ago.month),
+            same_day_two_months_ago=count_working_days_in_month(forecast_dates.same_day_two_months_ago.year, forecast_dates.same_day_two_months_ago.month, date_of_interest.day),
             
-            three_months_ago=len(get_working_days_in_month(forecast_dates.same_day_three_months_ago.year, forecast_dates.same_day_three_months_ago.month)),
-            same_day_three_months_ago=len([d for d in get_working_days_in_month(forecast_dates.same_day_three_months_ago.year, forecast_dates.same_day_three_months_ago.month) if d.day <= date_of_interest.day]),
+            three_months_ago=count_working_days_in_month(forecast_dates.same_day_three_months_ago.year, forecast_dates.same_day_three_months_ago.month),
+            same_day_three_months_ago=count_working_days_in_month(forecast_dates.same_day_three_months_ago.year, forecast_dates.same_day_three_months_ago.month, date_of_interest.day),
             
-            one_month_later=len(get_working_days_in_month(forecast_dates.same_day_one_month_later.year, forecast_dates.same_day_one_month_later.month)),
-            same_day_one_month_later=len([d for d in get_working_days_in_month(forecast_dates.same_day_one_month_later.year, forecast_dates.same_day_one_month_later.month) if d.day <= date_of_interest.day]),
+            one_month_later=count_working_days_in_month(forecast_dates.same_day_one_month_later.year, forecast_dates.same_day_one_month_later.month),
+            same_day_one_month_later=count_working_days_in_month(forecast_dates.same_day_one_month_later.year, forecast_dates.same_day_one_month_later.month, date_of_interest.day),
             
-            two_months_later=len(get_working_days_in_month(forecast_dates.same_day_two_months_later.year, forecast_dates.same_day_two_months_later.month)),
-            same_day_two_months_later=len([d for d in get_working_days_in_month(forecast_dates.same_day_two_months_later.year, forecast_dates.same_day_two_months_later.month) if d.day <= date_of_interest.day]),
+            two_months_later=count_working_days_in_month(forecast_dates.same_day_two_months_later.year, forecast_dates.same_day_two_months_later.month),
+            same_day_two_months_later=count_working_days_in_month(forecast_dates.same_day_two_months_later.year, forecast_dates.same_day_two_months_later.month, date_of_interest.day),
             
-            three_months_later=len(get_working_days_in_month(forecast_dates.same_day_three_months_later.year, forecast_dates.same_day_three_months_later.month)),
-            same_day_three_months_later=len([d for d in get_working_days_in_month(forecast_dates.same_day_three_months_later.year, forecast_dates.same_day_three_months_later.month) if d.day <= date_of_interest.day])
+            three_months_later=count_working_days_in_month(forecast_dates.same_day_three_months_later.year, forecast_dates.same_day_three_months_later.month),
+            same_day_three_months_later=count_working_days_in_month(forecast_dates.same_day_three_months_later.year, forecast_dates.same_day_three_months_later.month, date_of_interest.day)
         )
 
 class ForecastRevenueTrackings(BaseModel):
@@ -202,6 +204,7 @@ class RevenueForecast(BaseModel):
     working_days: RevenueForecastNumberOfWorkingDays
     daily: list[RevenueForecastDailyForecast]
 
+@singleflight
 def compute_forecast(date_of_interest = None, filters = None):
     if date_of_interest is None:
         date_of_interest = datetime.now()
@@ -375,7 +378,6 @@ def compute_forecast(date_of_interest = None, filters = None):
                 month = date_of_interest.month
                 for n in range(0, 4):
                     days_in_month = calendar.monthrange(year, month)[1]
-                    working_days_in_month = get_working_days_in_month(year, month)
                     
                     hours_in_month = 0
                     daily_approved_hours = wah / 5
@@ -393,7 +395,7 @@ def compute_forecast(date_of_interest = None, filters = None):
                         if due_on and date.date() > due_on:
                             break
                         
-                        if date in working_days_in_month:
+                        if is_working_day(date):
                             hours_in_month += daily_approved_hours
                             if date.date() in daily and project_ and project_.rate:
                                 daily_forecast = daily[date.date()]
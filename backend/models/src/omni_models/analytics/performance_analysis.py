@@ -9,6 +9,7 @@ from omni_models.domain.cases import Case
 from omni_shared import globals
 
 from omni_utils.helpers.weeks import Weeks
+from omni_utils.decorators.singleflight import singleflight
 
 @dataclass
 class CaseHours:
@@ -45,7 +46,7 @@ class WorkingDayHours:
             
         by_case = [
             CaseHours.new(case_id, hours)
-            for case_id, hours in timesheet.groupby('CaseId')['TimeInHs'].sum().items()
+            for case_id, hours in timesheet.groupby('CaseId', observed=True)['TimeInHs'].sum().items()
         ]
         
         return WorkingDayHours(
@@ -479,6 +480,7 @@ def _filter_cases_by_period(cases: List[Case], start: date, end: date) -> List[C
         if case.has_contract_in_period(start, end)
     ]
 
+@singleflight
 def compute_performance_analysis(date_of_interest: str | date) -> PerformanceAnalysis:
     if isinstance(date_of_interest, str):
         date_of_interest = datetime.fromisoformat(date_of_interest).date()
@@ -7,11 +7,15 @@ from omni_models.domain.cases import Case
 from omni_utils.helpers.dates import get_first_day_of_month, get_last_day_of_month
 import pandas as pd
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+from omni_utils.decorators.result_cache import ResultCache
+from omni_utils.decorators.singleflight import singleflight
+from omni_shared.settings import analytics_settings
 
 INTERNAL_KIND = "Internal"
 PROJECT_KINDS = ["consulting", "handsOn", "squad"]
 NA_VALUE = "N/A"
+PROJECT_COLUMNS = ["Date", "WorkerName", "TimeInHs", "Revenue"]
 
 class RevenueTrackingDaily(BaseModel):
     date: date
@@ -973,6 +977,20 @@ class RevenueTracking(BaseModel):
     total: float
     filterable_fields: List[dict]
 
+def _split_by(df: pd.DataFrame, column: str, columns: List[str] = None) -> Dict:
+    """Rows of each value of `column`, keeping their order; values come in order of first appearance.
+
+    `columns` narrows the parts to what the caller reads, which makes splitting much cheaper.
+    """
+    if len(df) == 0:
+        return {}
+    indices = df.groupby(column, observed=True, sort=False, dropna=False).indices
+    source = df if columns is None else df[[c for c in columns if c in df.columns]]
+    return {
+        value: source.iloc[positions]
+        for value, positions in sorted(indices.items(), key=lambda item: item[1][0])
+    }
+
 def _compute_revenue_tracking_base(df: pd.DataFrame, date_of_interest: date, process_project, account_manager_name_or_slug: str = None):
     first_day_of_month = get_first_day_of_month(date_of_interest)
     last_day_of_month = get_last_day_of_month(date_of_interest)
@@ -987,7 +1005,7 @@ def _compute_revenue_tracking_base(df: pd.DataFrame, date_of_interest: date, pro
         
     def update_daily_values(project_df, project_fee, daily_records):
         if len(project_df) > 0 and "Date" in project_df.columns:
-            daily_data = project_df.groupby("Date").agg({
+            daily_data = project_df.groupby("Date", observed=True).agg({
                 "TimeInHs": "sum",
                 "Revenue": "sum" if "Revenue" in project_df.columns else None
             }).reset_index()
@@ -1016,8 +1034,6 @@ def _compute_revenue_tracking_base(df: pd.DataFrame, date_of_interest: date, pro
             df_ = df[df["AccountManagerSlug"] == account_manager_name_or_slug]
         df = df_
         
-    case_ids = sorted(set(df["CaseId"].unique())) if len(df) > 0 else []
-    active_cases = [globals.omni_models.cases.get_by_id(case_id) for case_id in case_ids]
     doi = date_of_interest.date() if hasattr(date_of_interest, 'date') else date_of_interest
     active_cases = [
         case
@@ -1031,62 +1047,69 @@ def _compute_revenue_tracking_base(df: pd.DataFrame, date_of_interest: date, pro
         )
     ]
     
-    account_managers = sorted(set(
-        client.account_manager.name
-        for case in active_cases
-        if case.client_id
-        for client in [globals.omni_models.clients.get_by_id(case.client_id)]
-        if client and client.account_manager
-    ))
+    # The timesheet is split by project once, and every case is placed under
+    # its client and account manager in a single pass, so building the tree
+    # no longer rescans the cases or the timesheet at each level
+    project_frames = _split_by(df, "ProjectId", PROJECT_COLUMNS)
+    no_rows = df[[c for c in PROJECT_COLUMNS if c in df.columns]].iloc[0:0] if len(df) > 0 else pd.DataFrame()
+    
+    clients = globals.omni_models.clients
+    client_names_by_account_manager: Dict[str, set] = {}
+    cases_by_client_name: Dict[str, List[Case]] = {}
+    for case in active_cases:
+        client_name = case.find_client_name(clients)
+        cases_by_client_name.setdefault(client_name, []).append(case)
+        
+        client = clients.get_by_id(case.client_id) if case.client_id else None
+        if client and client.account_manager:
+            client_names_by_account_manager.setdefault(client.account_manager.name, set()).add(client_name)
+    
+    def build_case(case: Case) -> Optional[RevenueTrackingCase]:
+        by_project = []
+        for project in case.tracker_info:
+            project_df = project_frames.get(project.id, no_rows)
+            project_data = process_project(date_of_interest, case, project, project_df, df, pro_rata_info)
+            if project_data:
+                by_project.append(project_data)
+                if project.kind == "consulting":
+                    update_daily_values(project_df, project_data.fee, daily)
+        
+        if len(by_project) == 0:
+            return None
+        
+        return RevenueTrackingCase(
+            title=case.title,
+            slug=case.slug,
+            fee=sum(project.fee for project in by_project),
+            consulting_hours=sum(project.hours for project in by_project if project.kind == "consulting"),
+            consulting_fee=sum(project.fee for project in by_project if project.kind == "consulting"),
+            consulting_fee_new=sum(project.fee for project in by_project if project.kind == "consulting" and case.start_of_contract and case.start_of_contract.year == date_of_interest.year and case.start_of_contract.month == date_of_interest.month),
+            consulting_pre_hours=sum(project.hours for project in by_project if project.kind == "consulting" and project.fixed),
+            consulting_pre_fee=sum(project.fee for project in by_project if project.kind == "consulting" and project.fixed),
+            hands_on_fee=sum(project.fee for project in by_project if project.kind == "handsOn"),
+            squad_fee=sum(project.fee for project in by_project if project.kind == "squad"),
+            by_project=sorted(by_project, key=lambda x: x.name),
+            partial=any(hasattr(project, 'partial') and project.partial for project in by_project)
+        )
     
     by_account_manager = []
-    for account_manager_name in account_managers:
+    for account_manager_name in sorted(client_names_by_account_manager):
         by_client = []
         
-        client_names = sorted(set(
-            case.find_client_name(globals.omni_models.clients)
-            for case in active_cases
-            if case.client_id
-            and globals.omni_models.clients.get_by_id(case.client_id).account_manager
-            and globals.omni_models.clients.get_by_id(case.client_id).account_manager.name == account_manager_name
-        ))
-        
-        for client_name in client_names:
+        for client_name in sorted(client_names_by_account_manager[account_manager_name]):
+            client_cases = cases_by_client_name[client_name]
             sponsors_names = sorted(set(
                 case.sponsor if case.sponsor else NA_VALUE
-                for case in active_cases
-                if case.find_client_name(globals.omni_models.clients) == client_name
+                for case in client_cases
             ))
             
             by_sponsor = []
             for sponsor_name in sponsors_names:
                 by_case = []
-                for case in active_cases:
-                    if case.find_client_name(globals.omni_models.clients) == client_name and case.sponsor == sponsor_name:
-                        by_project = []
-                        for project in case.tracker_info:
-                            project_data = process_project(date_of_interest, case, project, df, pro_rata_info)
-                            if project_data:
-                                by_project.append(project_data)
-                                if project.kind == "consulting":
-                                    project_df = df[df["ProjectId"] == project.id] if len(df) > 0 else pd.DataFrame()
-                                    update_daily_values(project_df, project_data.fee, daily)
-                    
-                        if len(by_project) > 0:
-                            case_ = RevenueTrackingCase(
-                                title=case.title,
-                                slug=case.slug,
-                                fee=sum(project.fee for project in by_project),
-                                consulting_hours=sum(project.hours for project in by_project if project.kind == "consulting"),
-                                consulting_fee=sum(project.fee for project in by_project if project.kind == "consulting"),
-                                consulting_fee_new=sum(project.fee for project in by_project if project.kind == "consulting" and case.start_of_contract and case.start_of_contract.year == date_of_interest.year and case.start_of_contract.month == date_of_interest.month),
-                                consulting_pre_hours=sum(project.hours for project in by_project if project.kind == "consulting" and project.fixed),
-                                consulting_pre_fee=sum(project.fee for project in by_project if project.kind == "consulting" and project.fixed),
-                                hands_on_fee=sum(project.fee for project in by_project if project.kind == "handsOn"),
-                                squad_fee=sum(project.fee for project in by_project if project.kind == "squad"),
-                                by_project=sorted(by_project, key=lambda x: x.name),
-                                partial=any(hasattr(project, 'partial') and project.partial for project in by_project)
-                            )
+                for case in client_cases:
+                    if case.sponsor == sponsor_name:
+                        case_ = build_case(case)
+                        if case_:
                             by_case.append(case_)
                 
                 if len(by_case) > 0:
@@ -1156,13 +1179,11 @@ def _compute_revenue_tracking_base(df: pd.DataFrame, date_of_interest: date, pro
     return RevenueTrackingBase(monthly=monthly, daily=daily), pro_rata_info
 
 def compute_regular_revenue_tracking(df: pd.DataFrame, date_of_interest: date, account_manager_name_or_slug: str = None):
-    def process_project(date_of_interest: date, _, project, timesheet_df, pro_rata_info):
+    def process_project(date_of_interest: date, _, project, project_df, timesheet_df, pro_rata_info):
         if project.rate and project.rate.rate:
-            project_df = timesheet_df[timesheet_df["ProjectId"] == project.id] if len(timesheet_df) > 0 else pd.DataFrame()
             if len(project_df) > 0:
                 by_worker = []
-                for worker_name in project_df["WorkerName"].unique():
-                    worker_df = project_df[project_df["WorkerName"] == worker_name]
+                for worker_name, worker_df in _split_by(project_df, "WorkerName", ["TimeInHs", "Revenue"]).items():
                     worker = globals.omni_models.workers.get_by_name(worker_name)
                     by_worker.append(RevenueTrackingWorker(
                         name=worker_name,
@@ -1186,8 +1207,7 @@ def compute_regular_revenue_tracking(df: pd.DataFrame, date_of_interest: date, a
     return _compute_revenue_tracking_base(df, date_of_interest, process_project, account_manager_name_or_slug)[0]
 
 def compute_pre_contracted_revenue_tracking(df: pd.DataFrame, date_of_interest: date, account_manager_name_or_slug: str = None):
-    def process_project(date_of_interest: date, case: Case, project, timesheet_df: pd.DataFrame, pro_rata_info):
-        project_df = timesheet_df[timesheet_df["ProjectId"] == project.id] if len(timesheet_df) > 0 else pd.DataFrame()
+    def process_project(date_of_interest: date, case: Case, project, project_df: pd.DataFrame, timesheet_df: pd.DataFrame, pro_rata_info):
         result = None
         
         created_at = project.created_at.date() if hasattr(project.created_at, 'date') else project.created_at
@@ -1275,8 +1295,6 @@ def compute_pre_contracted_revenue_tracking(df: pd.DataFrame, date_of_interest:
                     fixed=True
                 )
             else:
-                project_df = timesheet_df[timesheet_df["ProjectId"] == project.id] if len(timesheet_df) > 0 else pd.DataFrame()
-                    
                 partial = False
                 fee = project.billing.fee / 100
                 partial_fee = 0
@@ -1291,7 +1309,7 @@ def compute_pre_contracted_revenue_tracking(df: pd.DataFrame, date_of_interest:
                         client_name = client.name
                         account_manager_name = client.account_manager.name if client.account_manager else "N/A"
                         
-                    workers_hours = project_df.groupby("WorkerName")["TimeInHs"].sum().reset_index() if len(project_df) > 0 else pd.DataFrame()
+                    workers_hours = project_df.groupby("WorkerName", observed=True)["TimeInHs"].sum().reset_index() if len(project_df) > 0 else pd.DataFrame()
                     number_of_workers = len(workers_hours)
                     
                     if project.budget:
@@ -1443,8 +1461,7 @@ def compute_pre_contracted_revenue_tracking(df: pd.DataFrame, date_of_interest:
                 
         if result and len(project_df) > 0:
             by_worker = []
-            for worker_name in project_df["WorkerName"].unique():
-                worker_df = project_df[project_df["WorkerName"] == worker_name]
+            for worker_name, worker_df in _split_by(project_df, "WorkerName", ["TimeInHs"]).items():
                 worker = globals.omni_models.workers.get_by_name(worker_name)
                 by_worker.append(RevenueTrackingWorker(
                     name=worker_name,
@@ -1457,26 +1474,60 @@ def compute_pre_contracted_revenue_tracking(df: pd.DataFrame, date_of_interest:
     
     return _compute_revenue_tracking_base(df, date_of_interest, process_project, account_manager_name_or_slug)
 
+def _normalize_date_of_interest(date_of_interest) -> date:
+    if not date_of_interest:
+        return date.today()
+    if isinstance(date_of_interest, str):
+        return date.fromisoformat(date_of_interest[:10])
+    if isinstance(date_of_interest, datetime):
+        return date_of_interest.date()
+    return date_of_interest
+
+def _normalize_filters(filters) -> tuple:
+    """Hashable form of the filters; like apply_filters, only the first entry of a field counts"""
+    selected = {}
+    for filter_item in filters or []:
+        values = filter_item['selected_values'] if 'selected_values' in filter_item else filter_item['selectedValues']
+        selected.setdefault(filter_item['field'], tuple(values or ()))
+    return tuple(sorted((field, values) for field, values in selected.items() if values))
+
+_revenue_trackings = ResultCache(
+    'compute_revenue_tracking',
+    max_entries=analytics_settings['revenue_tracking_cache_size']
+)
+
+@singleflight
 def compute_revenue_tracking(
     date_of_interest: date,
     account_manager_name_or_slug: str = None,
     filters = None
     ) -> RevenueTracking:
     
-            
-    if not date_of_interest:
-        date_of_interest = date.today()
-        
-    if isinstance(date_of_interest, str):
-        date_of_interest = date.fromisoformat(date_of_interest)
-    
-    year = date_of_interest.year
-    month = date_of_interest.month
+    date_of_interest = _normalize_date_of_interest(date_of_interest)
     
     s = datetime.combine(date(date_of_interest.year, date_of_interest.month, 1), datetime.min.time())
     e = datetime.combine(date_of_interest, datetime.max.time())
     
-    timesheet = globals.omni_datasets.timesheets.get(s, e)
+    # Results are reused until the timesheet of the month changes; rebuilding
+    # the models (new cases, clients, ...) replaces the dataset and drops them all
+    timesheets = globals.omni_datasets.timesheets
+    key = (
+        date_of_interest,
+        account_manager_name_or_slug,
+        _normalize_filters(filters),
+        timesheets.get_version(s, e)
+    )
+    
+    def compute():
+        # Closed months are read from their daily facts instead of the appointments
+        timesheet = timesheets.get_facts(s, e)
+        if timesheet is None:
+            timesheet = timesheets.get(s, e)
+        return _compute_revenue_tracking(timesheet, date_of_interest, account_manager_name_or_slug, filters)
+    
+    return _revenue_trackings.get_or_compute(key, compute, scope=timesheets)
+
+def _compute_revenue_tracking(timesheet, date_of_interest: date, account_manager_name_or_slug: str, filters) -> RevenueTracking:
     df = timesheet.data
     
     if len(df) != 0:
@@ -1497,8 +1548,8 @@ def compute_revenue_tracking(
     summaries = compute_summaries(pre_contracted, regular)
     
     return RevenueTracking(
-        year=year,
-        month=month,
+        year=date_of_interest.year,
+        month=date_of_interest.month,
         day=date_of_interest.day,
         pre_contracted=pre_contracted,
         pro_rata_info=pro_rata_info,
@@ -3,7 +3,9 @@ import pandas as pd
 from omni_utils.helpers.weeks import Weeks
 from omni_shared import globals
 from .timeliness_models import TimelinessReview, WorkerSummary
+from omni_utils.decorators.singleflight import singleflight
 
+@singleflight
 def compute_timeliness_review(date_of_interest, filters=None):
     if isinstance(date_of_interest, str):
         date_of_interest = datetime.strptime(date_of_interest, '%Y-%m-%d')
@@ -54,7 +56,7 @@ def compute_timeliness_review(date_of_interest, filters=None):
 
     # Função auxiliar para criar resumos de trabalhadores
     def create_worker_summary(filter_condition):
-        worker_group = df[filter_condition].groupby(['WorkerName', 'WorkerSlug']).agg(
+        worker_group = df[filter_condition].groupby(['WorkerName', 'WorkerSlug'], observed=True).agg(
             entries=('WorkerName', 'size'),
             time_in_hours=('TimeInHs', 'sum')
         ).reset_index()
@@ -105,7 +107,7 @@ def compute_timeliness_review(date_of_interest, filters=None):
     )
 
 def _create_worker_summary(self, df, filter_condition):
-    worker_group = df[filter_condition].groupby(['WorkerName', 'WorkerSlug']).agg(
+    worker_group = df[filter_condition].groupby(['WorkerName', 'WorkerSlug'], observed=True).agg(
         entries=('WorkerName', 'size'),
         time_in_hours=('TimeInHs', 'sum')
     ).reset_index()
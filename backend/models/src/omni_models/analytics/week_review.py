@@ -6,7 +6,9 @@ from omni_shared import globals
 
 import pandas as pd
 import numpy as np
+from omni_utils.decorators.singleflight import singleflight
 
+@singleflight
 def compute_week_review(date_of_interest, filters=None):
     if isinstance(date_of_interest, str):
         date_of_interest = datetime.strptime(date_of_interest, '%Y-%m-%d')
@@ -47,12 +49,12 @@ def _calculate_week_summary(six_weeks_df: pd.DataFrame, date_of_interest: dateti
     previous_weeks_data = six_weeks_df[six_weeks_df['Week'] != week]
 
     # Group and compute the necessary aggregates
-    grouped_timesheet = previous_weeks_data.groupby('Week')['TimeInHs'].sum().reset_index()
+    grouped_timesheet = previous_weeks_data.groupby('Week', observed=True)['TimeInHs'].sum().reset_index()
     previous_weeks_mean = grouped_timesheet['TimeInHs'].mean()
 
     # Filter up to the current weekday and compute mean
     filtered_df = previous_weeks_data[previous_weeks_data['NDayOfWeek'] <= week_day]
-    previous_weeks_to_date_mean = filtered_df.groupby('Week')['TimeInHs'].sum().mean()
+    previous_weeks_to_date_mean = filtered_df.groupby('Week', observed=True)['TimeInHs'].sum().mean()
 
     # Compute the current week's sum
     week_timesheet_data = week_timesheet_data[week_timesheet_data['NDayOfWeek'] <= week_day]
@@ -118,13 +120,13 @@ def _create_six_weeks_allocation_analysis(
     df_left = df[df['Week'] != week]
     df_right = df[df['Week'] == week]
 
-    summary_left = df_left.groupby([column_of_interest, 'Week'])['TimeInHs'].sum().reset_index()
-    summary_left = summary_left.groupby(column_of_interest)['TimeInHs'].mean().reset_index()
+    summary_left = df_left.groupby([column_of_interest, 'Week'], observed=True)['TimeInHs'].sum().reset_index()
+    summary_left = summary_left.groupby(column_of_interest, observed=True)['TimeInHs'].mean().reset_index()
     summary_left.rename(columns={'TimeInHs': 'Mean'}, inplace=True)
 
-    summary_right = df_right.groupby(column_of_interest)['TimeInHs'].sum().reset_index()
+    summary_right = df_right.groupby(column_of_interest, observed=True)['TimeInHs'].sum().reset_index()
     summary_right.rename(columns={'TimeInHs': 'Current'}, inplace=True)
-    merged_summary = pd.merge(summary_left, summary_right, on=column_of_interest, how='outer').fillna(0)
+    merged_summary = pd.merge(summary_left, summary_right, on=column_of_interest, how='outer').fillna({'Mean': 0, 'Current': 0})
     merged_summary.rename(columns={column_of_interest: output_column_name}, inplace=True)
 
     merged_summary['Total'] = merged_summary['Current'] + merged_summary['Mean']
@@ -158,12 +160,12 @@ def _compute_timesheet_date_analysis(df, date_of_interest: datetime, number_of_w
     dates_of_interest = [d for d in dates_of_interest if d.strftime('%A') == day_of_week]
 
     ds = df[df['DayOfWeek'] == day_of_week]
-    daily_summary = ds.groupby(['Date', 'Kind'])['TimeInHs'].sum().unstack().fillna(0)
+    daily_summary = ds.groupby(['Date', 'Kind'], observed=True)['TimeInHs'].sum().unstack().fillna(0)
 
     all_dates_df = pd.DataFrame(0, index=dates_of_interest, columns=kinds_present)
     all_dates_df.index.name = 'Date'
 
-    daily_summary = pd.concat([daily_summary, all_dates_df]).groupby('Date').sum().fillna(0)
+    daily_summary = pd.concat([daily_summary, all_dates_df]).groupby('Date', observed=True).sum().fillna(0)
     daily_summary = daily_summary.sort_index()
 
     # Convert daily_summary to a format compatible with DailySummaryEntry
@@ -182,7 +184,7 @@ def _compute_timesheet_date_analysis(df, date_of_interest: datetime, number_of_w
     total_hours = current_day_data['TimeInHs'].sum()
 
     past_data = ds[ds['Date'] < date_of_interest.date()]
-    ds_grouped = past_data.groupby('Date')['TimeInHs'].sum()
+    ds_grouped = past_data.groupby('Date', observed=True)['TimeInHs'].sum()
 
     past_dates_of_interest = [d for d in dates_of_interest if d < date_of_interest.date()]
     past_dates_reference = pd.DataFrame(
@@ -0,0 +1,112 @@
+import threading
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class FieldIndex:
+    """Dictionary of the values of a column, in sorted order, and the rows holding each value.
+
+    `codes` holds the position of every row's value in `values` (-1 when
+    missing); the rows of a value are a slice of `rows`, which lists the row
+    positions grouped by value.
+    """
+
+    def __init__(self, series: pd.Series):
+        codes, uniques = pd.factorize(series)
+        found = pd.Index(uniques).tolist()
+
+        # Options are listed as sorted() lists them, which is not always the factorized order (categoricals)
+        order = sorted(range(len(found)), key=found.__getitem__)
+        rank = np.empty(len(found), dtype=np.int32)
+        rank[order] = np.arange(len(found), dtype=np.int32)
+
+        self.values: List[Any] = [found[i] for i in order]
+        self.positions: Dict[Any, int] = {value: position for position, value in enumerate(self.values)}
+        present = codes >= 0
+        self.codes = np.full(len(codes), -1, dtype=np.int32)
+        self.codes[present] = rank[codes[present]]
+
+        self.rows = np.flatnonzero(present)[np.argsort(self.codes[present], kind='stable')].astype(np.int32)
+        self.bounds = np.concatenate(([0], np.cumsum(np.bincount(self.codes[present], minlength=len(self.values)))))
+
+    def options(self, mask: Optional[np.ndarray] = None) -> List[Any]:
+        """Sorted distinct values, of the rows in `mask` when given"""
+        if mask is None:
+            return list(self.values)
+        codes = self.codes[mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        return [self.values[position] for position in np.flatnonzero(counts).tolist()]
+
+    def mask(self, values: Iterable[Any]) -> np.ndarray:
+        """Bitmap of the rows holding any of `values`"""
+        result = np.zeros(len(self.codes), dtype=bool)
+        for value in values:
+            position = self.positions.get(value)
+            if position is not None:
+                result[self.rows[self.bounds[position]:self.bounds[position + 1]]] = True
+        return result
+
+
+class FieldScan:
+    """FieldIndex's answers read straight off the column, for frames filtered only once"""
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+
+    def options(self, mask: Optional[np.ndarray] = None) -> List[Any]:
+        series = self.series if mask is None else self.series[mask]
+        return sorted(series.dropna().unique().tolist())
+
+    def mask(self, values: Iterable[Any]) -> np.ndarray:
+        return self.series.isin(list(values)).to_numpy()
+
+
+class FilterIndex:
+    """Per-field indexes of a frame, built when a field of a frame filtered before is filtered on.
+
+    Building an index costs more than scanning the column once, so the first
+    time a frame is seen its fields are scanned; frames that come back, as the
+    frames cached by the datasets do, are indexed then and for as long as they
+    live. Fresh slices (`df[df["Kind"] != "Internal"]`) are never indexed.
+    Indexed frames must not be modified in place.
+    """
+
+    _indexes: Dict[int, 'FilterIndex'] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = weakref.ref(df)
+        self.size = len(df)
+        self.reads = 0
+        self.fields: Dict[str, FieldIndex] = {}
+
+    @classmethod
+    def of(cls, df: pd.DataFrame) -> 'FilterIndex':
+        key = id(df)
+        with cls._lock:
+            index = cls._indexes.get(key)
+            if index is None or index._df() is not df or index.size != len(df):
+                index = cls(df)
+                cls._indexes[key] = index
+                weakref.finalize(df, cls._forget, key, index)
+            index.reads += 1
+        return index
+
+    @classmethod
+    def _forget(cls, key: int, index: 'FilterIndex'):
+        with cls._lock:
+            if cls._indexes.get(key) is index:
+                del cls._indexes[key]
+
+    def field(self, name: str) -> Union[FieldIndex, FieldScan]:
+        field_index = self.fields.get(name)
+        if field_index is None:
+            df = self._df()
+            if self.reads < 2:
+                return FieldScan(df[name])
+            field_index = FieldIndex(df[name])
+            self.fields[name] = field_index
+        return field_index
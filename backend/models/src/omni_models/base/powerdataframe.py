@@ -1,12 +1,81 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from typing import Callable, Dict, List
 from omni_utils.helpers.weeks import Weeks
 
 
+class ColumnSchema:
+    """Declares how a frame stores its columns.
+
+    `categories` are repeated strings kept as categoricals, `dtypes` narrows
+    other columns, and `derived` maps a column to the function that builds it
+    from the frame. Derived columns are never stored, only materialized on demand.
+    """
+
+    def __init__(self,
+                 categories: List[str] = None,
+                 dtypes: Dict[str, str] = None,
+                 derived: Dict[str, Callable[[pd.DataFrame], pd.Series]] = None
+                 ):
+        self.categories = categories or []
+        self.dtypes = dtypes or {}
+        self.derived = derived or {}
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        stored = [column for column in self.derived if column in df.columns]
+        if stored:
+            df = df.drop(columns=stored)
+
+        converted = {}
+        for column in self.categories:
+            if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                converted[column] = df[column].astype('category')
+
+        for column, dtype in self.dtypes.items():
+            if column in df.columns and df[column].dtype != dtype and df[column].notna().all():
+                converted[column] = df[column].astype(dtype)
+
+        return df.assign(**converted) if converted else df
+
+    def derive(self, df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+        columns = self.derived.keys() if columns is None else columns
+        derived = {
+            column: self.derived[column](df)
+            for column in columns
+            if column not in df.columns
+        }
+        return df.assign(**derived) if derived and len(df) > 0 else df
+
+    def concat(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        frames = [frame for frame in frames if len(frame.columns) > 0]
+        if not frames:
+            return pd.DataFrame()
+
+        # pd.concat falls back to object unless all parts share their categories
+        for column in self.categories:
+            parts = [frame[column] for frame in frames if column in frame.columns]
+            if len(parts) < 2 or not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+                continue
+
+            categories = parts[0].cat.categories
+            for part in parts[1:]:
+                categories = categories.union(part.cat.categories)
+
+            frames = [
+                frame.assign(**{column: frame[column].cat.set_categories(categories)})
+                if column in frame.columns else frame
+                for frame in frames
+            ]
+
+        return self.apply(pd.concat(frames))
+
+
 class PowerDataFrame:
-    def __init__(self, data, source_columns: list[str] = None):
-        self.data = PowerDataFrame.__transform_column_names(data)
+    def __init__(self, data, source_columns: list[str] = None, schema: ColumnSchema = None):
+        data = PowerDataFrame.__transform_column_names(data)
+        self.schema = schema
+        self.data = schema.apply(data) if schema else data
         self.create_at = datetime.now()
         self.__source_columns = source_columns or ['Id', 'Name', 'Url']
         self.__mergeable_data = None
@@ -55,31 +124,31 @@ class PowerDataFrame:
             if contains is not None:
                 result = self.filter_contains(result, by, contains).data
 
-        return self.__class__(result)
+        return self.__class__(result, schema=self.schema)
 
     def filter_equals(self, df, column, value):
         filtered_data = df[df[column] == value]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
     def filter_not_equals(self, df, column, value):
         filtered_data = df[df[column] != value]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
     def filter_starts_with(self, df, column, prefix):
         filtered_data = df[df[column].str.startswith(prefix, na=False)]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
     def filter_not_starts_with(self, df, column, prefix):
         filtered_data = df[~df[column].str.startswith(prefix, na=False)]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
     def filter_is_in(self, df: pd.DataFrame, column, values):
         filtered_data = df[df[column].isin(values)]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
     def filter_contains(self, df: pd.DataFrame, column, value):
         filtered_data = df[df[column].str.contains(value, na=True)]
-        return self.__class__(filtered_data)
+        return self.__class__(filtered_data, schema=self.schema)
 
 
     def to_list_of(self, column):
@@ -93,7 +162,12 @@ class PowerDataFrame:
         return len(self.data)
 
     def to_ui(self):
-        return self.data
+        return self.with_derived_columns()
+
+    def with_derived_columns(self, columns: list[str] = None) -> pd.DataFrame:
+        if self.schema is None:
+            return self.data
+        return self.schema.derive(self.data, columns)
 
     @property
     def mergeable_data(self) -> pd.DataFrame:
@@ -136,8 +210,8 @@ class PowerDataFrame:
 
 
 class SummarizablePowerDataFrame(PowerDataFrame):
-    def __init__(self, data):
-        super().__init__(data)
+    def __init__(self, data, schema: ColumnSchema = None):
+        super().__init__(data, schema=schema)
 
     def get_weekly_summary(self, by, alias=None, operation="sum", on='TimeInHs',
                            week_column='Week', date_column=None):
@@ -151,9 +225,7 @@ class SummarizablePowerDataFrame(PowerDataFrame):
         data = self.data.sort_values(date_column)
 
         if week_column not in data.columns:
-            data[week_column] = data[date_column].apply(
-                lambda x: Weeks.get_week_string(datetime.fromisoformat(x))
-            )
+            data[week_column] = Weeks.week_labels(data[date_column])
 
         if data.empty:
             return pd.DataFrame()
@@ -164,9 +236,9 @@ class SummarizablePowerDataFrame(PowerDataFrame):
         for week in weeks:
             df = data[data[week_column] == week]
             if operation == 'sum':
-                summary_df = df.groupby(by)[on].sum().round(1).reset_index(name=week)
+                summary_df = df.groupby(by, observed=True)[on].sum().round(1).reset_index(name=week)
             else:
-                summary_df = df.groupby(by).size().reset_index(name='Count')
+                summary_df = df.groupby(by, observed=True).size().reset_index(name='Count')
                 summary_df['Count'] = summary_df['Count'].astype(int)
 
             summary_df.set_index(by, inplace=True)
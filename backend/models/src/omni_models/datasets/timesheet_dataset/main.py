@@ -1,27 +1,50 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
-import numpy as np
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from omni_utils.decorators.cache import cache
+from omni_utils.decorators.singleflight import group
 from omni_models.base.powerdataframe import SummarizablePowerDataFrame
 from omni_models.datasets.omni_dataset import OmniDataset
 from omni_utils.helpers.weeks import Weeks
-from omni_utils.helpers.slug import slugify
 from omni_models.omnimodels import OmniModels
+from omni_shared.settings import timesheet_settings
 
 import calendar
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 from .models.memory_cache import TimesheetMemoryCache
 from .models.disk_cache import TimesheetDiskCache
+from .models.sync import TimesheetSyncEngine
+from .models.enrichment import TimesheetEnrichment
+from .models.schema import TIMESHEET_SCHEMA
+from .models.facts import TimesheetFacts
+from .models.query import TimesheetQueryEngine
+
+DISK_MONTH_NAMES = ['jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez']
 
 class TimesheetDataset(OmniDataset):
     def __init__(self, models: OmniModels = None):
         self.models = models or OmniModels()
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.memory = TimesheetMemoryCache()
+        self.enrichment = TimesheetEnrichment(self.models)
+        self.sync = TimesheetSyncEngine(
+            self._fetch,
+            lookback_days=timesheet_settings["sync_lookback_days"],
+            full_sync_interval=timedelta(minutes=timesheet_settings["full_sync_interval_minutes"]),
+            schema=TIMESHEET_SCHEMA
+        )
+        # Evicted ranges also drop their sync state, which holds the same frames
+        self.memory = TimesheetMemoryCache(
+            max_bytes=timesheet_settings["memory_cache_max_mb"] * 1024 * 1024,
+            on_evict=self.sync.forget
+        )
+        self.open_month_refresh = timedelta(seconds=timesheet_settings["open_month_refresh_seconds"])
+        # Bumped whenever the rows of a month are refetched or invalidated
+        self.version = 0
+        self.month_versions: Dict[Tuple[int, int], int] = {}
         
         api_key = os.getenv('EVERHOUR_API_KEY')
         if not api_key:
@@ -29,6 +52,8 @@ class TimesheetDataset(OmniDataset):
             
         cache_dir = Path("ts_2024")
         self.disk = TimesheetDiskCache(cache_dir, api_key)
+        self.facts = TimesheetFacts(self.disk, self._get, lookback_days=timesheet_settings["sync_lookback_days"])
+        self.engine = TimesheetQueryEngine(self._get_month, self.get_version, max_months=timesheet_settings["query_max_months"])
         
         self._ensure_2024()
 
@@ -38,38 +63,140 @@ class TimesheetDataset(OmniDataset):
     def get_filterable_fields(self):
         return ['Kind', 'AccountManagerName', 'ClientName', 'CaseTitle', 'Sponsor', 'WorkerName', 'ProductsOrServices']
 
-    @cache
     def get(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
         first_day_of_month = after.replace(day=1)
-        df = pd.DataFrame()
+        months = []
         
         while first_day_of_month < before:
             last_day_of_month = first_day_of_month.replace(day=calendar.monthrange(first_day_of_month.year, first_day_of_month.month)[1])
-            result = self._get(first_day_of_month, last_day_of_month)
-            df = pd.concat([df, result.data])
+            months.append((first_day_of_month, last_day_of_month))
             
             first_day_of_month = last_day_of_month + timedelta(days=1)
         
+        # Months are loaded concurrently; Everhour calls go through the client's rate limiter
+        if len(months) > 1:
+            workers = min(len(months), timesheet_settings["fetch_concurrency"])
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='timesheet') as pool:
+                results = list(pool.map(lambda month: self._get_month(*month), months))
+        else:
+            results = [self._get_month(*month) for month in months]
+        
+        df = TIMESHEET_SCHEMA.concat([result.data for result in results])
         if len(df) > 0:
             df = df[df['Date'] >= after.date()]
             df = df[df['Date'] <= before.date()]
         
-        return SummarizablePowerDataFrame(df)
+        return SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
         
+    def _get_month(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
+        # Concurrent requests for the same month share one load
+        key = f"{after:%Y-%m-%d}:{before:%Y-%m-%d}"
+        return group.do(key, lambda: self._get(after, before), name=f"{self.__class__.__name__}._get")
+
     def _get(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
         result = self.memory.get(after, before)
         if result:
             self.logger.info(f"Getting appointments from cache from {after} to {before}.")
             return result
-        
+
+        result = self._load_from_disk(after, before)
+        if result:
+            self.logger.info(f"Getting appointments from disk cache from {after} to {before}.")
+            return result
+
+        result = self.sync.sync(after, before)
+        self._bump_version(after, before)
+        if len(result.data) > 0:
+            self.memory.add(after, before, result, self._refresh_after(before))
+
+        return result
+
+    def _refresh_after(self, before: datetime) -> Optional[timedelta]:
+        """How long a range may be served from memory; ranges reaching the current month still change"""
+        if before.date() >= date.today().replace(day=1):
+            return self.open_month_refresh
+        return None
+
+    @staticmethod
+    def _months(after: datetime, before: datetime):
+        year, month = after.year, after.month
+        while (year, month) <= (before.year, before.month):
+            yield year, month
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    def _bump_version(self, after: datetime, before: datetime):
+        if after is None or before is None:
+            self.version += 1
+            return
+        for month in self._months(after, before):
+            self.month_versions[month] = self.month_versions.get(month, 0) + 1
+
+    def get_version(self, after: datetime, before: datetime) -> Tuple[int, ...]:
+        """
+        Identifies the data behind a range, so results computed from it can be
+        reused. Ranges reaching the current month also change version every
+        refresh interval, as their rows are only synced again when read.
+        """
+        version = (self.version, *(self.month_versions.get(month, 0) for month in self._months(after, before)))
+        refresh_after = self._refresh_after(before)
+        if refresh_after:
+            version += (int(datetime.now().timestamp() // refresh_after.total_seconds()),)
+        return version
+
+    def get_data_version(self) -> int:
+        """Grows whenever any range is refetched or invalidated"""
+        return self.version + sum(self.month_versions.values())
+
+    def get_facts(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
+        """Daily per-project and per-worker totals when the range lies in a closed month, else None"""
+        return self.facts.get(after, before)
+
+    def clear_facts(self):
+        """Drops the persisted facts, built with the names and rates of the models of the time"""
+        self.facts.clear()
+
+    def query(
+        self,
+        sql: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Runs an SQL query over the appointments, read from the `timesheet` view.
+
+        The view holds the days from `after` to `before`, loading their months
+        as `get` would, or every month already in memory when no range is given.
+        Filters on Date, Kind and CaseId skip the partitions they rule out.
+
+            dataset.query(
+                "SELECT CaseId, SUM(TimeInHs) AS hours FROM timesheet WHERE Kind = ? GROUP BY CaseId",
+                ["Consulting"], after=s, before=e
+            )
+        """
+        months = None
+        if after is None or before is None:
+            months = {
+                month
+                for entry in self.memory.list_cache(None, None)
+                for month in self._months(entry["after"], entry["before"])
+            }
+        return self.engine.query(sql, params, after, before, months)
+
+    def invalidate(self, after: datetime, before: datetime):
+        after = TimesheetMemoryCache._to_date(after)
+        before = TimesheetMemoryCache._to_date(before)
+        self.memory.invalidate(after, before)
+        # Otherwise the next sync would only refetch the lookback window and keep older edits stale
+        self.sync.invalidate(after, before)
+        self.facts.invalidate(after, before)
+        self._bump_version(after, before)
+
+    def _fetch(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
         start_time = datetime.now()
         self.logger.info(f"Getting appointments from {after} to {before}")
-        raw = self.models.tracker.get_appointments(after, before)
+        df = self.models.tracker.get_appointments_frame(after, before)
         elapsed_time = datetime.now() - start_time
         self.logger.info(f"Time to get appointments: {elapsed_time.total_seconds():.2f} seconds")
-        
-        data = [ap.to_dict() for ap in raw]
-        df = pd.DataFrame(data)
     
         start_time = datetime.now()
         self.logger.info(f"Enriching timesheet data")
@@ -78,165 +205,12 @@ class TimesheetDataset(OmniDataset):
         if df.empty:
             return SummarizablePowerDataFrame(pd.DataFrame())
 
-        # Create caches
-        workers_cache = {}
-        cases_cache = {}
-        clients_cache = {}
-        offers_cache = {}
-        eh_projects_cache = self.models.tracker.all_projects
-
-        # Pre-fetch all needed data
-        unique_user_ids = df['user_id'].unique()
-        unique_project_ids = df['project_id'].unique()
-        
-        # Bulk load workers
-        for user_id in unique_user_ids:
-            workers_cache[user_id] = self.models.workers.get_by_everhour_id(user_id)
-        
-        # Bulk load cases
-        for project_id in unique_project_ids:
-            cases_cache[project_id] = self.models.cases.get_by_everhour_project_id(project_id)
-        
-        # Bulk load clients and offers
-        unique_client_ids = set()
-        unique_offer_ids = set()
-        for case in cases_cache.values():
-            if case:
-                if case.client_id:
-                    unique_client_ids.add(case.client_id)
-                if hasattr(case, 'offers_ids'):
-                    unique_offer_ids.update(case.offers_ids)
-        
-        for client_id in unique_client_ids:
-            clients_cache[client_id] = self.models.clients.get_by_id(client_id)
-        
-        for offer_id in unique_offer_ids:
-            offer = self.models.products_or_services.get_by_id(offer_id)
-            offers_cache[offer_id] = offer.name if offer else None
-
-        # Optimize by pre-allocating arrays for better memory usage
-        n_rows = len(df)
-        
-        # Create typed arrays for better performance
-        client_data = {
-            'client_id': np.full(n_rows, "N/A", dtype=object),
-            'client_name': np.full(n_rows, "N/A", dtype=object),
-            'client_slug': np.full(n_rows, "N/A", dtype=object),
-            'client_omni_url': np.full(n_rows, "N/A", dtype=object),
-            'client': np.full(n_rows, "N/A", dtype=object),
-            'account_manager_name': np.full(n_rows, "N/A", dtype=object),
-            'account_manager_slug': np.full(n_rows, "N/A", dtype=object)
-        }
-
-        # Optimize date operations using pandas
-        date_series = pd.to_datetime(df['date'])
-        df = df.assign(
-            date=date_series.dt.date,
-            day_of_week=date_series.dt.strftime('%A'),
-            n_day_of_week=date_series.dt.weekday.apply(lambda x: (x + 1) % 7),
-            month=date_series.dt.strftime('%B'),
-            year=date_series.dt.strftime('%Y'),
-            year_month=date_series.dt.strftime('%Y-%m')
-        )
-
-        # Create numpy arrays for project and user IDs for faster lookups
-        project_ids = df['project_id'].values
-        user_ids = df['user_id'].values
-
-        # Vectorized billing information using numpy masks
-        billing_type = np.full(n_rows, None, dtype=object)
-        billing_fee = np.full(n_rows, None, dtype=object)
-        
-        for pid in np.unique(project_ids):
-            mask = project_ids == pid
-            project = eh_projects_cache.get(pid)
-            if project and project.billing:
-                billing_type[mask] = project.billing.type
-                billing_fee[mask] = project.billing.fee
-        
-        df['billing_type'] = billing_type
-        df['billing_fee'] = billing_fee
-
-        # Vectorized worker information
-        worker_data = {field: np.full(n_rows, None, dtype=object) for field in ['worker_name', 'worker_slug', 'worker_omni_url']}
-        
-        for uid in np.unique(user_ids):
-            mask = user_ids == uid
-            worker = workers_cache.get(uid)
-            if worker:
-                worker_data['worker_name'][mask] = worker.name
-                worker_data['worker_slug'][mask] = worker.slug
-                worker_data['worker_omni_url'][mask] = worker.omni_url
-        
-        df = df.assign(**worker_data)
-        
-        # Create worker links using pandas operations instead of numpy char operations
-        valid_worker_mask = df['worker_name'].notna() & df['worker_omni_url'].notna()
-        df['worker'] = None
-        df.loc[valid_worker_mask, 'worker'] = (
-            '<a href="' + 
-            df.loc[valid_worker_mask, 'worker_omni_url'] + 
-            '">' + 
-            df.loc[valid_worker_mask, 'worker_name'] + 
-            '</a>'
-        )
-
-        # Vectorized case information using numpy operations
-        case_data = {
-            'case_id': np.full(n_rows, "N/A", dtype=object),
-            'case_title': np.full(n_rows, "N/A", dtype=object),
-            'case_slug': np.full(n_rows, "N/A", dtype=object),
-            'sponsor': np.full(n_rows, "N/A", dtype=object),
-            'case_omni_url': np.full(n_rows, "N/A", dtype=object)
-        }
-        
-        for pid in np.unique(project_ids):
-            mask = project_ids == pid
-            case = cases_cache.get(pid)
-            if case:
-                case_data['case_id'][mask] = case.id
-                case_data['case_title'][mask] = case.title
-                case_data['case_slug'][mask] = case.slug
-                case_data['sponsor'][mask] = case.sponsor or "N/A"
-                case_data['case_omni_url'][mask] = case.omni_url
-                
-                # Update client data in the same loop to avoid multiple iterations
-                if case.client_id:
-                    client = clients_cache.get(case.client_id)
-                    if client:
-                        client_data['client_id'][mask] = client.id
-                        client_data['client_name'][mask] = client.name
-                        client_data['client_slug'][mask] = client.slug
-                        client_data['client_omni_url'][mask] = client.omni_url
-                        client_data['client'][mask] = f"<a href='{client.omni_url}'>{client.name}</a>"
-                        if client.account_manager:
-                            client_data['account_manager_name'][mask] = client.account_manager.name
-                            client_data['account_manager_slug'][mask] = client.account_manager.slug
-        
-        df = df.assign(**case_data)
-        df = df.assign(**client_data)
-        
-        # Optimize sponsor_slug creation using numpy
-        df['sponsor_slug'] = np.vectorize(slugify)(df['sponsor'].values)
-
-        # Optimize products_or_services using numpy operations
-        products = np.full(n_rows, "N/A", dtype=object)
-        for pid in np.unique(project_ids):
-            mask = project_ids == pid
-            case = cases_cache.get(pid)
-            if case and hasattr(case, 'offers_ids'):
-                products[mask] = ';'.join(filter(None, [offers_cache.get(oid) for oid in case.offers_ids]))
-        
-        df['products_or_services'] = products
+        df = self.enrichment.enrich(df)
 
         elapsed_time = datetime.now() - start_time
         self.logger.info(f"Time to enrich timesheet data: {elapsed_time.total_seconds():.2f} seconds")
         
-        result = SummarizablePowerDataFrame(df)
-        
-        self.memory.add(after, before, result)
-
-        return result
+        return SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
     
     def get_common_fields(self):
         return ['Kind', 'ClientName', 'Sponsor', 'WorkerName', 'TimeInHs', 'Date', 'Week', 'IsLte']
@@ -296,25 +270,43 @@ class TimesheetDataset(OmniDataset):
 
         return data 
     
+    def _get_disk_filename(self, after: datetime) -> str:
+        if after.year != 2024:
+            return None
+        return f"{DISK_MONTH_NAMES[after.month - 1]}_{after.year}"
+
+    def _load_from_disk(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
+        """Loads a closed month partition on first use instead of at boot."""
+        if after.year != before.year or after.month != before.month:
+            return None
+
+        filename = self._get_disk_filename(after)
+        if filename is None or not self.disk.exists(filename):
+            return None
+
+        cached_data = self.disk.load(filename)
+        if cached_data is None or cached_data.data.empty:
+            return None
+
+        # Partitions written before the schema still carry object columns
+        cached_data = SummarizablePowerDataFrame(cached_data.data, schema=TIMESHEET_SCHEMA)
+
+        s = datetime(after.year, after.month, 1, 0, 0, 0)
+        e = datetime(after.year, after.month, calendar.monthrange(after.year, after.month)[1], 23, 59, 59)
+        self.memory.add(s, e, cached_data)
+        return self.memory.get(after, before)
+
     def _ensure_2024(self):
         """Ensures all 2024 timesheet data is cached to disk."""
-        months = {
-            'jan': '01', 'fev': '02', 'mar': '03', 'abr': '04',
-            'mai': '05', 'jun': '06', 'jul': '07', 'ago': '08',
-            'set': '09', 'out': '10', 'nov': '11', 'dez': '12'
-        }
-        
         self.logger.info("Ensuring 2024 timesheet data is cached...")
         
-        for month_name, month_num in months.items():
+        for month_num, month_name in enumerate(DISK_MONTH_NAMES, start=1):
             filename = f"{month_name}_2024"
-            s = datetime(2024, int(month_num), 1, 0, 0, 0)
-            e = datetime(2024, int(month_num), calendar.monthrange(2024, int(month_num))[1], 23, 59, 59)
+            s = datetime(2024, month_num, 1, 0, 0, 0)
+            e = datetime(2024, month_num, calendar.monthrange(2024, month_num)[1], 23, 59, 59)
             
-            # Check if month data is already cached
-            cached_data = self.disk.load(filename)
-            if cached_data is not None:
-                self.memory.add(s, e, cached_data)
+            # Cached months are only decrypted when a query first touches them
+            if self.disk.exists(filename):
                 self.logger.info(f"Month {month_name}_2024 already cached")
                 continue
                 
@@ -327,4 +319,4 @@ class TimesheetDataset(OmniDataset):
                 self.disk.save(dataset, filename)
                 self.memory.add(s, e, dataset)
             else:
-                self.logger.warning(f"No data available for {month_name}_2024")
\ No newline at end of file
+                self.logger.warning(f"No data available for {month_name}_2024")
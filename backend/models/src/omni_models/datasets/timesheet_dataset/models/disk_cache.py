@@ -1,11 +1,42 @@
-import pickle
 import base64
+import json
+import math
+import os
+import shutil
+import uuid
 from pathlib import Path
-from cryptography.fernet import Fernet
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+
+
 class TimesheetDiskCache:
+    """Columnar, per-month store for timesheet partitions.
+
+    Every partition is a directory with an encrypted manifest and one encrypted
+    chunk per column, so loading a subset of columns only decrypts those chunks.
+    Chunks are Arrow IPC streams (JSON for mixed-type object columns) sealed
+    with Fernet, which authenticates each chunk on its own.
+
+    Each save writes its chunks to a new generation directory inside the
+    partition and then points the manifest at it, replacing the manifest file
+    in one `os.replace`. Readers see the previous generation or the new one;
+    one still reading chunks of a generation removed meanwhile reads the
+    manifest again.
+    """
+
+    FORMAT_VERSION = 1
+    MANIFEST = "manifest"
+    # Suffix of the manifest being written
+    STAGING = ".tmp"
+
     def __init__(self, cache_dir: str, api_key: str):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -22,34 +53,154 @@ class TimesheetDiskCache:
         key = base64.urlsafe_b64encode(kdf.derive(api_key.encode()))
         return Fernet(key)
 
+    def _partition_dir(self, filename: str) -> Path:
+        return self.cache_dir / filename
+
+    def exists(self, filename: str) -> bool:
+        """Check whether a partition was saved, without decrypting it"""
+        return (self._partition_dir(filename) / self.MANIFEST).is_file()
+
+    def names(self, prefix: str = '') -> List[str]:
+        """Names of the saved partitions starting with `prefix`"""
+        return sorted(
+            path.name
+            for path in self.cache_dir.glob(f"{prefix}*")
+            if (path / self.MANIFEST).is_file()
+        )
+
+    def delete(self, filename: str) -> None:
+        partition = self._partition_dir(filename)
+        if partition.exists():
+            shutil.rmtree(partition)
+
+    def columns(self, filename: str) -> Optional[List[str]]:
+        manifest = self._read_manifest(filename)
+        if manifest is None:
+            return None
+        return [column['name'] for column in manifest['columns']]
+
     def save(self, dataset, filename: str) -> None:
-        """Save an encrypted timesheet dataset to file"""
+        """Save a timesheet dataset as an encrypted columnar partition"""
         if dataset is None:
             return
 
-        filepath = self.cache_dir / f"{filename}.timesheet"
-        
-        # Serialize and encrypt the dataset
-        serialized = pickle.dumps(dataset)
-        encrypted = self.fernet.encrypt(serialized)
-        
-        # Save to file
-        with open(filepath, "wb") as file:
-            file.write(encrypted)
-
-    def load(self, filename: str):
-        """Load an encrypted timesheet dataset from file"""
+        df = dataset.data if hasattr(dataset, 'data') else dataset
+
+        partition = self._partition_dir(filename)
+        generation = uuid.uuid4().hex[:12]
+        generation_dir = partition / generation
+        generation_dir.mkdir(parents=True)
+
+        manifest = {
+            'version': self.FORMAT_VERSION,
+            'rows': len(df),
+            'generation': generation,
+            'columns': []
+        }
+
+        for position, column in enumerate(df.columns):
+            try:
+                encoding, payload = self._encode_column(df[column])
+            except TypeError:
+                shutil.rmtree(generation_dir)
+                if not any(partition.iterdir()):
+                    partition.rmdir()
+                raise
+            chunk = f"{position:03d}.chunk"
+            (generation_dir / chunk).write_bytes(self.fernet.encrypt(payload))
+            manifest['columns'].append({
+                'name': column,
+                'chunk': chunk,
+                'encoding': encoding
+            })
+
+        staging = partition / f"{self.MANIFEST}{self.STAGING}"
+        staging.write_bytes(self.fernet.encrypt(json.dumps(manifest).encode()))
+        os.replace(staging, partition / self.MANIFEST)
+
+        # Earlier generations, and chunks saved before partitions had them
+        for path in partition.iterdir():
+            if path.name in (generation, self.MANIFEST):
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+
+    def load(self, filename: str, columns: Optional[List[str]] = None) -> Optional[SummarizablePowerDataFrame]:
+        """Load a timesheet partition, decrypting only the requested columns"""
+        manifest = self._read_manifest(filename)
+        if manifest is None:
+            return None
+
+        data = self._read_chunks(filename, manifest, columns)
+        if data is None:
+            # A save may have replaced the generation while it was being read
+            latest = self._read_manifest(filename)
+            if latest is None or latest.get('generation') == manifest.get('generation'):
+                return None
+            manifest = latest
+            data = self._read_chunks(filename, manifest, columns)
+            if data is None:
+                return None
+
+        df = pd.DataFrame(data, index=pd.RangeIndex(manifest['rows']))
+        return SummarizablePowerDataFrame(df)
+
+    def _read_chunks(self, filename: str, manifest: dict, columns: Optional[List[str]]) -> Optional[dict]:
+        entries = manifest['columns']
+        if columns is not None:
+            entries = [entry for entry in entries if entry['name'] in columns]
+
+        # Partitions saved before generations keep their chunks beside the manifest
+        directory = self._partition_dir(filename) / manifest.get('generation', '')
+        data = {}
+        try:
+            for entry in entries:
+                payload = self.fernet.decrypt((directory / entry['chunk']).read_bytes())
+                data[entry['name']] = self._decode_column(entry['encoding'], payload)
+        except (OSError, InvalidToken, ValueError, pa.ArrowException):
+            return None
+        return data
+
+    def _read_manifest(self, filename: str) -> Optional[dict]:
         try:
-            filepath = self.cache_dir / f"{filename}.timesheet"
-            
-            # Read encrypted data
-            with open(filepath, "rb") as file:
-                encrypted = file.read()
-                
-            # Decrypt and deserialize
-            decrypted = self.fernet.decrypt(encrypted)
-            return pickle.loads(decrypted)
-        except:
+            encrypted = (self._partition_dir(filename) / self.MANIFEST).read_bytes()
+            manifest = json.loads(self.fernet.decrypt(encrypted))
+        except (OSError, InvalidToken, ValueError):
+            return None
+
+        if manifest.get('version') != self.FORMAT_VERSION:
             return None
-    
-    
\ No newline at end of file
+
+        return manifest
+
+    @staticmethod
+    def _encode_column(series: pd.Series):
+        try:
+            table = pa.table({'values': pa.array(series, from_pandas=True)})
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Object columns mixing ids and "N/A" markers have no Arrow type
+            values = [
+                None if isinstance(value, float) and math.isnan(value)
+                else value.item() if isinstance(value, np.generic)
+                else value
+                for value in series.tolist()
+            ]
+            try:
+                return 'json', json.dumps(values).encode()
+            except (TypeError, ValueError) as error:
+                raise TypeError(f"Column {series.name} holds values with no Arrow or JSON type: {error}") from error
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return 'arrow', sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def _decode_column(encoding: str, payload: bytes):
+        if encoding == 'json':
+            return pd.Series(json.loads(payload), dtype=object)
+
+        table = pa.ipc.open_stream(payload).read_all()
+        return table.column('values').to_pandas()
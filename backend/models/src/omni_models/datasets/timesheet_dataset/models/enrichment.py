@@ -0,0 +1,122 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from omni_utils.helpers.slug import slugify
+
+DATE_COLUMNS = ['day_of_week', 'n_day_of_week', 'month', 'year', 'year_month']
+WORKER_COLUMNS = ['worker_name', 'worker_slug', 'worker_omni_url']
+BILLING_COLUMNS = ['billing_type', 'billing_fee']
+CASE_COLUMNS = [
+    'case_id', 'case_title', 'case_slug', 'sponsor', 'case_omni_url',
+    'client_id', 'client_name', 'client_slug', 'client_omni_url',
+    'account_manager_name', 'account_manager_slug',
+    'sponsor_slug', 'products_or_services'
+]
+ENRICHED_COLUMNS = DATE_COLUMNS + BILLING_COLUMNS + WORKER_COLUMNS + CASE_COLUMNS
+
+
+class TimesheetEnrichment:
+    """Joins raw Everhour appointments with workers, cases, clients and offers.
+
+    Every dimension is a small frame with one row per distinct user or project,
+    so domain lookups happen once per key and the appointments are enriched
+    with a single merge per key instead of a mask per key.
+    """
+
+    def __init__(self, models):
+        self.models = models
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._with_dates(df)
+        df = df.merge(self._workers_dimension(df['user_id'].unique()), on='user_id', how='left')
+        df = df.merge(self._projects_dimension(df['project_id'].unique()), on='project_id', how='left')
+
+        base_columns = [column for column in df.columns if column not in ENRICHED_COLUMNS]
+        return df[base_columns + ENRICHED_COLUMNS]
+
+    @staticmethod
+    def _with_dates(df: pd.DataFrame) -> pd.DataFrame:
+        # Derive calendar attributes once per distinct day and broadcast them back
+        codes, days = pd.factorize(pd.to_datetime(df['date']))
+        days = pd.DatetimeIndex(days)
+
+        return df.assign(
+            date=np.asarray(days.date, dtype=object)[codes],
+            day_of_week=np.asarray(days.strftime('%A'), dtype=object)[codes],
+            n_day_of_week=((days.weekday.to_numpy() + 1) % 7).astype(np.int64)[codes],
+            month=np.asarray(days.strftime('%B'), dtype=object)[codes],
+            year=np.asarray(days.strftime('%Y'), dtype=object)[codes],
+            year_month=np.asarray(days.strftime('%Y-%m'), dtype=object)[codes]
+        )
+
+    @staticmethod
+    def _dimension(key: str, keys: np.ndarray, rows: List[Dict]) -> pd.DataFrame:
+        dimension = pd.DataFrame(rows, dtype=object)
+        dimension.insert(0, key, keys)
+        return dimension
+
+    def _workers_dimension(self, user_ids: np.ndarray) -> pd.DataFrame:
+        rows = []
+        for user_id in user_ids:
+            worker = self.models.workers.get_by_everhour_id(user_id)
+            if worker:
+                rows.append({
+                    'worker_name': worker.name,
+                    'worker_slug': worker.slug,
+                    'worker_omni_url': worker.omni_url
+                })
+            else:
+                rows.append({column: None for column in WORKER_COLUMNS})
+
+        return self._dimension('user_id', user_ids, rows)
+
+    def _projects_dimension(self, project_ids: np.ndarray) -> pd.DataFrame:
+        eh_projects = self.models.tracker.all_projects
+        clients = {}
+        offers = {}
+
+        rows = []
+        for project_id in project_ids:
+            row = {column: None for column in BILLING_COLUMNS}
+            row.update({column: "N/A" for column in CASE_COLUMNS})
+
+            project = eh_projects.get(project_id)
+            if project and project.billing:
+                row['billing_type'] = project.billing.type
+                row['billing_fee'] = project.billing.fee
+
+            case = self.models.cases.get_by_everhour_project_id(project_id)
+            if case:
+                row['case_id'] = case.id
+                row['case_title'] = case.title
+                row['case_slug'] = case.slug
+                row['sponsor'] = case.sponsor or "N/A"
+                row['case_omni_url'] = case.omni_url
+
+                if case.client_id:
+                    if case.client_id not in clients:
+                        clients[case.client_id] = self.models.clients.get_by_id(case.client_id)
+                    client = clients[case.client_id]
+                    if client:
+                        row['client_id'] = client.id
+                        row['client_name'] = client.name
+                        row['client_slug'] = client.slug
+                        row['client_omni_url'] = client.omni_url
+                        if client.account_manager:
+                            row['account_manager_name'] = client.account_manager.name
+                            row['account_manager_slug'] = client.account_manager.slug
+
+                names = []
+                for offer_id in case.offers_ids or []:
+                    if offer_id not in offers:
+                        offer = self.models.products_or_services.get_by_id(offer_id)
+                        offers[offer_id] = offer.name if offer else None
+                    names.append(offers[offer_id])
+                row['products_or_services'] = ';'.join(filter(None, names))
+
+            row['sponsor_slug'] = slugify(row['sponsor'])
+            rows.append(row)
+
+        return self._dimension('project_id', project_ids, rows)
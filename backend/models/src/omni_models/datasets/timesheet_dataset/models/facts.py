@@ -0,0 +1,118 @@
+import calendar
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from .disk_cache import TimesheetDiskCache
+from .schema import TIMESHEET_SCHEMA
+
+FACT_KEYS = ['Date', 'ProjectId', 'WorkerName']
+FACT_DIMENSIONS = [
+    'Kind', 'WorkerSlug',
+    'CaseId', 'CaseTitle', 'CaseSlug', 'Sponsor',
+    'ClientName', 'ClientSlug',
+    'AccountManagerName', 'AccountManagerSlug',
+    'ProductsOrServices'
+]
+FACT_MEASURES = ['TimeInHs', 'Revenue']
+FACT_COLUMNS = FACT_KEYS + FACT_DIMENSIONS + FACT_MEASURES
+
+FACTS_PREFIX = 'facts_'
+
+
+class TimesheetFacts:
+    """Per-day, per-project and per-worker hours and revenue of closed months.
+
+    A month is closed once its last day is older than the sync lookback, so
+    late appointments can no longer land in it. Its fact table is built once
+    from the appointments, persisted next to the timesheet partitions and
+    afterwards read instead of them: it has one row per worker and project
+    per day instead of one per appointment, and keeps every column revenue
+    tracking groups or filters by. Rows keep the order in which each key
+    first appears in the appointments. Those columns come from the models, so
+    the facts are cleared whenever the models are rebuilt.
+    """
+
+    def __init__(self, disk: TimesheetDiskCache, load: Callable[[datetime, datetime], SummarizablePowerDataFrame], lookback_days: int):
+        self.disk = disk
+        self.load = load
+        self.lookback_days = lookback_days
+        self.months: Dict[Tuple[int, int], pd.DataFrame] = {}
+        self.lock = threading.RLock()
+
+    def is_closed(self, year: int, month: int, today: Optional[date] = None) -> bool:
+        today = today or date.today()
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        return last_day + timedelta(days=self.lookback_days) < today
+
+    def get(self, after: datetime, before: datetime) -> Optional[SummarizablePowerDataFrame]:
+        """Facts for a range within one closed month, or None when it cannot be served from them"""
+        if (after.year, after.month) != (before.year, before.month) or not self.is_closed(after.year, after.month):
+            return None
+
+        df = self._get_month(after.year, after.month)
+        if len(df) > 0:
+            df = df[(df['Date'] >= after.date()) & (df['Date'] <= before.date())]
+        return SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
+
+    def _get_month(self, year: int, month: int) -> pd.DataFrame:
+        with self.lock:
+            df = self.months.get((year, month))
+            if df is not None:
+                return df
+
+            filename = self._filename(year, month)
+            stored = self.disk.load(filename) if self.disk.exists(filename) else None
+            if stored is not None:
+                df = TIMESHEET_SCHEMA.apply(stored.data)
+            else:
+                s = datetime(year, month, 1, 0, 0, 0)
+                e = datetime(year, month, calendar.monthrange(year, month)[1], 23, 59, 59)
+                df = self.build(self.load(s, e).data)
+                self.disk.save(df, filename)
+
+            self.months[(year, month)] = df
+            return df
+
+    @staticmethod
+    def build(df: pd.DataFrame) -> pd.DataFrame:
+        if len(df) == 0:
+            return pd.DataFrame(columns=FACT_COLUMNS)
+
+        df = df.assign(**{column: 0.0 for column in FACT_MEASURES if column not in df.columns})
+        facts = (
+            df
+            .groupby(FACT_KEYS + FACT_DIMENSIONS, observed=True, sort=False, dropna=False)[FACT_MEASURES]
+            .sum()
+            .reset_index()
+        )
+        return TIMESHEET_SCHEMA.apply(facts[FACT_COLUMNS])
+
+    def invalidate(self, after: Optional[date], before: Optional[date]):
+        """Drops the facts of every month overlapping the given days; None leaves a side open"""
+        with self.lock:
+            months = [
+                (year, month)
+                for year, month in set(self.months) | set(self._stored_months())
+                if (after is None or (year, month) >= (after.year, after.month))
+                and (before is None or (year, month) <= (before.year, before.month))
+            ]
+            for year, month in months:
+                self.months.pop((year, month), None)
+                self.disk.delete(self._filename(year, month))
+
+    def clear(self):
+        """Drops the facts of every month, which keep the names, kinds and revenue of the models they were built with"""
+        self.invalidate(None, None)
+
+    def _stored_months(self):
+        for filename in self.disk.names(FACTS_PREFIX):
+            year, month = filename[len(FACTS_PREFIX):].split('_')
+            yield int(year), int(month)
+
+    @staticmethod
+    def _filename(year: int, month: int) -> str:
+        return f"{FACTS_PREFIX}{year}_{month:02d}"
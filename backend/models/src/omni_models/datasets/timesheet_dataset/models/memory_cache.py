@@ -1,65 +1,180 @@
-from datetime import datetime
+import bisect
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
 from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from .schema import TIMESHEET_SCHEMA
+
+
+class TimesheetMemoryCacheEntry:
+    def __init__(self, after: datetime, before: datetime, result: SummarizablePowerDataFrame, refresh_after: Optional[timedelta] = None):
+        self.after = after
+        self.before = before
+        self.result = result
+        self.created_at = datetime.now()
+        self.expires_at = self.created_at + refresh_after if refresh_after is not None else None
+        self.last_accessed_at = self.created_at
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = int(result.data.memory_usage(deep=True).sum()) if len(result.data.columns) else 0
+
+    @property
+    def start(self) -> date:
+        return self.after.date()
+
+    @property
+    def end(self) -> date:
+        return self.before.date()
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
 
 class TimesheetMemoryCache:
-    def __init__(self):
-        self.cache = []
+    """In-memory timesheet partitions, indexed by the interval of days they cover.
+
+    Entries are kept sorted by their first day, so a request only looks at the
+    entries that can overlap it and is stitched from as many partitions as it
+    takes to cover it. Once the cached frames exceed `max_bytes`, the least
+    recently used entries are evicted and reported to `on_evict`. Entries added
+    with `refresh_after` stop serving reads once it has passed, so the range is
+    synced again and the new entry supersedes them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, on_evict: Callable[[datetime, datetime], None] = None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.entries: List[TimesheetMemoryCacheEntry] = []
+        self.starts: List[date] = []
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
 
     def get(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
-        for m in self.cache:
-            if m['after'] <= after and m['before'] >= before:
-                df = m['result'].data
-                df = df[df['Date'] >= after.date()]
-                df = df[df['Date'] <= before.date()]
-                return SummarizablePowerDataFrame(df)
-        return None
-    
-    def add(self, after: datetime, before: datetime, result: SummarizablePowerDataFrame):
-        self.cache.append({
-            "after": after,
-            "before": before,
-            "result": result, 
-            "created_at": datetime.now()
-        })
+        now = datetime.now()
+        with self.lock:
+            # Only entries starting on or before the last requested day can overlap
+            candidates = [
+                entry
+                for entry in self.entries[:bisect.bisect_right(self.starts, before.date())]
+                if entry.end >= after.date() and not entry.is_expired(now)
+            ]
+
+            cover = self._find_cover(candidates, after.date(), before.date())
+            if cover is None:
+                self.misses += 1
+                for entry in candidates:
+                    entry.misses += 1
+                return None
+
+            self.hits += 1
+            frames = []
+            for entry, first, last in cover:
+                entry.hits += 1
+                entry.last_accessed_at = now
+                df = entry.result.data
+                if len(df) > 0:
+                    df = df[(df['Date'] >= first) & (df['Date'] <= last)]
+                frames.append(df)
+
+        df = frames[0] if len(frames) == 1 else TIMESHEET_SCHEMA.concat(frames)
+        return SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
+
+    @staticmethod
+    def _find_cover(candidates: List[TimesheetMemoryCacheEntry], first: date, last: date):
+        """Greedily picks the entries that reach furthest until the range is covered"""
+        cover = []
+        cursor = first
+        while cursor <= last:
+            reaching = [entry for entry in candidates if entry.start <= cursor <= entry.end]
+            if not reaching:
+                return None
+
+            entry = max(reaching, key=lambda e: (e.end, e.created_at))
+            cover.append((entry, cursor, min(entry.end, last)))
+            cursor = entry.end + timedelta(days=1)
+
+        return cover
+
+    def add(self, after: datetime, before: datetime, result: SummarizablePowerDataFrame, refresh_after: Optional[timedelta] = None):
+        entry = TimesheetMemoryCacheEntry(after, before, result, refresh_after)
+
+        with self.lock:
+            # A newer entry supersedes every entry it fully covers
+            for existing in [e for e in self.entries if entry.start <= e.start and e.end <= entry.end]:
+                self._remove(existing)
+
+            position = bisect.bisect_right(self.starts, entry.start)
+            self.entries.insert(position, entry)
+            self.starts.insert(position, entry.start)
+            self.nbytes += entry.nbytes
+
+            evicted = self._evict(keep=entry)
+
+        if self.on_evict:
+            for e in evicted:
+                self.on_evict(e.after, e.before)
+
+    def _remove(self, entry: TimesheetMemoryCacheEntry):
+        position = self.entries.index(entry)
+        del self.entries[position]
+        del self.starts[position]
+        self.nbytes -= entry.nbytes
+
+    def _evict(self, keep: TimesheetMemoryCacheEntry) -> List[TimesheetMemoryCacheEntry]:
+        evicted = []
+        if self.max_bytes is None:
+            return evicted
+
+        by_last_access = sorted(
+            (e for e in self.entries if e is not keep),
+            key=lambda e: e.last_accessed_at
+        )
+        for entry in by_last_access:
+            if self.nbytes <= self.max_bytes:
+                break
+            self._remove(entry)
+            evicted.append(entry)
+
+        return evicted
+
+    @staticmethod
+    def _to_date(value):
+        if isinstance(value, str):
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        if isinstance(value, datetime):
+            return value.date()
+        return value
 
     def list_cache(self, after, before):
-        if after:
-            if isinstance(after, str):
-                after = datetime.strptime(after, '%Y-%m-%d').date()
-            elif isinstance(after, datetime):
-                after = after.date()
-                
-        if before:
-            if isinstance(before, str):
-                before = datetime.strptime(before, '%Y-%m-%d').date()
-            elif isinstance(before, datetime):
-                before = before.date()
-        
-        return [
-            {
-                "after": m['after'],
-                "before": m['before'],
-                "created_at": m['created_at']
-            }
-            for m in self.cache
-            if (after is None or after >= m['after']) and (before is None or before <= m['before'])
-        ]
-        
+        after = self._to_date(after)
+        before = self._to_date(before)
+
+        with self.lock:
+            return [
+                {
+                    "after": e.after,
+                    "before": e.before,
+                    "created_at": e.created_at,
+                    "last_accessed_at": e.last_accessed_at,
+                    "hits": e.hits,
+                    "misses": e.misses,
+                    "nbytes": e.nbytes
+                }
+                for e in self.entries
+                if (after is None or after >= e.start) and (before is None or before <= e.end)
+            ]
+
     def invalidate(self, after, before):
-        if after:
-            if isinstance(after, str):
-                after = datetime.strptime(after, '%Y-%m-%d').date()
-            elif isinstance(after, datetime):
-                after = after.date()
-                
-        if before:
-            if isinstance(before, str):
-                before = datetime.strptime(before, '%Y-%m-%d').date()
-            elif isinstance(before, datetime):
-                before = before.date()
-                
-        self.cache = [
-            m 
-            for m in self.cache 
-            if (after is None or after >= m['after']) and (before is None or before <= m['before'])
-        ] 
\ No newline at end of file
+        """Drops every entry overlapping the given days; None leaves a side open"""
+        after = self._to_date(after)
+        before = self._to_date(before)
+
+        with self.lock:
+            for entry in [
+                e for e in self.entries
+                if (after is None or e.end >= after) and (before is None or e.start <= before)
+            ]:
+                self._remove(entry)
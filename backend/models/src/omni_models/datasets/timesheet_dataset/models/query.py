@@ -0,0 +1,176 @@
+import calendar
+import threading
+from collections import Counter, OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+
+# Partitions are sorted on these, so the zone maps of their row groups prune on them
+SORT_COLUMNS = ['Date', 'Kind', 'CaseId']
+
+# Columns of the view when none of the queried months has appointments
+EMPTY_COLUMNS = {'Date': 'DATE', 'TimeInHs': 'DOUBLE', 'Kind': 'VARCHAR', 'CaseId': 'VARCHAR'}
+
+Month = Tuple[int, int]
+
+
+class TimesheetQueryEngine:
+    """Embedded DuckDB database over the month partitions of the timesheet.
+
+    Every month a query touches is copied once into a native table, sorted on
+    Date, Kind and CaseId, and copied again only after its version changes
+    (a refetch or an invalidation). Queries read a `timesheet` view that
+    unions the tables of the requested months; DuckDB pushes filters on the
+    view into each table scan and skips the months whose statistics rule a
+    filter out. The least recently queried months are dropped past
+    `max_months`.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[datetime, datetime], SummarizablePowerDataFrame],
+        version: Callable[[datetime, datetime], Hashable],
+        max_months: int = 24
+    ):
+        self.load = load
+        self.version = version
+        self.max_months = max_months
+        self.tables: 'OrderedDict[Month, Tuple[Hashable, str]]' = OrderedDict()
+        self.pins: Counter = Counter()
+        self.lock = threading.RLock()
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            # duckdb is only imported by processes that run analytical queries
+            import duckdb
+            connection = duckdb.connect()
+            columns = ", ".join(f'"{name}" {type}' for name, type in EMPTY_COLUMNS.items())
+            connection.execute(f'CREATE TABLE timesheet_empty ({columns})')
+            self._connection = connection
+        return self._connection
+
+    def query(
+        self,
+        sql: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        months: Optional[Iterable[Month]] = None
+    ) -> pd.DataFrame:
+        """Runs `sql` over the `timesheet` view of the days from `after` to `before`, or of `months` when no range is given"""
+        if after is not None and before is not None:
+            months = list(self._months(after, before))
+            first, last = after.date(), before.date()
+        else:
+            months = sorted(set(months or []))
+            first = last = None
+
+        tables = []
+        try:
+            for month in months:
+                tables.append((month, self._table(month)))
+            with self.lock:
+                cursor = self.connection.cursor()
+            try:
+                cursor.execute(f'CREATE TEMP VIEW timesheet AS {self._view(tables, first, last)}')
+                return cursor.execute(sql, params).df()
+            finally:
+                cursor.close()
+        finally:
+            with self.lock:
+                self.pins.subtract(name for _, name in tables if name is not None)
+                self.pins += Counter()
+                self._evict()
+
+    def _table(self, month: Month) -> Optional[str]:
+        """Name of the table holding `month`, loaded when missing or stale and pinned until released; empty months have none"""
+        first, last = self._bounds(month)
+        with self.lock:
+            entry = self.tables.get(month)
+            if entry is not None and entry[0] == self.version(first, last):
+                return self._pin(month)
+
+        # Loading can reach Everhour, so other months stay queryable meanwhile
+        df = self.load(first, last).data
+        version = self.version(first, last)
+        name = f'timesheet_{month[0]}_{month[1]:02d}'
+
+        with self.lock:
+            entry = self.tables.get(month)
+            if entry is None or entry[0] != version:
+                self._create(name, df)
+                self.tables[month] = (version, name if len(df.columns) else None)
+            return self._pin(month)
+
+    def _pin(self, month: Month) -> Optional[str]:
+        self.tables.move_to_end(month)
+        name = self.tables[month][1]
+        if name is not None:
+            self.pins[name] += 1
+        return name
+
+    def _create(self, name: str, df: pd.DataFrame):
+        if not len(df.columns):
+            if not self.pins[name]:
+                self.connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+            return
+
+        # Categories become plain strings, so months with different categories union
+        columns = ", ".join(
+            f'CAST("{column}" AS VARCHAR) AS "{column}"' if isinstance(df[column].dtype, pd.CategoricalDtype) else f'"{column}"'
+            for column in df.columns
+        )
+        order = ", ".join(f'"{column}"' for column in SORT_COLUMNS if column in df.columns)
+        self.connection.register('timesheet_partition', df.reset_index(drop=True))
+        try:
+            self.connection.execute(
+                f'CREATE OR REPLACE TABLE "{name}" AS SELECT {columns} FROM timesheet_partition'
+                + (f' ORDER BY {order}' if order else '')
+            )
+        finally:
+            self.connection.unregister('timesheet_partition')
+
+    def _evict(self):
+        for month in list(self.tables):
+            if len(self.tables) <= self.max_months:
+                return
+            name = self.tables[month][1]
+            if self.pins[name]:
+                continue
+            del self.tables[month]
+            if name is not None:
+                self.connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+
+    def _view(self, tables: List[Tuple[Month, Optional[str]]], first: Optional[date], last: Optional[date]) -> str:
+        selects = []
+        for month, name in tables:
+            if name is None:
+                continue
+            month_first, month_last = (day.date() for day in self._bounds(month))
+            conditions = []
+            if first is not None and first > month_first:
+                conditions.append(f"\"Date\" >= DATE '{first.isoformat()}'")
+            if last is not None and last < month_last:
+                conditions.append(f"\"Date\" <= DATE '{last.isoformat()}'")
+            selects.append(f'SELECT * FROM "{name}"' + (f' WHERE {" AND ".join(conditions)}' if conditions else ''))
+
+        if not selects:
+            return 'SELECT * FROM timesheet_empty'
+        return ' UNION ALL BY NAME '.join(selects)
+
+    @staticmethod
+    def _bounds(month: Month) -> Tuple[datetime, datetime]:
+        year, number = month
+        return datetime(year, number, 1), datetime(year, number, calendar.monthrange(year, number)[1])
+
+    @staticmethod
+    def _months(after: datetime, before: datetime) -> Iterable[Month]:
+        year, month = after.year, after.month
+        while (year, month) <= (before.year, before.month):
+            yield year, month
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
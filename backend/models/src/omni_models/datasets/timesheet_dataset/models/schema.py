@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from omni_models.base.powerdataframe import ColumnSchema
+
+
+def _worker_link(df: pd.DataFrame) -> pd.Series:
+    name = df['WorkerName'].to_numpy(dtype=object)
+    url = df['WorkerOmniUrl'].to_numpy(dtype=object)
+    valid = pd.notna(name) & pd.notna(url)
+
+    result = np.full(len(df), None, dtype=object)
+    result[valid] = '<a href="' + url[valid] + '">' + name[valid] + '</a>'
+    return pd.Series(result, index=df.index)
+
+
+def _client_link(df: pd.DataFrame) -> pd.Series:
+    name = df['ClientName'].to_numpy(dtype=object)
+    url = df['ClientOmniUrl'].to_numpy(dtype=object)
+    valid = pd.notna(url) & (url != "N/A")
+
+    result = np.full(len(df), "N/A", dtype=object)
+    result[valid] = "<a href='" + url[valid] + "'>" + name[valid] + "</a>"
+    return pd.Series(result, index=df.index)
+
+
+# TimeInHs stays float64: it is already rounded to one decimal, and float32
+# sums drift enough to change the rounded totals and revenue we report.
+TIMESHEET_SCHEMA = ColumnSchema(
+    categories=[
+        'ProjectId', 'Week', 'Kind', 'CreatedAtWeek', 'Correctness',
+        'DayOfWeek', 'Month', 'Year', 'YearMonth', 'BillingType',
+        'WorkerName', 'WorkerSlug', 'WorkerOmniUrl',
+        'CaseId', 'CaseTitle', 'CaseSlug', 'Sponsor', 'CaseOmniUrl',
+        'ClientName', 'ClientSlug', 'ClientOmniUrl',
+        'AccountManagerName', 'AccountManagerSlug',
+        'SponsorSlug', 'ProductsOrServices'
+    ],
+    dtypes={
+        'UserId': 'int32',
+        'Time': 'int32',
+        'NDayOfWeek': 'int8'
+    },
+    derived={
+        'Worker': _worker_link,
+        'Client': _client_link
+    }
+)
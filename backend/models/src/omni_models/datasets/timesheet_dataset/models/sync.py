@@ -0,0 +1,125 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from omni_models.base.powerdataframe import ColumnSchema, SummarizablePowerDataFrame
+
+
+class TimesheetSyncState:
+    def __init__(self, after: datetime, before: datetime, data: pd.DataFrame, synced_at: datetime):
+        self.after = after
+        self.before = before
+        self.data = data
+        self.last_full_sync = synced_at
+        self.last_sync = synced_at
+        self.high_water_mark = TimesheetSyncState.compute_high_water_mark(data)
+        # First day invalidated since the last sync, which the next delta has to reach back to
+        self.stale_from: Optional[date] = None
+
+    @staticmethod
+    def compute_high_water_mark(data: pd.DataFrame) -> Optional[datetime]:
+        if len(data) == 0:
+            return None
+
+        marks = [
+            pd.to_datetime(data[column]).max()
+            for column in ('CreatedAt', 'UpdatedAt')
+            if column in data.columns
+        ]
+        marks = [mark for mark in marks if pd.notna(mark)]
+        return max(marks).to_pydatetime() if marks else None
+
+
+class TimesheetSyncEngine:
+    """Keeps month partitions in sync with Everhour without refetching them whole.
+
+    Everhour only filters `team/time` by work date, so a delta is the window that
+    starts `lookback_days` before the newest `created_at` already seen. Rows in
+    that window are replaced (which also drops entries deleted there) and older
+    rows are kept. A full reconciliation runs every `full_sync_interval` to pick
+    up late edits and deletes outside the window. Invalidating days widens the
+    next window back to them instead of dropping the state.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[datetime, datetime], SummarizablePowerDataFrame],
+        lookback_days: int = 7,
+        full_sync_interval: timedelta = timedelta(hours=1),
+        schema: ColumnSchema = None
+    ):
+        self.fetch = fetch
+        self.schema = schema
+        self.lookback = timedelta(days=lookback_days)
+        self.full_sync_interval = full_sync_interval
+        self.states: Dict[Tuple, TimesheetSyncState] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @staticmethod
+    def _make_key(after: datetime, before: datetime) -> Tuple:
+        return after.date(), before.date()
+
+    def sync(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
+        key = self._make_key(after, before)
+        state = self.states.get(key)
+        now = datetime.now()
+
+        if (
+            state is None
+            or state.high_water_mark is None
+            or now - state.last_full_sync >= self.full_sync_interval
+        ):
+            return self.full_sync(after, before)
+
+        window_first = (state.high_water_mark - self.lookback).date()
+        if state.stale_from is not None:
+            window_first = min(window_first, state.stale_from)
+        window_start = datetime.combine(window_first, datetime.min.time())
+        if window_start <= after:
+            return self.full_sync(after, before)
+
+        if window_start > before:
+            # Everything in the range was created well before its last day; nothing can have changed
+            state.last_sync = now
+            return SummarizablePowerDataFrame(state.data, schema=self.schema)
+
+        self.logger.info(f"Syncing appointments incrementally from {window_start} to {before}")
+        delta = self.fetch(window_start, before).data
+
+        kept = state.data[state.data['Date'] < window_start.date()]
+        if len(delta) > 0:
+            if self.schema:
+                merged = self.schema.concat([kept, delta]).reset_index(drop=True)
+            else:
+                merged = pd.concat([kept, delta], ignore_index=True)
+            merged = merged.drop_duplicates(subset='Id', keep='last')
+        else:
+            merged = kept.reset_index(drop=True)
+
+        state.data = merged
+        state.last_sync = now
+        state.stale_from = None
+        state.high_water_mark = TimesheetSyncState.compute_high_water_mark(merged) or state.high_water_mark
+        self.logger.info(f"Merged {len(delta)} appointments into {len(kept)} kept rows")
+
+        return SummarizablePowerDataFrame(merged, schema=self.schema)
+
+    def full_sync(self, after: datetime, before: datetime) -> SummarizablePowerDataFrame:
+        self.logger.info(f"Running full timesheet reconciliation from {after} to {before}")
+        result = self.fetch(after, before)
+        self.states[self._make_key(after, before)] = TimesheetSyncState(
+            after, before, result.data, datetime.now()
+        )
+        return result
+
+    def forget(self, after: datetime, before: datetime) -> None:
+        self.states.pop(self._make_key(after, before), None)
+
+    def invalidate(self, after: Optional[date], before: Optional[date]) -> None:
+        """Makes the next sync of every range overlapping the given days refetch them; None leaves a side open"""
+        for (first, last), state in self.states.items():
+            if (after is None or last >= after) and (before is None or first <= before):
+                stale_from = first if after is None else max(first, after)
+                state.stale_from = stale_from if state.stale_from is None else min(state.stale_from, stale_from)
@@ -133,6 +133,7 @@ class CasesRepository:
         self.clients_repository = clients_repository
         self.deals_repository = deals_repository
         self.__data: Dict[int, Case] = None
+        self.__indexes: Dict[str, Dict] = None
 
     def get_all(self) -> Dict[str, Case]:
         if self.__data is None:
@@ -188,28 +189,55 @@ class CasesRepository:
         raise KeyError(f'No case with id {id}')
 
     def get_by_slug(self, slug: str) -> Case:
-        o_case = next((case for case in self.get_all().values() if case.slug == slug), None)
-        return o_case
+        return self.__get_index('slug').get(slug)
+
+    def get_many_by_slug(self, slugs: List[str]) -> Dict[str, Case]:
+        index = self.__get_index('slug')
+        return {slug: index.get(slug) for slug in slugs}
+
+    def get_many_by_id(self, ids: List[str]) -> Dict[str, Case]:
+        if self.__data is None:
+            self.__build_data()
+
+        result = {}
+        for id in ids:
+            found = self.__data.get(id)
+            if found is None and numbers.can_convert_to_int(id):
+                found = self.__data.get(int(id))
+            result[id] = found
+        return result
     
     def get_by_title(self, title: str) -> Case:
-        o_case = next((case for case in self.get_all().values() if case.title == title), None)
-        return o_case
+        return self.__get_index('title').get(title)
 
     def get_by_everhour_project_id(self, id) -> Case:
-        cases = self.get_all().values()
-        for case in cases:
-            if id in case.everhour_projects_ids:
-                return case
-        return None
+        return self.__get_index('everhour_project_id').get(id)
     
     def get_by_everhour_project_name(self, name: str) -> Case:
-        cases = self.get_all().values()
-        for case in cases:
+        return self.__get_index('everhour_project_name').get(name)
+
+    def __get_index(self, name: str) -> Dict:
+        if self.__data is None:
+            self.__build_data()
+        return self.__indexes[name]
+
+    @staticmethod
+    def __build_indexes(cases: Dict[str, Case]) -> Dict[str, Dict]:
+        indexes = {
+            name: {}
+            for name in ('slug', 'title', 'everhour_project_id', 'everhour_project_name')
+        }
+
+        # setdefault keeps the first match, as the former linear scans did
+        for case in cases.values():
+            indexes['slug'].setdefault(case.slug, case)
+            indexes['title'].setdefault(case.title, case)
+            for project_id in case.everhour_projects_ids:
+                indexes['everhour_project_id'].setdefault(project_id, case)
             for ti in case.tracker_info:
-                if ti.name == name:
-                    return case
-        
-        return None
+                indexes['everhour_project_name'].setdefault(ti.name, case)
+
+        return indexes
 
     # def get_by_slug(self, slug: str) -> Case:
     #     return next((worker for worker in self.ontology.workers.values() if worker.slug == slug), None)
@@ -324,5 +352,7 @@ class CasesRepository:
                             
                         if due_on:
                             tracker_project.due_on = due_on
-                    
+
+        # Indexes go in first so lookups never see data without them
+        self.__indexes = self.__build_indexes(cases_dict)
         self.__data = cases_dict
@@ -54,6 +54,7 @@ class ClientsRepository:
         self.tracker = tracker
         self.workers_repository = workers_repository
         self.__data: Dict[int, Client] = None
+        self.__indexes: Dict[str, Dict] = None
 
     def get_all(self) -> Dict[int, Client]:
         if not self.__data:
@@ -74,25 +75,47 @@ class ClientsRepository:
         raise KeyError(f'No case with id {id}')
 
     def get_by_slug(self, slug: str) -> Client:
-        o_client = next((client for client in self.get_all().values() if client.slug == slug), None)
-        return o_client
+        return self.__get_index('slug').get(slug)
+
+    def get_many_by_slug(self, slugs: List[str]) -> Dict[str, Client]:
+        index = self.__get_index('slug')
+        return {slug: index.get(slug) for slug in slugs}
+
+    def get_many_by_id(self, ids: List[str]) -> Dict[str, Client]:
+        if not self.__data:
+            self.__build_data()
+
+        result = {}
+        for id in ids:
+            found = self.__data.get(id)
+            if found is None and numbers.can_convert_to_int(id):
+                found = self.__data.get(int(id))
+            result[id] = found
+        return result
     
     def get_by_name(self, name: str) -> Client:
-        o_client = next((client for client in self.get_all().values() if client.name == name), None)
-        return o_client
+        return self.__get_index('name').get(name)
 
     def get_by_everhour_id(self, everhour_id: int) -> Client:
+        return self.__get_index('everhour').get(everhour_id)
 
-        o_client = next(
-            (
-                client
-                for client in self.get_all().values()
-                if everhour_id in client.tracker_ids
-            ),
-            None
-        )
+    def __get_index(self, name: str) -> Dict:
+        if not self.__data:
+            self.__build_data()
+        return self.__indexes[name]
+
+    @staticmethod
+    def __build_indexes(clients: Dict[int, Client]) -> Dict[str, Dict]:
+        indexes = {name: {} for name in ('slug', 'name', 'everhour')}
 
-        return o_client
+        # setdefault keeps the first match, as the former linear scans did
+        for client in clients.values():
+            indexes['slug'].setdefault(client.slug, client)
+            indexes['name'].setdefault(client.name, client)
+            for tracker_id in client.tracker_ids:
+                indexes['everhour'].setdefault(tracker_id, client)
+
+        return indexes
 
     def __build_data(self) -> Dict[int, Client]:
         clients_dict: Dict[str, Client] = {}
@@ -150,7 +173,11 @@ class ClientsRepository:
                 clients_dict[tracker_client.normalized_name].tracker_info.append(tracker_client)
                 neg_id = neg_id - 1
 
-        self.__data = {
+        data = {
             client.id: client
             for client in clients_dict.values()
         }
+
+        # Indexes go in first so lookups never see data without them
+        self.__indexes = self.__build_indexes(data)
+        self.__data = data
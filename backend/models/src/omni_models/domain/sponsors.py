@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from omni_models.semantic import CRM
 from omni_models.domain.cases import CasesRepository
@@ -38,6 +38,12 @@ class SponsorsRepository:
             self.__build_data()
 
         return self.__data.get(slug)
+
+    def get_many_by_slug(self, slugs: List[str]) -> Dict[str, Sponsor]:
+        if self.__data is None:
+            self.__build_data()
+
+        return {slug: self.__data.get(slug) for slug in slugs}
     
     def get_by_name(self, name: str) -> Sponsor:
         if self.__data is None:
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from pydantic import BaseModel, computed_field
 
 import omni_models.semantic.ontology as o
@@ -123,6 +123,7 @@ class WorkersRepository:
         self.tasksmanager = tasksmanager or TasksManager()
         self.salesfunnel = salesfunnel or SalesFunnelB2B()
         self.__data: Dict[int, Worker] = None
+        self.__indexes: Dict[str, Dict] = None
 
     def get_all(self, kind: Optional[WorkerKind] = WorkerKind.ALL) -> Dict[int, Worker]:
         if not self.__data:
@@ -141,78 +142,63 @@ class WorkersRepository:
         return self.get_all()[id]
 
     def get_by_slug(self, slug: str) -> Worker:
-        all_workers = self.get_all().values()
-        return next((worker for worker in all_workers if worker.slug == slug), None)
+        return self.__get_index('slug').get(slug)
+
+    def get_many_by_slug(self, slugs: List[str]) -> Dict[str, Worker]:
+        index = self.__get_index('slug')
+        return {slug: index.get(slug) for slug in slugs}
 
     def get_by_name(self, name: str) -> Worker:
-        all_workers = self.get_all().values()
-        return next((worker for worker in all_workers if worker.name == name), None)
+        return self.__get_index('name').get(name)
     
     def get_by_email(self, email: str) -> Worker:
-        all_workers = self.get_all().values()
-        
         if not email.endswith('@eximia.co') and not email.endswith('@elemarjr.com'):
             return None
 
         user_name = email.split('@')[0]
-        email1 = f'{user_name}@eximia.co'
-        email2 = f'{user_name}@elemarjr.com'
-
-        return next(
-            (worker for worker in all_workers if (
-                worker.email == email1 or worker.email == email2
-            )), None
-        )
+        return self.__get_index('email').get(user_name)
 
     def get_by_everhour_id(self, id: int) -> Worker:
-        all_workers = self.get_all().values()
-        return next(
-            (worker
-             for worker in all_workers
-             if worker.tracker_info is not None and worker.tracker_info.id == id
-             )
-            , None
-        )
+        return self.__get_index('everhour').get(id)
 
     def get_by_todoist_id(self, id: int) -> Worker:
-        all_workers = self.get_all().values()
-        return next(
-            (worker
-             for worker in all_workers
-             if worker.todoist_user_id == id
-             )
-            , None
-        )
+        return self.__get_index('todoist').get(id)
 
     def get_by_ontology_user_id(self, user_id: int) -> Worker:
-        all_workers = self.get_all().values()
-        return next(
-            (
-                worker
-                for worker in all_workers
-                if worker.ontology_user_id == user_id
-            ), None
-        )
+        return self.__get_index('ontology').get(user_id)
 
     def get_by_insights_user_id(self, user_id: int) -> Worker:
-        all_workers = self.get_all().values()
-        return next(
-            (
-                worker
-                for worker in all_workers
-                if worker.insights_user_id == user_id
-            ), None
-        )
+        return self.__get_index('insights').get(user_id)
 
     def get_by_pipedrive_user_id(self, user_id: int) -> Worker:
-        all_workers = self.get_all().values()
-        return next(
-            (
-                worker
-                for worker in all_workers
-                if worker.pipedrive_user_id == user_id
-            ), None
-        )
+        return self.__get_index('pipedrive').get(user_id)
+
+    def __get_index(self, name: str) -> Dict:
+        if not self.__data:
+            self.__build_data()
+        return self.__indexes[name]
+
+    @staticmethod
+    def __build_indexes(workers: Dict[int, Worker]) -> Dict[str, Dict]:
+        indexes = {
+            name: {}
+            for name in ('slug', 'name', 'email', 'everhour', 'todoist', 'ontology', 'insights', 'pipedrive')
+        }
+
+        # setdefault keeps the first match, as the former linear scans did
+        for worker in workers.values():
+            indexes['slug'].setdefault(worker.slug, worker)
+            indexes['name'].setdefault(worker.name, worker)
+            if worker.email and worker.email.endswith(('@eximia.co', '@elemarjr.com')):
+                indexes['email'].setdefault(worker.email.split('@')[0], worker)
+            if worker.tracker_info is not None:
+                indexes['everhour'].setdefault(worker.tracker_info.id, worker)
+            indexes['todoist'].setdefault(worker.todoist_user_id, worker)
+            indexes['ontology'].setdefault(worker.ontology_user_id, worker)
+            indexes['insights'].setdefault(worker.insights_user_id, worker)
+            indexes['pipedrive'].setdefault(worker.pipedrive_user_id, worker)
+
+        return indexes
 
     def __build_data(self) -> Dict[int, Worker]:
 
@@ -321,8 +307,12 @@ class WorkersRepository:
         #         )
         #         neg_id -= 1
 
-        self.__data = {
+        data = {
             worker.id: worker
             for worker in workers_dict.values()
             if not worker.is_todoist_only and worker.name != 'admin'
         }
+
+        # Indexes go in first so lookups never see data without them
+        self.__indexes = self.__build_indexes(data)
+        self.__data = data
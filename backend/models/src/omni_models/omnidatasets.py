@@ -4,6 +4,7 @@ from calendar import monthrange
 import pandas as pd
 from typing import Tuple
 
+from omni_models.base.filter_index import FilterIndex
 from omni_models.base.powerdataframe import SummarizablePowerDataFrame
 from omni_models.datasets.insights_dataset import InsightsDataset
 from omni_models.datasets.omni_dataset import OmniDataset
@@ -16,6 +17,14 @@ import omni_utils.helpers.slug as sl
 from omni_utils.helpers.weeks import Weeks
 
 
+# Filters on these fields also match the slug column
+FILTER_SLUG_FIELDS = {
+    'WorkerName': 'WorkerSlug',
+    'ClientName': 'ClientSlug',
+    'CaseTitle': 'CaseSlug'
+}
+
+
 def get_time_part_from_slug(slug: str) -> str:
     if slug.startswith('ontology-entries'):
         return slug[len('ontology-entries-'):]
@@ -479,12 +488,16 @@ class OmniDatasets:
         filterable_fields = source.get_filterable_fields()
         active_filters = dict(zip(filterable_fields, filter_values))
 
-        for filter in filterable_fields:
-            filter_value = active_filters.get(filter, None)
-
-            if len(data) > 0:
+        if len(data) > 0:
+            index = FilterIndex.of(data)
+            mask = None
+            for filter in filterable_fields:
+                filter_value = active_filters.get(filter, None)
                 if filter_value:
-                    data = data[data[filter].isin(filter_value)]
+                    selected = index.field(filter).mask(filter_value)
+                    mask = selected if mask is None else mask & selected
+            if mask is not None:
+                data = data[mask]
 
         return SummarizablePowerDataFrame(data)
     
@@ -494,14 +507,17 @@ class OmniDatasets:
                       filters: dict
                      ):
         
-        # Compose filterable_fields and apply filters
+        # Compose filterable_fields and apply filters. Options and rows come from
+        # the frame's filter index; each field's options only cover the rows left
+        # by the filters of the fields before it.
         filterable_fields = source.get_filterable_fields()
         result = {'filterable_fields': []}
 
+        index = FilterIndex.of(df) if len(df) > 0 else None
+        mask = None
+
         for field in filterable_fields:
-            options = []
-            if len(df) > 0:
-                options = sorted([value for value in df[field].unique().tolist() if value is not None])
+            options = index.field(field).options(mask) if index else []
             
             selected_values = []
 
@@ -519,24 +535,17 @@ class OmniDatasets:
                 }
             )
 
-            # Apply filter to dataframe
-            if selected_values and len(df) > 0:
-                slug_field = None
-                
-                if field == "WorkerName":
-                    slug_field = "WorkerSlug"
-                elif field == "ClientName":
-                    slug_field = "ClientSlug"
-                elif field == "CaseTitle":
-                    slug_field = "CaseSlug"
-                    
-                if not slug_field:
-                    df = df[
-                        df[field].isin(selected_values)
-                        ]
-                else:
-                    df = df[
-                        df[field].isin(selected_values) | df[slug_field].isin(selected_values)
-                    ]
+            # Intersect the rows of the selected values with the rows kept so far
+            if selected_values and index:
+                selected = index.field(field).mask(selected_values)
+
+                slug_field = FILTER_SLUG_FIELDS.get(field)
+                if slug_field:
+                    selected |= index.field(slug_field).mask(selected_values)
+
+                mask = selected if mask is None else mask & selected
+
+        if mask is not None:
+            df = df[mask]
         
         return df, result
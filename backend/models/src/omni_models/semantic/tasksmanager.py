@@ -2,7 +2,7 @@ from datetime import datetime
 
 from omni_models.base.semanticmodel import SemanticModel
 from omni_models.syntactic import Todoist
-from omni_models.base.powerdataframe import PowerDataFrame
+from omni_models.base.powerdataframe import PowerDataFrame, ColumnSchema
 from omni_utils.decorators.c4 import c4_external_system
 
 import omni_models.syntactic.todoist as t
@@ -145,8 +145,8 @@ class TasksManager(SemanticModel):
 
 
 class ProjectsDataFrame(PowerDataFrame):
-    def __init__(self, data):
-        super().__init__(data)
+    def __init__(self, data, schema: ColumnSchema = None):
+        super().__init__(data, schema=schema)
 
     def to_ui(self):
         columns = ['Name']
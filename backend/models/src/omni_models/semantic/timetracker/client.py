@@ -1,21 +1,30 @@
 from datetime import datetime
 from typing import Dict
 
+import pandas as pd
+
 from omni_models.base.semanticmodel import SemanticModel
 from omni_models.semantic import Ontology
 from omni_models.syntactic import Everhour, User, Client
 from omni_utils.decorators.c4 import c4_external_system
-from omni_shared.settings import api_settings
+from omni_shared.settings import api_settings, everhour_settings
 from omni_utils.helpers.weeks import Weeks
+from omni_utils.helpers.rate_limiter import RateLimiter
 
 from .models.appointment import Appointment
+from .models.appointments_frame import build_appointments_frame
 from .models.project import Project
 
 @c4_external_system('Time Tracker (Everhour)', 'Logs EximiaCo engagements, detailing all projects and hours worked')
 class TimeTracker(SemanticModel):
     def __init__(self, everhour=None, ontology=None):
         api_key = api_settings["everhour_api_key"]
-        self.everhour = everhour or Everhour(api_token=api_key)
+        self.everhour = everhour or Everhour(
+            api_token=api_key,
+            rate_limiter=RateLimiter(everhour_settings["requests_per_second"], everhour_settings["burst"]),
+            page_size=everhour_settings["page_size"],
+            max_pages=everhour_settings["max_pages"]
+        )
         self.ontology = ontology or Ontology()
         self.context = None
 
@@ -46,6 +55,11 @@ class TimeTracker(SemanticModel):
             for ap in appointments
         ]
 
+    def get_appointments_frame(self, starting: datetime, ending: datetime) -> pd.DataFrame:
+        """Same rows as `get_appointments`, as a DataFrame built without per-appointment models"""
+        batches = self.everhour.fetch_appointment_batches(starting, ending)
+        return build_appointments_frame(batches, self.all_projects)
+
     def get_appointments_of_n_weeks(self, number_of_weeks=4):
         start, end = Weeks.get_n_weeks_dates(number_of_weeks)
         all_ap = self.get_appointments(start, end)
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from omni_utils.helpers.weeks import Weeks
+
+from .project import Project
+
+# Same columns, in the same order, as Appointment.to_dict()
+APPOINTMENTS_FRAME_COLUMNS = [
+    'id', 'created_at', 'date', 'user_id', 'comment', 'time', 'project_id',
+    'is_squad', 'is_eximiaco', 'is_handson', 'rate',
+    'week', 'time_in_hs', 'kind', 'created_at_week', 'correctness', 'is_lte', 'revenue'
+]
+
+SP_TIMEZONE = 'America/Sao_Paulo'
+
+# Appointment.correctness attaches the pytz zone with `replace`, which uses
+# its first (LMT) offset rather than -03:00; keep the same reference point
+_DATE_OFFSET = datetime(2000, 1, 1).replace(tzinfo=pytz.timezone(SP_TIMEZONE)).utcoffset()
+
+
+def build_appointments_frame(batches: Iterable[Dict[str, list]], projects: Dict[str, Project]) -> pd.DataFrame:
+    """Builds the appointments frame from raw Everhour columns in bulk.
+
+    Produces what `pd.DataFrame([a.to_dict() for a in appointments])` would,
+    computing the derived columns over whole columns instead of per row.
+    """
+    columns: Dict[str, List] = {}
+    for batch in batches:
+        for name, values in batch.items():
+            columns.setdefault(name, []).extend(values)
+
+    if not columns or not columns['id']:
+        return pd.DataFrame()
+
+    df = pd.DataFrame({
+        'id': pd.Series(columns['id'], dtype='int64'),
+        'created_at': pd.to_datetime(pd.Series(columns['created_at']), format='%Y-%m-%d %H:%M:%S'),
+        'date': pd.to_datetime(pd.Series(columns['date']), format='%Y-%m-%d'),
+        'user_id': pd.Series(columns['user_id'], dtype='int64'),
+        'comment': pd.Series(columns['comment'], dtype=object),
+        'time': pd.Series(columns['time'], dtype='int64'),
+        'project_id': pd.Series(columns['project_id'], dtype=object)
+    })
+    # Pages can overlap when entries are added while they are read
+    df = df.drop_duplicates(subset='id').reset_index(drop=True)
+
+    flags = _project_flags(df['project_id'], projects)
+    df = pd.concat([df, flags], axis=1)
+
+    time_in_hs = _round_hours(df['time'])
+    revenue = np.where(df['rate'] != 0, df['rate'] * time_in_hs, 0)
+    if (df['rate'] == 0).all():
+        revenue = revenue.astype('int64')
+
+    created_at_sp = df['created_at'].dt.tz_localize('UTC').dt.tz_convert(SP_TIMEZONE)
+    days = (df['created_at'] - (df['date'] - _DATE_OFFSET)).dt.days
+
+    df['week'] = Weeks.week_labels(df['date'])
+    df['time_in_hs'] = time_in_hs
+    df['kind'] = np.select(
+        [df['is_eximiaco'], df['is_squad'], df['is_handson']],
+        ['Internal', 'Squad', 'HandsOn'],
+        default='Consulting'
+    )
+    df['created_at_week'] = Weeks.week_labels(created_at_sp)
+    df['correctness'] = np.select(
+        [days == 0, days == 1],
+        ['OK', 'Acceptable (1)'],
+        default='WTF ' + days.astype(str)
+    )
+    df['is_lte'] = days > 2
+    df['revenue'] = revenue
+
+    return df[APPOINTMENTS_FRAME_COLUMNS]
+
+
+def _project_flags(project_ids: pd.Series, projects: Dict[str, Project]) -> pd.DataFrame:
+    """Per-project values are resolved once per distinct project, then broadcast"""
+    codes, uniques = pd.factorize(project_ids)
+    rows = []
+    for project_id in uniques:
+        project = projects.get(project_id)
+        is_handson = project.is_handson if project else False
+        rows.append((
+            (project.is_squad if project else False) and not is_handson,
+            project.is_eximiaco if project else True,
+            is_handson,
+            project.rate.rate / 100 if project and project.rate and project.rate.type == 'project_rate' else 0.0
+        ))
+
+    table = pd.DataFrame(rows, columns=['is_squad', 'is_eximiaco', 'is_handson', 'rate'])
+    table = table.astype({'is_squad': bool, 'is_eximiaco': bool, 'is_handson': bool, 'rate': 'float64'})
+    return table.iloc[codes].reset_index(drop=True)
+
+
+def _round_hours(seconds: pd.Series) -> pd.Series:
+    # Python's round, not numpy's: they disagree on ties such as 180s (0.05h)
+    rounded = {value: round(int(value) / 3600, 1) for value in seconds.unique()}
+    return seconds.map(rounded).astype('float64')
+
@@ -1,15 +1,29 @@
+import logging
+import threading
 import requests
-from typing import Dict, Optional, List, Any
+from typing import Dict, Iterator, Optional, List, Any
 from datetime import datetime
 
 from omni_utils.decorators.cache import cache
+from omni_utils.helpers.rate_limiter import RateLimiter
 from .models import User, Project, Task, Client, Appointment
 
+logger = logging.getLogger(__name__)
+
+APPOINTMENT_COLUMNS = ['id', 'created_at', 'date', 'user_id', 'comment', 'time', 'project_id']
+
+
 class Everhour:
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, rate_limiter: Optional[RateLimiter] = None, page_size: int = 10000, max_pages: int = 100):
         self.session = requests.Session()
         self.api_token = api_token
         self.base_url = "https://api.everhour.com/"
+        self.rate_limiter = rate_limiter
+        self.page_size = page_size
+        self.max_pages = max_pages
+        # `truncated` counts listings that still had pages left after `max_pages`
+        self.metrics = {'pages': 0, 'records': 0, 'truncated': 0}
+        self._metrics_lock = threading.Lock()
 
     def fetch(self, entity: str, entity_id: Optional[str] = None, sub_entity: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         if params is None:
@@ -26,11 +40,14 @@ class Everhour:
             'X-Api-Key': self.api_token
         }
 
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
         response = self.session.get(url, params=params, headers=headers)
         response.raise_for_status()
         return response.json()
     
-    @cache
+    @cache(shared=True)
     def fetch_all_users(self) -> Dict[int, User]:
         json = self.fetch('team/users')
         result = {
@@ -39,15 +56,35 @@ class Everhour:
         }
         return result
 
-    def fetch_appointments(self, starting: datetime, ending: datetime) -> List[Appointment]:
-        params = {
+    def fetch_pages(self, entity: str, params: Optional[Dict[str, Any]] = None, page_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the records of a listing one page at a time, until a page comes back short"""
+        page_size = page_size or self.page_size
+        params = {**(params or {}), 'limit': page_size}
+
+        for page in range(1, self.max_pages + 1):
+            records = self.fetch(entity, params={**params, 'page': page}) or []
+            self._record(pages=1, records=len(records))
+            if records:
+                yield records
+            if len(records) < page_size:
+                return
+
+        self._record(truncated=1)
+        logger.warning(f"Stopped reading {entity} after {self.max_pages} pages of {page_size}; the result is truncated")
+
+    def _record(self, **counts):
+        with self._metrics_lock:
+            for name, value in counts.items():
+                self.metrics[name] += value
+
+    @staticmethod
+    def _appointment_params(starting: datetime, ending: datetime) -> Dict[str, Any]:
+        return {
             'from': starting.strftime('%Y-%m-%d'),
-            'to': ending.strftime('%Y-%m-%d'),
-            "limit": 10000,
-            "page": 1
+            'to': ending.strftime('%Y-%m-%d')
         }
 
-        json = self.fetch("team/time", params=params)
+    def fetch_appointments(self, starting: datetime, ending: datetime) -> List[Appointment]:
         return [
             Appointment(
                 **{
@@ -55,22 +92,46 @@ class Everhour:
                     'task_project': ap['task']
                 }
             )
-            for ap in json
+            for page in self.fetch_pages("team/time", params=self._appointment_params(starting, ending))
+            for ap in page
         ]
+
+    def fetch_appointment_batches(self, starting: datetime, ending: datetime, page_size: Optional[int] = None) -> Iterator[Dict[str, list]]:
+        """Yields each page of appointments as raw columns (see APPOINTMENT_COLUMNS), without building models.
+
+        Dates are kept as the strings Everhour sends, so they can be parsed a column at a time.
+        """
+        for page in self.fetch_pages("team/time", params=self._appointment_params(starting, ending), page_size=page_size):
+            yield {
+                'id': [ap['id'] for ap in page],
+                'created_at': [ap['createdAt'] for ap in page],
+                'date': [ap['date'] for ap in page],
+                'user_id': [ap['user'] for ap in page],
+                'comment': [ap.get('comment') for ap in page],
+                'time': [ap['time'] for ap in page],
+                'project_id': [self._project_of(ap.get('task')) for ap in page]
+            }
+
+    @staticmethod
+    def _project_of(task) -> Optional[str]:
+        if isinstance(task, dict):
+            projects = task.get('projects')
+            return projects[0] if projects else None
+        return task
     
     def fetch_all_projects_json(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        params = {
-            "limit": 10000,
-            "page": 1
-        }
+        params = {}
         
         if status:
             params["status"] = status
 
-        json = self.fetch("projects", params=params)
-        return json
+        return [
+            project
+            for page in self.fetch_pages("projects", params=params)
+            for project in page
+        ]
 
-    @cache
+    @cache(shared=True)
     def fetch_all_projects(self, status: Optional[str] = None) -> List[Project]:
         json = self.fetch_all_projects_json(status)
         return [
@@ -78,7 +139,7 @@ class Everhour:
             for p in json
         ]
 
-    @cache
+    @cache(shared=True)
     def fetch_project_tasks(self, project_id: str) -> List[Task]:
         params = {
             "limit": 250,
@@ -90,7 +151,7 @@ class Everhour:
             for t in json
         ]
         
-    @cache
+    @cache(shared=True)
     def search_tasks(self, query: str) -> List[Task]:
         json = self._search_tasks_json(query)
         return [
@@ -106,7 +167,7 @@ class Everhour:
         json = self.fetch("tasks/search", params=params)
         return json
     
-    @cache
+    @cache(shared=True)
     def fetch_all_clients(self) -> List[Client]:
         params = {
             "limit": 10000,
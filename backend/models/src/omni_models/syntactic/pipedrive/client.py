@@ -74,7 +74,7 @@ class Pipedrive:
     @cache(remember=True)
     
 
-    @cache
+    @cache(shared=True)
     def fetch_active_deals_in_stage(self, stage_id, status ='open'):
         params = {
             'stage_id': stage_id,
@@ -85,7 +85,7 @@ class Pipedrive:
 
         return result
 
-    @cache
+    @cache(shared=True)
     def fetch_stages_in_pipeline(self, pipeline_id):
         json = self._fetch_all('stages', params={'pipeline_id': pipeline_id})
         return [Stage(**stage) for stage in json]
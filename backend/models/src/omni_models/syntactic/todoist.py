@@ -68,7 +68,7 @@ class Todoist:
             'Authorization': f'Bearer {self.api_token}'
         }
 
-    @cache
+    @cache(shared=True)
     def sync(self, sync_token='*'):
         url = f'{self.base_url}/sync'
         params = {
@@ -79,7 +79,7 @@ class Todoist:
         response.raise_for_status()
         return response.json()
 
-    @cache
+    @cache(shared=True)
     def sync_completed(self, project_id: int):
         url = f'{self.base_url}/completed/get_all'
         response = requests.post(url, headers=self._get_headers(), params={'project_id': project_id})
@@ -18,6 +18,8 @@ class Wordpress:
     def __init__(self, url, username=None, password=None):
         self.session = requests.Session()
         self.url = url
+        # Clients of different sites must not read each other's cached calls
+        self.cache_scope = url
         self.username = username
         self.password = password
 
@@ -79,7 +81,7 @@ class Wordpress:
         else:
             return dict(combined_results)  # Retorna o dicionário combinado se foi o caso
 
-    @cache
+    @cache(shared=True)
     def fetch_users(self) -> Dict[int, User]:
         json = self.fetch('users')
         result = {
@@ -88,7 +90,7 @@ class Wordpress:
         }
         return result
 
-    @cache
+    @cache(shared=True)
     def fetch_post_types(self) -> List[PostType]:
         json = self.fetch('types')
         result = [PostType(**type_data) for type_data in json.values()]
@@ -96,7 +98,7 @@ class Wordpress:
 
     T = TypeVar('T', bound='Post')
 
-    @cache
+    @cache(shared=True)
     def fetch_posts(self, post_type_slug: str,
                     after: Optional[datetime] = None,
                     before: Optional[datetime] = None,
@@ -135,7 +137,7 @@ class Wordpress:
         endpoint = f'/wp-json/jet-rel/{relation_id}'
         return f'{self.url}{endpoint}'
 
-    @cache
+    @cache(shared=True)
     def fetch_jet_relations(self, relation_id: int) -> Dict[int, List[int]]:
         api_url = self.api_url_for_jet_relations(relation_id)
 
@@ -0,0 +1,79 @@
+import random
+import sys
+import types
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import omni_shared
+from omni_utils.decorators import cache
+from omni_utils.decorators.cache_backends import InMemoryKeyValueClient, KeyValueCacheBackend
+
+# Values drawn for each column of a random timesheet, unless a test picks its own
+TIMESHEET_CHOICES = {
+    'Kind': ['Consulting', 'HandsOn', 'Internal', 'Squad'],
+    'CaseId': ['c1', 'c2', 'c3', None],
+    'CaseTitle': [f'Case {i}' for i in range(10)],
+    'ClientName': [f'Client {i}' for i in range(6)],
+    'Sponsor': ['Sponsor A', 'Sponsor B', None],
+    'AccountManagerName': ['Ana', 'Bruno', None],
+    'WorkerName': [f'Worker {i}' for i in range(12)],
+    'ProductsOrServices': ['Offer X', 'Offer Y']
+}
+
+
+def build_timesheet(seed, columns, rows=300, first=date(2024, 1, 1), last=date(2024, 3, 31), **choices):
+    """
+    Random appointments between `first` and `last`: a Date, one value per row
+    for each of `columns`, drawn from `choices` or TIMESHEET_CHOICES, and a
+    TimeInHs unless `columns` lists it.
+    """
+    rnd = random.Random(seed)
+    days = (last - first).days
+    data = {'Date': [first + timedelta(days=rnd.randint(0, days)) for _ in range(rows)]}
+    for column in columns:
+        options = choices.get(column, TIMESHEET_CHOICES.get(column))
+        data[column] = [rnd.choice(options) for _ in range(rows)]
+    if 'TimeInHs' not in data:
+        data['TimeInHs'] = [round(rnd.random() * 8, 1) for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def make_timesheet():
+    return build_timesheet
+
+
+@pytest.fixture
+def shared_cache():
+    """A fresh in-memory backend behind @cache and memoize"""
+    previous = cache._backend
+    backend = KeyValueCacheBackend(InMemoryKeyValueClient())
+    cache.set_backend(backend)
+    yield backend
+    cache.set_backend(previous)
+
+
+@pytest.fixture(scope='module')
+def stub_globals():
+    """
+    An empty omni_shared.globals for the modules a test file imports, which
+    would otherwise build every model, and connect to their APIs, on import.
+    Modules first imported under the stub are unloaded afterwards, so nothing
+    collected later sees them bound to it.
+    """
+    stub = types.ModuleType('omni_shared.globals')
+    loaded = set(sys.modules)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(sys.modules, 'omni_shared.globals', stub)
+        patch.setattr(omni_shared, 'globals', stub, raising=False)
+        yield stub
+
+    for name in sorted(set(sys.modules) - loaded, reverse=True):
+        if name.split('.')[0] not in ('omni_models', 'omni_shared'):
+            continue
+        del sys.modules[name]
+        parent, _, child = name.rpartition('.')
+        if parent in sys.modules and isinstance(getattr(sys.modules[parent], child, None), types.ModuleType):
+            delattr(sys.modules[parent], child)
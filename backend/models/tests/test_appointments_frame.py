@@ -0,0 +1,91 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import omni_models.syntactic.everhour as e
+from omni_models.syntactic.everhour.client import Everhour
+from omni_models.semantic.timetracker.models.appointment import Appointment
+from omni_models.semantic.timetracker.models.appointments_frame import build_appointments_frame
+
+
+def build_fixture(seed, rated=True):
+    rnd = random.Random(seed)
+    projects = {
+        f'p{i}': SimpleNamespace(
+            is_squad=rnd.random() < .5,
+            is_eximiaco=rnd.random() < .3,
+            is_handson=rnd.random() < .3,
+            rate=SimpleNamespace(rate=rnd.choice([10000, 15050]) if rated else 0, type=rnd.choice(['project_rate', 'user_rate'])) if rnd.random() < .8 else None
+        )
+        for i in range(6)
+    }
+    raw = []
+    for i in range(300):
+        day = datetime(2015, 1, 1) + timedelta(days=rnd.randint(0, 3650))
+        created_at = day + timedelta(seconds=rnd.randint(-86400, 6 * 86400))
+        raw.append({
+            'id': i,
+            'createdAt': created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'date': day.strftime('%Y-%m-%d'),
+            'user': rnd.randint(1, 9),
+            'comment': rnd.choice([None, 'review', 'meeting']),
+            # 180s and 540s land exactly on rounding ties
+            'time': rnd.choice([180, 540, rnd.randint(0, 40000)]),
+            'task': rnd.choice([{'projects': [f'p{rnd.randint(0, 5)}']}, f'p{rnd.randint(0, 5)}'])
+        })
+    return raw, projects
+
+
+def as_batches(raw, size):
+    for start in range(0, len(raw), size):
+        page = raw[start:start + size]
+        yield {
+            'id': [ap['id'] for ap in page],
+            'created_at': [ap['createdAt'] for ap in page],
+            'date': [ap['date'] for ap in page],
+            'user_id': [ap['user'] for ap in page],
+            'comment': [ap['comment'] for ap in page],
+            'time': [ap['time'] for ap in page],
+            'project_id': [Everhour._project_of(ap['task']) for ap in page]
+        }
+
+
+def reference_frame(raw, projects):
+    appointments = [
+        Appointment.from_base_instance(
+            e.Appointment(**{**ap, 'task_project': ap['task']}),
+            projects[Everhour._project_of(ap['task'])]
+        )
+        for ap in raw
+    ]
+    return pd.DataFrame([ap.to_dict() for ap in appointments])
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('rated', [True, False])
+def test_matches_the_per_appointment_models(seed, rated):
+    raw, projects = build_fixture(seed, rated)
+    expected = reference_frame(raw, projects)
+    actual = build_appointments_frame(as_batches(raw, 70), projects)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_overlapping_pages_are_deduplicated():
+    raw, projects = build_fixture(0)
+    batches = list(as_batches(raw, 100)) + list(as_batches(raw[250:], 100))
+    actual = build_appointments_frame(batches, projects)
+    pd.testing.assert_frame_equal(actual, reference_frame(raw, projects))
+
+
+def test_unknown_projects_count_as_internal():
+    raw, projects = build_fixture(0)
+    df = build_appointments_frame(as_batches(raw, 100), {})
+    assert (df['kind'] == 'Internal').all()
+    assert (df['revenue'] == 0).all()
+
+
+def test_no_appointments_give_an_empty_frame():
+    assert build_appointments_frame([], {}).empty
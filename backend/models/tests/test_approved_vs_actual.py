@@ -0,0 +1,130 @@
+import importlib
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from omni_utils.helpers.weeks import Weeks
+
+
+@pytest.fixture(scope='module')
+def ava(stub_globals):
+    return importlib.import_module('omni_models.analytics.approved_vs_actual')
+
+
+def is_live(case, first, last):
+    return bool(case.weekly_approved_hours) and \
+        (not case.start_of_contract or case.start_of_contract <= last) and \
+        (not case.end_of_contract or case.end_of_contract >= first)
+
+
+def build_fixture(make_timesheet, seed):
+    rnd = random.Random(seed)
+    cases = []
+    for i in range(rnd.randint(1, 25)):
+        start_of_contract = rnd.choice([None, date(2024, 1, 1) + timedelta(days=rnd.randint(-30, 200))])
+        end_of_contract = rnd.choice([None, (start_of_contract or date(2024, 1, 1)) + timedelta(days=rnd.randint(0, 120))])
+        cases.append(SimpleNamespace(
+            id=str(i), title=f'Case {i}', client_id=rnd.choice([None, 'c1']),
+            start_of_contract=start_of_contract, end_of_contract=end_of_contract,
+            weekly_approved_hours=rnd.choice([None, 5.5, 12.0, 40.0]),
+            is_active=rnd.random() < .7, pre_contracted_value=rnd.random() < .3
+        ))
+
+    timesheet = make_timesheet(
+        seed, ['Kind', 'CaseId'], rows=1500, first=date(2023, 12, 1), last=date(2024, 9, 27),
+        Kind=['Consulting', 'Squad'], CaseId=[None] + [str(i) for i in range(30)]
+    ).astype({'Kind': 'category', 'CaseId': 'category'})
+    return cases, timesheet
+
+
+@pytest.fixture
+def install(ava, monkeypatch):
+    def install(cases, timesheet):
+        fetches = []
+
+        def get(after, before):
+            fetches.append((after, before))
+            return SimpleNamespace(data=timesheet[(timesheet['Date'] >= after.date()) & (timesheet['Date'] <= before.date())])
+
+        by_id = {case.id: case for case in cases}
+        monkeypatch.setattr(ava.globals, 'omni_models', SimpleNamespace(cases=SimpleNamespace(
+            get_live_cases_with_approved_hours=lambda after, before: [c for c in cases if is_live(c, after.date(), before.date())],
+            get_by_id=by_id.get
+        )), raising=False)
+        monkeypatch.setattr(ava.globals, 'omni_datasets', SimpleNamespace(timesheets=SimpleNamespace(get=get)), raising=False)
+        return fetches
+    return install
+
+
+def expected_weeks(cases, timesheet, start, end):
+    """Approved and actual hours of every live case, one week after the other"""
+    weeks = []
+    first, _ = Weeks.get_week_dates(start)
+    _, last_week_end = Weeks.get_week_dates(end)
+    while first < last_week_end:
+        last = first + timedelta(days=6)
+        rows = []
+        for case in cases:
+            if not is_live(case, first.date(), last.date()):
+                continue
+            days = (min(last.date(), case.end_of_contract or last.date()) - max(first.date(), case.start_of_contract or first.date())).days + 1
+            worked = timesheet[
+                (timesheet['Date'] >= first.date()) & (timesheet['Date'] <= last.date()) &
+                (timesheet['Kind'] == 'Consulting') & (timesheet['CaseId'] == case.id)
+            ]['TimeInHs']
+            rows.append((case.id, days, case.weekly_approved_hours * days / 7, worked.sum()))
+        weeks.append((first.date(), rows))
+        first += timedelta(days=7)
+    return weeks
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_weeks_match_week_by_week_computation(ava, install, make_timesheet, seed):
+    cases, timesheet = build_fixture(make_timesheet, seed)
+    fetches = install(cases, timesheet)
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1) + timedelta(days=rnd.randint(0, 150))
+    end = start + timedelta(days=rnd.randint(0, 120))
+
+    raw_data = ava._compute_raw_data(start, end)
+
+    assert len(fetches) == 1
+    actual = [
+        (datetime.fromisoformat(week['start']).date(), [(r['id'], r['number_of_days'], r['approved_hours'], r['actual']) for r in week['data']])
+        for week in raw_data['weeks']
+    ]
+    expected = expected_weeks(cases, timesheet, start, end)
+    assert [week for week, _ in actual] == [week for week, _ in expected]
+    for (_, rows), (_, expected_rows) in zip(actual, expected):
+        assert [row[:2] for row in rows] == [row[:2] for row in expected_rows]
+        assert [value for row in rows for value in row[2:]] == pytest.approx([value for row in expected_rows for value in row[2:]])
+
+
+def test_contract_dates_are_iso_strings(ava, install):
+    case = SimpleNamespace(
+        id='1', title='Case 1', client_id=None, start_of_contract=date(2024, 1, 10), end_of_contract=None,
+        weekly_approved_hours=14.0, is_active=True, pre_contracted_value=False
+    )
+    install([case], pd.DataFrame({'Date': [], 'Kind': [], 'CaseId': [], 'TimeInHs': []}))
+
+    result = ava.compute_approved_vs_actual('2024-01-01', '2024-01-20')
+
+    assert [week.number_of_days for week in result.cases[0].weeks] == [4, 7]
+    assert result.cases[0].start_of_contract == '2024-01-10T00:00:00'
+    assert result.cases[0].end_of_contract is None
+    assert result.total_approved_hours == pytest.approx(22)
+
+
+def test_weeks_without_live_cases_are_empty(ava, install):
+    case = SimpleNamespace(
+        id='1', title='Case 1', client_id=None, start_of_contract=date(2024, 1, 1), end_of_contract=date(2024, 1, 3),
+        weekly_approved_hours=7.0, is_active=True, pre_contracted_value=False
+    )
+    install([case], pd.DataFrame({'Date': [], 'Kind': [], 'CaseId': [], 'TimeInHs': []}))
+
+    raw_data = ava._compute_raw_data(datetime(2024, 1, 1), datetime(2024, 1, 20))
+
+    assert [len(week['data']) for week in raw_data['weeks']] == [1, 0, 0]
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.disk_cache import TimesheetDiskCache
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+
+CATEGORIES = ['Kind', 'WorkerName', 'WorkerOmniUrl', 'ClientName', 'ClientOmniUrl']
+
+
+@pytest.fixture
+def month(make_timesheet):
+    def month(seed, **choices):
+        """Appointments as the dataset enriches them: plain object columns, stored links included"""
+        df = make_timesheet(seed, ['Kind', 'WorkerName', 'ClientName'], rows=200, **choices)
+        df['WorkerOmniUrl'] = '/workers/' + df['WorkerName'].str.lower().str.replace(' ', '-')
+        df['ClientOmniUrl'] = np.where(df['ClientName'].str.endswith('0'), 'N/A', '/clients/' + df['ClientName'])
+        df['UserId'] = np.arange(len(df), dtype='int64')
+        df['Worker'] = 'stale link'
+        return df
+    return month
+
+
+def as_objects(df):
+    """The values of a frame, whatever the dtypes they are stored with"""
+    return df.astype(object).where(df.notna(), None)
+
+
+def test_apply_stores_categories_and_narrow_dtypes(month):
+    df = month(1)
+
+    stored = TIMESHEET_SCHEMA.apply(df)
+
+    assert all(isinstance(stored[column].dtype, pd.CategoricalDtype) for column in CATEGORIES)
+    assert stored['UserId'].dtype == 'int32'
+    assert 'Worker' not in stored.columns
+    pd.testing.assert_frame_equal(as_objects(stored), as_objects(df.drop(columns='Worker')))
+
+
+def test_apply_keeps_wide_dtypes_of_columns_with_missing_values(month):
+    df = month(1).astype({'UserId': 'float64'})
+    df.loc[3, 'UserId'] = np.nan
+
+    assert TIMESHEET_SCHEMA.apply(df)['UserId'].dtype == 'float64'
+
+
+def test_categories_survive_a_disk_round_trip(month, tmp_path):
+    disk = TimesheetDiskCache(tmp_path, 'api-key')
+    stored = TIMESHEET_SCHEMA.apply(month(2))
+
+    disk.save(stored, 'jan_2024')
+    loaded = TIMESHEET_SCHEMA.apply(disk.load('jan_2024').data)
+
+    pd.testing.assert_frame_equal(loaded, stored.reset_index(drop=True))
+
+
+def test_concat_unions_the_categories(month):
+    january = TIMESHEET_SCHEMA.apply(month(3, WorkerName=['Ana', 'Bruno']))
+    february = TIMESHEET_SCHEMA.apply(month(4, WorkerName=['Bruno', 'Carla']))
+    empty = pd.DataFrame()
+
+    merged = TIMESHEET_SCHEMA.concat([january, empty, february])
+
+    assert isinstance(merged['WorkerName'].dtype, pd.CategoricalDtype)
+    assert sorted(merged['WorkerName'].cat.categories) == ['Ana', 'Bruno', 'Carla']
+    plain = pd.concat([as_objects(january), as_objects(february)])
+    pd.testing.assert_frame_equal(as_objects(merged), plain)
+
+
+def test_concat_of_frames_missing_a_column(month):
+    january = TIMESHEET_SCHEMA.apply(month(5))
+    february = TIMESHEET_SCHEMA.apply(month(6)).drop(columns='ClientName')
+
+    merged = TIMESHEET_SCHEMA.concat([january, february])
+
+    assert isinstance(merged['ClientName'].dtype, pd.CategoricalDtype)
+    assert merged['ClientName'].isna().sum() == len(february)
+
+
+def test_concat_of_nothing_is_empty():
+    assert TIMESHEET_SCHEMA.concat([pd.DataFrame(), pd.DataFrame()]).empty
+
+
+def test_links_are_derived_on_demand(month):
+    df = month(7).drop(columns='Worker')
+    timesheet = SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
+
+    derived = timesheet.with_derived_columns()
+
+    assert 'Worker' not in timesheet.data.columns
+    assert derived['Worker'].tolist() == [f'<a href="{url}">{name}</a>' for name, url in zip(df['WorkerName'], df['WorkerOmniUrl'])]
+    assert derived['Client'].tolist() == [
+        'N/A' if url == 'N/A' else f"<a href='{url}'>{name}</a>" for name, url in zip(df['ClientName'], df['ClientOmniUrl'])
+    ]
+
+
+def test_filters_keep_the_stored_dtypes(month):
+    timesheet = SummarizablePowerDataFrame(month(8), schema=TIMESHEET_SCHEMA)
+
+    filtered = timesheet.filter_is_in(timesheet.data, 'Kind', ['Squad'])
+
+    assert isinstance(filtered.data['Kind'].dtype, pd.CategoricalDtype)
+    assert set(filtered.data['Kind']) == {'Squad'}
+    assert filtered.schema is TIMESHEET_SCHEMA
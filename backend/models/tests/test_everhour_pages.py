@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from omni_models.syntactic.everhour.client import APPOINTMENT_COLUMNS, Everhour
+
+
+class FakeEverhour(Everhour):
+    def __init__(self, records, **kwargs):
+        super().__init__('token', **kwargs)
+        self.records = records
+        self.requested_pages = []
+
+    def fetch(self, entity, entity_id=None, sub_entity=None, params=None):
+        page, limit = params['page'], params['limit']
+        self.requested_pages.append(page)
+        return self.records[(page - 1) * limit:page * limit]
+
+
+def _appointments(count):
+    return [
+        {
+            'id': i,
+            'createdAt': '2024-03-02 10:00:00',
+            'date': '2024-03-01',
+            'user': 7,
+            'comment': None,
+            'time': 3600,
+            'task': {'projects': ['ev:1']}
+        }
+        for i in range(count)
+    ]
+
+MARCH = (datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+
+def test_reads_pages_until_a_short_one():
+    client = FakeEverhour(_appointments(25), page_size=10)
+    appointments = client.fetch_appointments(*MARCH)
+    assert [a.id for a in appointments] == list(range(25))
+    assert client.requested_pages == [1, 2, 3]
+    assert client.metrics == {'pages': 3, 'records': 25, 'truncated': 0}
+
+def test_batches_are_columnar():
+    client = FakeEverhour(_appointments(12), page_size=10)
+    batches = list(client.fetch_appointment_batches(*MARCH))
+    assert [len(batch['id']) for batch in batches] == [10, 2]
+    assert set(batches[0]) == set(APPOINTMENT_COLUMNS)
+    assert batches[0]['project_id'][0] == 'ev:1'
+
+def test_truncation_is_counted():
+    client = FakeEverhour(_appointments(30), page_size=10, max_pages=2)
+    assert len(client.fetch_appointments(*MARCH)) == 20
+    assert client.metrics['truncated'] == 1
@@ -0,0 +1,130 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from omni_models.base.filter_index import FieldIndex, FieldScan, FilterIndex
+
+FIELDS = ['Kind', 'AccountManagerName', 'ClientName', 'CaseTitle', 'Sponsor', 'WorkerName', 'ProductsOrServices']
+SLUGS = {'WorkerName': 'WorkerSlug', 'ClientName': 'ClientSlug', 'CaseTitle': 'CaseSlug'}
+
+
+@pytest.fixture(scope='module')
+def datasets(stub_globals):
+    from omni_models.omnidatasets import OmniDatasets
+    return OmniDatasets.__new__(OmniDatasets)
+
+
+@pytest.fixture
+def build_frame(make_timesheet):
+    def build_frame(seed, rows=400):
+        """A timesheet with slug columns, where most columns are categoricals listing more values than they hold"""
+        rnd = random.Random(seed)
+        df = make_timesheet(seed, FIELDS, rows=rows)
+        for field, slug_field in SLUGS.items():
+            df[slug_field] = df[field].str.lower().str.replace(' ', '-')
+        for column in [*FIELDS, *SLUGS.values()]:
+            if rnd.random() < .7:
+                df[column] = df[column].astype(pd.CategoricalDtype(sorted(set(df[column].dropna()) | {'Unused'}, reverse=True)))
+        return df
+    return build_frame
+
+
+def sequential_filters(df, filters):
+    """The filtering apply_filters did before the index: one isin after the other"""
+    result = []
+    for field in FIELDS:
+        options = sorted(df[field].dropna().unique().tolist()) if len(df) > 0 else []
+        selected = next((f['selectedValues'] for f in filters if f['field'] == field), [])
+        result.append({'field': field, 'selected_values': selected, 'options': options})
+        if selected and len(df) > 0:
+            keep = df[field].isin(selected)
+            if field in SLUGS:
+                keep |= df[SLUGS[field]].isin(selected)
+            df = df[keep]
+    return df, result
+
+
+def random_filters(rnd, df):
+    filters = []
+    for field in rnd.sample(FIELDS, rnd.randint(0, 4)):
+        column = SLUGS[field] if field in SLUGS and rnd.random() < .3 else field
+        values = df[column].dropna().unique().tolist()
+        selected = rnd.sample(values, min(len(values), rnd.randint(1, 3))) + (['missing'] if rnd.random() < .2 else [])
+        filters.append({'field': field, 'selectedValues': selected})
+    return filters
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_apply_filters_matches_sequential_filtering(datasets, build_frame, seed):
+    rnd = random.Random(seed)
+    df = build_frame(seed)
+    source = SimpleNamespace(get_filterable_fields=lambda: FIELDS)
+
+    for _ in range(5):
+        filters = random_filters(rnd, df)
+        expected_df, expected = sequential_filters(df, filters)
+        filtered, result = datasets.apply_filters(source, df, filters)
+
+        assert result['filterable_fields'] == expected
+        pd.testing.assert_frame_equal(filtered, expected_df)
+
+
+def test_index_is_built_once_a_frame_is_filtered_again(build_frame):
+    df = build_frame(1)
+
+    first = FilterIndex.of(df)
+    assert isinstance(first.field('WorkerName'), FieldScan)
+    assert first.fields == {}
+
+    index = FilterIndex.of(df)
+    field = index.field('WorkerName')
+    assert index is first and isinstance(field, FieldIndex)
+    assert FilterIndex.of(df) is index
+    assert index.field('WorkerName') is field
+    assert FilterIndex.of(df.copy()) is not index
+
+
+def test_fresh_slices_are_scanned_and_never_indexed(datasets, build_frame):
+    df = build_frame(2)
+    source = SimpleNamespace(get_filterable_fields=lambda: FIELDS)
+
+    for _ in range(3):
+        sliced = df[df['Kind'] != 'Internal']
+        datasets.apply_filters(source, sliced, [{'field': 'WorkerName', 'selectedValues': ['Worker 1']}])
+        assert FilterIndex.of(sliced).fields == {}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_scans_answer_as_indexes_do(build_frame, seed):
+    rnd = random.Random(seed)
+    df = build_frame(seed)
+    mask = np.array([rnd.random() < .5 for _ in range(len(df))])
+
+    for field in FIELDS:
+        index, scan = FieldIndex(df[field]), FieldScan(df[field])
+        values = rnd.sample(index.values, min(2, len(index.values))) + ['missing']
+        assert scan.options() == index.options()
+        assert scan.options(mask) == index.options(mask)
+        assert scan.mask(values).tolist() == index.mask(values).tolist()
+
+
+def test_field_index_skips_missing_values():
+    df = pd.DataFrame({'Sponsor': ['b', None, 'a', 'b', np.nan]})
+    index = FieldIndex(df['Sponsor'])
+
+    assert index.options() == ['a', 'b']
+    assert index.options(np.array([False, True, False, True, True])) == ['b']
+    assert index.mask(['b', 'missing']).tolist() == [True, False, False, True, False]
+
+
+def test_empty_frame_has_no_options(datasets):
+    source = SimpleNamespace(get_filterable_fields=lambda: ['Kind'])
+    df = pd.DataFrame({'Kind': pd.Series([], dtype=object)})
+
+    filtered, result = datasets.apply_filters(source, df, [{'field': 'Kind', 'selectedValues': ['Squad']}])
+
+    assert result['filterable_fields'] == [{'field': 'Kind', 'selected_values': ['Squad'], 'options': []}]
+    assert filtered is df
@@ -0,0 +1,132 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from omni_models.domain.cases import CasesRepository
+from omni_models.domain.clients import ClientsRepository
+from omni_models.domain.workers import WorkersRepository
+
+
+def loaded(cls, data):
+    """A repository holding `data`, indexed as the end of its build does"""
+    repository = cls.__new__(cls)
+    private = f'_{cls.__name__}__'
+    setattr(repository, f'{private}indexes', getattr(cls, f'{private}build_indexes')(data))
+    setattr(repository, f'{private}data', data)
+    return repository
+
+
+def first(entities, predicate):
+    """The linear scans the indexes replaced"""
+    return next((entity for entity in entities if predicate(entity)), None)
+
+
+def build_workers(rnd, count=60):
+    """Workers sharing names, slugs and ids, so only the first match of each must be returned"""
+    workers = {}
+    for i in range(count):
+        user = f'user{rnd.randint(0, 20)}'
+        workers[i] = SimpleNamespace(
+            id=i,
+            name=f'Worker {rnd.randint(0, 30)}',
+            slug=f'worker-{rnd.randint(0, 30)}',
+            email=rnd.choice([None, f'{user}@eximia.co', f'{user}@elemarjr.com', f'{user}@gmail.com']),
+            tracker_info=rnd.choice([None, SimpleNamespace(id=rnd.randint(0, 20))]),
+            todoist_user_id=rnd.choice([None, rnd.randint(0, 20)]),
+            ontology_user_id=rnd.choice([None, rnd.randint(0, 20)]),
+            insights_user_id=rnd.choice([None, rnd.randint(0, 20)]),
+            pipedrive_user_id=rnd.choice([None, rnd.randint(0, 20)])
+        )
+    return workers
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_workers_lookups_return_the_first_match(seed):
+    rnd = random.Random(seed)
+    workers = build_workers(rnd)
+    repository = loaded(WorkersRepository, workers)
+    all_workers = list(workers.values())
+
+    for key in range(35):
+        name, slug = f'Worker {key}', f'worker-{key}'
+        assert repository.get_by_name(name) is first(all_workers, lambda w: w.name == name)
+        assert repository.get_by_slug(slug) is first(all_workers, lambda w: w.slug == slug)
+        assert repository.get_by_everhour_id(key) is first(all_workers, lambda w: w.tracker_info is not None and w.tracker_info.id == key)
+        assert repository.get_by_todoist_id(key) is first(all_workers, lambda w: w.todoist_user_id == key)
+        assert repository.get_by_ontology_user_id(key) is first(all_workers, lambda w: w.ontology_user_id == key)
+        assert repository.get_by_insights_user_id(key) is first(all_workers, lambda w: w.insights_user_id == key)
+        assert repository.get_by_pipedrive_user_id(key) is first(all_workers, lambda w: w.pipedrive_user_id == key)
+
+        for domain in ('eximia.co', 'elemarjr.com', 'gmail.com'):
+            email = f'user{key}@{domain}'
+            expected = None
+            if domain != 'gmail.com':
+                aliases = (f'user{key}@eximia.co', f'user{key}@elemarjr.com')
+                expected = first(all_workers, lambda w: w.email in aliases)
+            assert repository.get_by_email(email) is expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cases_lookups_return_the_first_match(seed):
+    rnd = random.Random(seed)
+    cases = {
+        str(i): SimpleNamespace(
+            id=str(i),
+            slug=f'case-{rnd.randint(0, 15)}',
+            title=f'Case {rnd.randint(0, 15)}',
+            everhour_projects_ids=[f'ev:{rnd.randint(0, 40)}' for _ in range(rnd.randint(0, 3))],
+            tracker_info=[SimpleNamespace(name=f'Project {rnd.randint(0, 40)}') for _ in range(rnd.randint(0, 3))]
+        )
+        for i in range(30)
+    }
+    repository = loaded(CasesRepository, cases)
+    all_cases = list(cases.values())
+
+    for key in range(45):
+        assert repository.get_by_slug(f'case-{key}') is first(all_cases, lambda c: c.slug == f'case-{key}')
+        assert repository.get_by_title(f'Case {key}') is first(all_cases, lambda c: c.title == f'Case {key}')
+        assert repository.get_by_everhour_project_id(f'ev:{key}') is first(all_cases, lambda c: f'ev:{key}' in c.everhour_projects_ids)
+        assert repository.get_by_everhour_project_name(f'Project {key}') is first(
+            all_cases, lambda c: any(ti.name == f'Project {key}' for ti in c.tracker_info)
+        )
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_clients_lookups_return_the_first_match(seed):
+    rnd = random.Random(seed)
+    clients = {
+        i: SimpleNamespace(
+            id=i,
+            slug=f'client-{rnd.randint(0, 12)}',
+            name=f'Client {rnd.randint(0, 12)}',
+            tracker_ids=[rnd.randint(0, 30) for _ in range(rnd.randint(0, 2))]
+        )
+        for i in range(20)
+    }
+    repository = loaded(ClientsRepository, clients)
+    all_clients = list(clients.values())
+
+    for key in range(35):
+        assert repository.get_by_slug(f'client-{key}') is first(all_clients, lambda c: c.slug == f'client-{key}')
+        assert repository.get_by_name(f'Client {key}') is first(all_clients, lambda c: c.name == f'Client {key}')
+        assert repository.get_by_everhour_id(key) is first(all_clients, lambda c: key in c.tracker_ids)
+
+
+def test_batched_lookups_match_the_single_ones():
+    rnd = random.Random(0)
+    workers = loaded(WorkersRepository, build_workers(rnd))
+    clients = loaded(ClientsRepository, {i: SimpleNamespace(id=i, slug=f'client-{i % 7}', name='', tracker_ids=[]) for i in range(10)})
+    cases = loaded(CasesRepository, {
+        str(i): SimpleNamespace(id=str(i), slug=f'case-{i}', title='', everhour_projects_ids=[], tracker_info=[])
+        for i in range(10)
+    })
+
+    slugs = [f'worker-{key}' for key in range(35)]
+    assert workers.get_many_by_slug(slugs) == {slug: workers.get_by_slug(slug) for slug in slugs}
+    assert clients.get_many_by_slug(['client-3', 'client-9']) == {'client-3': clients.get_by_slug('client-3'), 'client-9': None}
+    assert cases.get_many_by_slug(['case-1']) == {'case-1': cases.get_by_slug('case-1')}
+
+    # Ids arrive as text and are tried as numbers too, as get_by_id does
+    assert clients.get_many_by_id(['3', 4, '42']) == {'3': clients.get_by_id('3'), 4: clients.get_by_id(4), '42': None}
+    assert cases.get_many_by_id(['2', '99']) == {'2': cases.get_by_id('2'), '99': None}
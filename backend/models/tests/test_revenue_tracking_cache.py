@@ -0,0 +1,133 @@
+import importlib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def rt(stub_globals):
+    return importlib.import_module('omni_models.analytics.revenue_tracking')
+
+
+class Timesheets:
+    """Counts the loads a revenue tracking asks of the dataset"""
+
+    def __init__(self, closed=False):
+        self.closed = closed
+        self.version = 0
+        self.loads = []
+
+    def get_version(self, after, before):
+        return (self.version,)
+
+    def get_facts(self, after, before):
+        self.loads.append(('facts', after, before))
+        return SimpleNamespace(data='facts') if self.closed else None
+
+    def get(self, after, before):
+        self.loads.append(('appointments', after, before))
+        return SimpleNamespace(data='appointments')
+
+
+@pytest.fixture
+def computations(rt, monkeypatch):
+    computations = []
+
+    def compute(timesheet, date_of_interest, account_manager_name_or_slug, filters):
+        computations.append((timesheet.data, date_of_interest, account_manager_name_or_slug))
+        return len(computations)
+
+    monkeypatch.setattr(rt, '_compute_revenue_tracking', compute)
+    return computations
+
+
+@pytest.fixture
+def timesheets(stub_globals):
+    timesheets = Timesheets()
+    stub_globals.omni_datasets = SimpleNamespace(timesheets=timesheets)
+    return timesheets
+
+
+def test_a_reused_result_does_not_load_the_timesheet(rt, timesheets, computations):
+    first = rt.compute_revenue_tracking(date(2024, 3, 10), filters=[{'field': 'Kind', 'selectedValues': ['Squad']}])
+    again = rt.compute_revenue_tracking(datetime(2024, 3, 10, 15), filters=[{'field': 'Kind', 'selected_values': ['Squad']}])
+
+    assert first == again == 1
+    assert timesheets.loads == [
+        ('facts', datetime(2024, 3, 1), datetime.combine(date(2024, 3, 10), datetime.max.time())),
+        ('appointments', datetime(2024, 3, 1), datetime.combine(date(2024, 3, 10), datetime.max.time()))
+    ]
+    assert computations == [('appointments', date(2024, 3, 10), None)]
+
+
+def test_results_are_computed_again_once_the_timesheet_changes(rt, timesheets, computations):
+    rt.compute_revenue_tracking(date(2024, 3, 10))
+    rt.compute_revenue_tracking(date(2024, 3, 10), 'ana')
+    rt.compute_revenue_tracking(date(2024, 3, 11))
+
+    timesheets.version += 1
+    rt.compute_revenue_tracking(date(2024, 3, 10))
+
+    assert len(computations) == 4
+    assert len([load for load in timesheets.loads if load[0] == 'appointments']) == 4
+
+
+def test_closed_months_are_read_from_their_facts(rt, stub_globals, computations):
+    timesheets = Timesheets(closed=True)
+    stub_globals.omni_datasets = SimpleNamespace(timesheets=timesheets)
+
+    rt.compute_revenue_tracking(date(2024, 2, 29))
+
+    assert [load[0] for load in timesheets.loads] == ['facts']
+    assert computations == [('facts', date(2024, 2, 29), None)]
+
+
+def test_concurrent_calls_for_the_same_range_and_filters_run_once(rt, timesheets, computations, monkeypatch):
+    lookups = []
+
+    def slow_version(after, before):
+        lookups.append((after, before))
+        time.sleep(0.2)
+        return (0,)
+
+    monkeypatch.setattr(timesheets, 'get_version', slow_version)
+    filters = [{'field': 'Kind', 'selectedValues': ['Squad']}]
+    calls = [
+        (date(2024, 3, 10), None, filters),
+        (date(2024, 3, 10), None, filters),
+        (date(2024, 3, 10), None, filters),
+        (date(2024, 3, 10), None, [{'field': 'Kind', 'selectedValues': ['Consulting']}]),
+        (date(2024, 3, 11), None, filters)
+    ]
+    threads = [threading.Thread(target=rt.compute_revenue_tracking, args=call) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(lookups) == 3
+    assert len(computations) == 3
+
+
+@pytest.fixture(scope='module')
+def dataset_class(stub_globals):
+    from omni_models.datasets.timesheet_dataset.main import TimesheetDataset
+    return TimesheetDataset
+
+
+def test_the_version_of_the_current_month_changes_every_refresh_interval(dataset_class):
+    dataset = dataset_class.__new__(dataset_class)
+    dataset.version = 0
+    dataset.month_versions = {(2024, 3): 2}
+    dataset.open_month_refresh = timedelta(minutes=5)
+    today = datetime.combine(date.today(), datetime.min.time())
+
+    assert dataset.get_version(datetime(2024, 3, 1), datetime(2024, 3, 31)) == (0, 2)
+    current = dataset.get_version(today, today)
+    assert current[:2] == (0, 0) and len(current) == 3
+
+    dataset.open_month_refresh = timedelta(seconds=1e-6)
+    assert dataset.get_version(today, today)[-1] != current[-1]
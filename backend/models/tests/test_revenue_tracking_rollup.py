@@ -0,0 +1,313 @@
+import importlib
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from omni_utils.helpers.dates import get_first_day_of_month, get_last_day_of_month
+from omni_utils.helpers.slug import slugify
+
+KINDS = ['consulting', 'handsOn', 'squad']
+
+
+@pytest.fixture(scope='module')
+def rt(stub_globals):
+    return importlib.import_module('omni_models.analytics.revenue_tracking')
+
+
+def build_fixture(make_timesheet, seed=7, number_of_cases=12, number_of_rows=1500):
+    rnd = random.Random(seed)
+    account_managers = [SimpleNamespace(name='Ana', slug='ana'), SimpleNamespace(name='Bruno', slug='bruno'), None]
+    clients = {
+        f'c{i}': SimpleNamespace(id=f'c{i}', name=f'Client {i % 4}', slug=f'client-{i}', account_manager=account_managers[i % 3])
+        for i in range(6)
+    }
+    workers = {f'Worker {i}': SimpleNamespace(name=f'Worker {i}', slug=f'worker-{i}') for i in range(8)}
+    workers.update({am.name: am for am in account_managers if am})
+
+    cases = {}
+    for i in range(number_of_cases):
+        projects = [
+            SimpleNamespace(
+                id=f'p{i}-{j}',
+                name=f'Project {i}-{j}',
+                kind=rnd.choice(KINDS),
+                rate=SimpleNamespace(rate=rnd.choice([12000, 18000])) if rnd.random() < .6 else None,
+                billing=SimpleNamespace(fee=rnd.choice([800000, 2400000])) if rnd.random() < .7 else None,
+                budget=SimpleNamespace(period=rnd.choice(['general', 'month', 'month']), budget=480 * 3600) if rnd.random() < .7 else None,
+                created_at=date(2023, 1, 1),
+                due_on=rnd.choice([None, date(2024, 3, 10)])
+            )
+            for j in range(rnd.randint(1, 3))
+        ]
+        client_id = rnd.choice([None] + list(clients))
+        cases[str(i)] = SimpleNamespace(
+            id=str(i),
+            title=f'Case {i}',
+            slug=f'case-{i}',
+            sponsor=rnd.choice([None, 'Sponsor A', 'Sponsor B']),
+            client_id=client_id,
+            is_active=rnd.random() < .8,
+            start_of_contract=rnd.choice([date(2024, 1, 1), date(2024, 3, 5)]),
+            end_of_contract=rnd.choice([None, date(2024, 3, 20), date(2024, 12, 31)]),
+            pre_contracted_value=rnd.random() < .2,
+            tracker_info=projects,
+            find_client_name=lambda repository, client_id=client_id: repository.get_by_id(client_id).name if client_id else 'No client associated'
+        )
+
+    projects = {project.id: case for case in cases.values() for project in case.tracker_info}
+    df = make_timesheet(
+        seed, ['ProjectId', 'WorkerName', 'Kind', 'TimeInHs', 'Revenue'], rows=number_of_rows,
+        first=date(2024, 3, 1), last=date(2024, 3, 31),
+        ProjectId=list(projects),
+        WorkerName=[f'Worker {i}' for i in range(8)],
+        TimeInHs=[0.5, 1.0, 1.5, 2.0, 7.9],
+        Revenue=[0.0, 90.1, 180.25, 270.3]
+    )
+    account_managers = {
+        project_id: client.account_manager if client else None
+        for project_id, case in projects.items()
+        for client in [clients.get(case.client_id)]
+    }
+    df['AccountManagerName'] = [am.name if am else 'N/A' for am in map(account_managers.get, df['ProjectId'])]
+    df['AccountManagerSlug'] = [am.slug if am else 'N/A' for am in map(account_managers.get, df['ProjectId'])]
+    df = df.astype({'ProjectId': 'category', 'WorkerName': 'category', 'Kind': 'category'})
+
+    models = SimpleNamespace(
+        cases=SimpleNamespace(get_all=lambda: cases),
+        clients=SimpleNamespace(
+            get_by_id=clients.get,
+            get_by_name=lambda name: next((c for c in clients.values() if c.name == name), None)
+        ),
+        workers=SimpleNamespace(get_by_name=workers.get)
+    )
+    return models, df
+
+
+def reference_base(df, date_of_interest, process_project, account_manager_name_or_slug=None):
+    """The nested-loop tree builder the rollup replaced, kept as the oracle"""
+    rt = importlib.import_module('omni_models.analytics.revenue_tracking')
+    first_day_of_month = get_first_day_of_month(date_of_interest)
+    last_day_of_month = get_last_day_of_month(date_of_interest)
+    
+    current_day = first_day_of_month
+    daily = []
+    while current_day <= last_day_of_month:
+        daily.append(rt.RevenueTrackingDaily(
+            date=current_day.date()
+        ))
+        current_day = current_day + timedelta(days=1)
+        
+    def update_daily_values(project_df, project_fee, daily_records):
+        if len(project_df) > 0 and "Date" in project_df.columns:
+            daily_data = project_df.groupby("Date", observed=True).agg({
+                "TimeInHs": "sum",
+                "Revenue": "sum" if "Revenue" in project_df.columns else None
+            }).reset_index()
+            
+            for _, row in daily_data.iterrows():
+                date_value = row["Date"].date() if hasattr(row["Date"], 'date') else row["Date"]
+                first_day = first_day_of_month.date() if hasattr(first_day_of_month, 'date') else first_day_of_month
+                day_index = (date_value - first_day).days
+                if 0 <= day_index < len(daily_records):
+                    daily_records[day_index].total_consulting_hours += row["TimeInHs"]
+                    if "Revenue" in row:
+                        daily_records[day_index].total_consulting_fee += row["Revenue"]
+                    elif project_fee:
+                        # Distribute fixed fee proportionally to hours
+                        total_hours = project_df["TimeInHs"].sum()
+                        if total_hours > 0:
+                            daily_records[day_index].total_consulting_fee += (project_fee * row["TimeInHs"] / total_hours)
+        
+    pro_rata_info = rt.RevenueTrackingProRataInfo(by_kind=[])
+        
+    df = df[df["Kind"] != rt.INTERNAL_KIND] if len(df) > 0 else df
+    
+    if account_manager_name_or_slug and len(df) > 0:
+        df_ = df[df["AccountManagerName"] == account_manager_name_or_slug]
+        if len(df_) == 0:
+            df_ = df[df["AccountManagerSlug"] == account_manager_name_or_slug]
+        df = df_
+        
+    doi = date_of_interest.date() if hasattr(date_of_interest, 'date') else date_of_interest
+    active_cases = [
+        case
+        for case in rt.globals.omni_models.cases.get_all().values()
+        if (
+            case.is_active
+            or (
+                (case.end_of_contract and case.end_of_contract >= doi) and
+                (not case.start_of_contract or case.start_of_contract <= doi)
+            ) 
+        )
+    ]
+    
+    account_managers = sorted(set(
+        client.account_manager.name
+        for case in active_cases
+        if case.client_id
+        for client in [rt.globals.omni_models.clients.get_by_id(case.client_id)]
+        if client and client.account_manager
+    ))
+    
+    by_account_manager = []
+    for account_manager_name in account_managers:
+        by_client = []
+        
+        client_names = sorted(set(
+            case.find_client_name(rt.globals.omni_models.clients)
+            for case in active_cases
+            if case.client_id
+            and rt.globals.omni_models.clients.get_by_id(case.client_id).account_manager
+            and rt.globals.omni_models.clients.get_by_id(case.client_id).account_manager.name == account_manager_name
+        ))
+        
+        for client_name in client_names:
+            sponsors_names = sorted(set(
+                case.sponsor if case.sponsor else rt.NA_VALUE
+                for case in active_cases
+                if case.find_client_name(rt.globals.omni_models.clients) == client_name
+            ))
+            
+            by_sponsor = []
+            for sponsor_name in sponsors_names:
+                by_case = []
+                for case in active_cases:
+                    if case.find_client_name(rt.globals.omni_models.clients) == client_name and case.sponsor == sponsor_name:
+                        by_project = []
+                        for project in case.tracker_info:
+                            project_df = df[df["ProjectId"] == project.id] if len(df) > 0 else pd.DataFrame()
+                            project_data = process_project(date_of_interest, case, project, project_df, df, pro_rata_info)
+                            if project_data:
+                                by_project.append(project_data)
+                                if project.kind == "consulting":
+                                    update_daily_values(project_df, project_data.fee, daily)
+                    
+                        if len(by_project) > 0:
+                            case_ = rt.RevenueTrackingCase(
+                                title=case.title,
+                                slug=case.slug,
+                                fee=sum(project.fee for project in by_project),
+                                consulting_hours=sum(project.hours for project in by_project if project.kind == "consulting"),
+                                consulting_fee=sum(project.fee for project in by_project if project.kind == "consulting"),
+                                consulting_fee_new=sum(project.fee for project in by_project if project.kind == "consulting" and case.start_of_contract and case.start_of_contract.year == date_of_interest.year and case.start_of_contract.month == date_of_interest.month),
+                                consulting_pre_hours=sum(project.hours for project in by_project if project.kind == "consulting" and project.fixed),
+                                consulting_pre_fee=sum(project.fee for project in by_project if project.kind == "consulting" and project.fixed),
+                                hands_on_fee=sum(project.fee for project in by_project if project.kind == "handsOn"),
+                                squad_fee=sum(project.fee for project in by_project if project.kind == "squad"),
+                                by_project=sorted(by_project, key=lambda x: x.name),
+                                partial=any(hasattr(project, 'partial') and project.partial for project in by_project)
+                            )
+                            by_case.append(case_)
+                
+                if len(by_case) > 0:
+                    sponsor_ = rt.RevenueTrackingSponsor(
+                        name=sponsor_name,
+                        slug=slugify(sponsor_name),
+                        by_case=by_case,
+                        fee=sum(case.fee for case in by_case),
+                        consulting_fee_new=sum(case.consulting_fee_new for case in by_case),
+                        consulting_hours=sum(case.consulting_hours for case in by_case),
+                        consulting_pre_hours=sum(case.consulting_pre_hours for case in by_case),
+                        consulting_fee=sum(case.consulting_fee for case in by_case),
+                        consulting_pre_fee=sum(case.consulting_pre_fee for case in by_case),
+                        hands_on_fee=sum(case.hands_on_fee for case in by_case),
+                        squad_fee=sum(case.squad_fee for case in by_case),
+                        partial=any(case.partial for case in by_case)
+                    )
+                    by_sponsor.append(sponsor_)
+            
+            if len(by_sponsor) > 0:
+                client = rt.globals.omni_models.clients.get_by_name(client_name)
+                client_ = rt.RevenueTrackingClientBase(
+                    name=client_name,
+                    slug=client.slug if client else None,
+                    by_sponsor=by_sponsor,
+                    fee=sum(sponsor.fee for sponsor in by_sponsor),
+                    consulting_hours=sum(sponsor.consulting_hours for sponsor in by_sponsor),
+                    consulting_fee=sum(sponsor.consulting_fee for sponsor in by_sponsor),
+                    consulting_pre_hours=sum(sponsor.consulting_pre_hours for sponsor in by_sponsor),
+                    consulting_fee_new=sum(sponsor.consulting_fee_new for sponsor in by_sponsor),
+                    consulting_pre_fee=sum(sponsor.consulting_pre_fee for sponsor in by_sponsor),
+                    hands_on_fee=sum(sponsor.hands_on_fee for sponsor in by_sponsor),
+                    squad_fee=sum(sponsor.squad_fee for sponsor in by_sponsor),
+                    partial=any(sponsor.partial for sponsor in by_sponsor)
+                )
+                by_client.append(client_)
+        
+        if len(by_client) > 0:
+            account_manager_ = rt.RevenueTrackingAccountManagerBase(
+                name=account_manager_name,
+                slug=account_manager_name,
+                by_client=by_client,
+                fee=sum(client.fee for client in by_client),
+                consulting_hours=sum(client.consulting_hours for client in by_client),
+                consulting_pre_hours=sum(client.consulting_pre_hours for client in by_client),
+                consulting_fee=sum(client.consulting_fee for client in by_client),
+                consulting_fee_new=sum(client.consulting_fee_new for client in by_client),
+                consulting_pre_fee=sum(client.consulting_pre_fee for client in by_client),
+                hands_on_fee=sum(client.hands_on_fee for client in by_client),
+                squad_fee=sum(client.squad_fee for client in by_client),
+                partial=any(client.partial for client in by_client)
+            )
+            by_account_manager.append(account_manager_)
+    monthly = rt.RevenueTrackingMonthly(
+        total=sum(account_manager.fee for account_manager in by_account_manager),
+        total_consulting_fee=sum(account_manager.consulting_fee for account_manager in by_account_manager),
+        total_consulting_fee_new=sum(account_manager.consulting_fee_new for account_manager in by_account_manager),
+        total_consulting_pre_fee=sum(account_manager.consulting_pre_fee for account_manager in by_account_manager),
+        total_consulting_hours=sum(account_manager.consulting_hours for account_manager in by_account_manager),
+        total_consulting_pre_hours=sum(account_manager.consulting_pre_hours for account_manager in by_account_manager),
+        total_hands_on_fee=sum(account_manager.hands_on_fee for account_manager in by_account_manager),
+        total_squad_fee=sum(account_manager.squad_fee for account_manager in by_account_manager),
+        by_account_manager=by_account_manager
+    )
+    
+    return rt.RevenueTrackingBase(monthly=monthly, daily=daily), pro_rata_info
+
+
+@pytest.fixture
+def models(rt, make_timesheet, monkeypatch):
+    models, df = build_fixture(make_timesheet)
+    monkeypatch.setattr(rt.globals, 'omni_models', models, raising=False)
+    return df
+
+
+def _dump(result):
+    if isinstance(result, tuple):
+        return [part.model_dump() for part in result]
+    return result.model_dump()
+
+
+@pytest.mark.parametrize('compute', ['compute_regular_revenue_tracking', 'compute_pre_contracted_revenue_tracking'])
+@pytest.mark.parametrize('day', [1, 9, 15, 20, 31])
+@pytest.mark.parametrize('account_manager', [None, 'Ana', 'bruno', 'Nobody'])
+def test_rollup_matches_nested_loops(rt, models, monkeypatch, compute, day, account_manager):
+    date_of_interest = date(2024, 3, day)
+    df = models[models['Date'] <= date_of_interest]
+    compute = getattr(rt, compute)
+
+    actual = _dump(compute(df, date_of_interest, account_manager))
+    monkeypatch.setattr(rt, '_compute_revenue_tracking_base', reference_base)
+    expected = _dump(compute(df, date_of_interest, account_manager))
+
+    assert actual == expected
+
+
+def test_rollup_handles_an_empty_timesheet(rt, models, monkeypatch):
+    date_of_interest = date(2024, 3, 31)
+    empty = models.iloc[0:0]
+
+    actual = _dump(rt.compute_pre_contracted_revenue_tracking(empty, date_of_interest))
+    monkeypatch.setattr(rt, '_compute_revenue_tracking_base', reference_base)
+    expected = _dump(rt.compute_pre_contracted_revenue_tracking(empty, date_of_interest))
+
+    assert actual == expected
+
+
+def test_split_by_keeps_first_appearance_order(rt):
+    df = pd.DataFrame({'WorkerName': pd.Categorical(['b', 'a', 'b', 'c']), 'TimeInHs': [1.0, 2.0, 3.0, 4.0]})
+    parts = rt._split_by(df, 'WorkerName')
+    assert list(parts) == ['b', 'a', 'c']
+    assert parts['b']['TimeInHs'].tolist() == [1.0, 3.0]
@@ -0,0 +1,137 @@
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from omni_models.datasets.timesheet_dataset.models.disk_cache import TimesheetDiskCache
+
+
+def chunk_paths(partition):
+    return sorted(path for path in partition.rglob('*.chunk'))
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return TimesheetDiskCache(tmp_path, 'api-key')
+
+
+def build_month(hours=1.5):
+    return pd.DataFrame({
+        'Id': np.arange(4, dtype='int64'),
+        'Date': [date(2024, 1, day) for day in (2, 2, 3, 31)],
+        'CreatedAt': pd.to_datetime(['2024-01-02 10:00', '2024-01-02 11:30', '2024-01-04 08:00', '2024-02-01 09:15']),
+        'TimeInHs': [hours, 2.0, np.nan, 0.5],
+        'Kind': pd.Categorical(['Consulting', 'Squad', 'Consulting', 'Internal']),
+        'Comment': ['review', None, 'pairing', None],
+        # Ids of clients, and the marker of cases without one
+        'ClientId': [12, 'N/A', np.int64(7), None]
+    })
+
+
+def test_round_trip(disk):
+    df = build_month()
+    disk.save(df, 'jan_2024')
+
+    loaded = disk.load('jan_2024').data
+
+    pd.testing.assert_frame_equal(loaded.drop(columns='ClientId'), df.drop(columns='ClientId'))
+    assert loaded['ClientId'].tolist() == [12, 'N/A', 7, None]
+    assert disk.columns('jan_2024') == list(df.columns)
+
+
+def test_loads_only_the_requested_columns(disk):
+    disk.save(build_month(), 'jan_2024')
+
+    assert list(disk.load('jan_2024', columns=['TimeInHs', 'Kind']).data.columns) == ['TimeInHs', 'Kind']
+
+
+def test_partitions_are_encrypted_with_the_key(disk, tmp_path):
+    disk.save(build_month(), 'jan_2024')
+    chunks = b''.join(path.read_bytes() for path in (tmp_path / 'jan_2024').rglob('*') if path.is_file())
+
+    assert b'pairing' not in chunks and b'Consulting' not in chunks
+    assert TimesheetDiskCache(tmp_path, 'other-key').load('jan_2024') is None
+
+
+def test_tampered_chunks_are_not_loaded(disk, tmp_path):
+    disk.save(build_month(), 'jan_2024')
+    chunk = chunk_paths(tmp_path / 'jan_2024')[3]
+    chunk.write_bytes(chunk.read_bytes()[:-4] + b'AAAA')
+
+    assert disk.load('jan_2024') is None
+    assert disk.load('jan_2024', columns=['Id']) is not None
+
+
+def test_saving_again_replaces_the_partition(disk, tmp_path):
+    disk.save(build_month(hours=1.5), 'jan_2024')
+    disk.save(build_month(hours=6.0).drop(columns='Comment'), 'jan_2024')
+
+    loaded = disk.load('jan_2024').data
+    assert loaded['TimeInHs'].iloc[0] == 6.0
+    assert 'Comment' not in loaded.columns
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['jan_2024']
+    # Only the manifest and the generation it points at are left
+    assert len([path for path in (tmp_path / 'jan_2024').iterdir() if path.is_dir()]) == 1
+    assert len(chunk_paths(tmp_path / 'jan_2024')) == 6
+
+
+def test_an_interrupted_first_save_is_not_listed(disk, tmp_path):
+    disk.save(build_month(), 'facts_2024_01')
+    (tmp_path / 'facts_2024_01' / 'manifest').unlink()
+    disk.save(build_month(), 'facts_2024_03')
+
+    assert disk.names('facts_') == ['facts_2024_03']
+    assert not disk.exists('facts_2024_01')
+
+    disk.save(build_month(hours=3.0), 'facts_2024_01')
+    assert disk.names('facts_') == ['facts_2024_01', 'facts_2024_03']
+    assert disk.load('facts_2024_01').data['TimeInHs'].iloc[0] == 3.0
+
+
+def test_a_reader_of_a_replaced_generation_reads_the_new_one(disk, monkeypatch):
+    disk.save(build_month(hours=1.5), 'jan_2024')
+    read_manifest = disk._read_manifest
+    stale = read_manifest('jan_2024')
+    disk.save(build_month(hours=6.0), 'jan_2024')
+
+    # The first manifest read predates the save; the chunks it names are gone
+    manifests = iter([stale])
+    monkeypatch.setattr(disk, '_read_manifest', lambda filename: next(manifests, None) or read_manifest(filename))
+
+    assert disk.load('jan_2024').data['TimeInHs'].iloc[0] == 6.0
+
+
+def test_partitions_saved_before_generations_are_read_and_replaced(disk, tmp_path):
+    disk.save(build_month(hours=1.5), 'jan_2024')
+    partition = tmp_path / 'jan_2024'
+    generation = next(path for path in partition.iterdir() if path.is_dir())
+    for chunk in generation.iterdir():
+        chunk.rename(partition / chunk.name)
+    generation.rmdir()
+    manifest = disk._read_manifest('jan_2024')
+    del manifest['generation']
+    (partition / 'manifest').write_bytes(disk.fernet.encrypt(json.dumps(manifest).encode()))
+
+    assert disk.load('jan_2024').data['TimeInHs'].iloc[0] == 1.5
+
+    disk.save(build_month(hours=6.0), 'jan_2024')
+    assert disk.load('jan_2024').data['TimeInHs'].iloc[0] == 6.0
+    assert not list(partition.glob('*.chunk'))
+
+
+def test_values_with_no_arrow_or_json_type_are_rejected(disk, tmp_path):
+    disk.save(build_month(hours=1.5), 'jan_2024')
+    mixed = build_month(hours=9.0).assign(ClientId=[12, 'N/A', datetime(2024, 1, 3), None])
+
+    with pytest.raises(TypeError, match='ClientId'):
+        disk.save(mixed, 'jan_2024')
+
+    assert disk.load('jan_2024').data['TimeInHs'].iloc[0] == 1.5
+    assert disk.names() == ['jan_2024']
+    assert len(chunk_paths(tmp_path / 'jan_2024')) == 7
+
+    with pytest.raises(TypeError):
+        disk.save(mixed, 'feb_2024')
+    assert not (tmp_path / 'feb_2024').exists()
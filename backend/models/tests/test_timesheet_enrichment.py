@@ -0,0 +1,179 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from omni_utils.helpers.slug import slugify
+
+from omni_models.datasets.timesheet_dataset.models.enrichment import TimesheetEnrichment
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+
+
+def build_models(rnd):
+    """Workers, cases, clients and offers where some of the references lead nowhere"""
+    account_managers = [SimpleNamespace(name='Ana', slug='ana'), None]
+    offers = {i: SimpleNamespace(name=f'Offer {i}') for i in range(4)}
+    clients = {
+        i: SimpleNamespace(id=i, name=f'Client {i}', slug=f'client-{i}', omni_url=f'/clients/{i}', account_manager=account_managers[i % 2])
+        for i in range(5)
+    }
+    cases = {
+        f'ev:{i}': SimpleNamespace(
+            id=f'c{i}', title=f'Case {i}', slug=f'case-{i}', omni_url=f'/cases/{i}',
+            sponsor=rnd.choice([None, 'Sponsor A', 'Sponsor B']),
+            client_id=rnd.choice([None, *clients, 99]),
+            offers_ids=rnd.sample([*offers, 42], rnd.randint(0, 3))
+        )
+        for i in range(8)
+    }
+    workers = {i: SimpleNamespace(name=f'Worker {i}', slug=f'worker-{i}', omni_url=rnd.choice([None, f'/workers/{i}'])) for i in range(6)}
+    projects = {
+        f'ev:{i}': SimpleNamespace(billing=rnd.choice([None, SimpleNamespace(type='fixed_fee', fee=rnd.randint(1, 9) * 1000)]))
+        for i in range(10)
+    }
+    return SimpleNamespace(
+        workers=SimpleNamespace(get_by_everhour_id=workers.get),
+        cases=SimpleNamespace(get_by_everhour_project_id=cases.get),
+        clients=SimpleNamespace(get_by_id=clients.get),
+        products_or_services=SimpleNamespace(get_by_id=offers.get),
+        tracker=SimpleNamespace(all_projects=projects)
+    )
+
+
+def build_appointments(rnd, rows=300):
+    return pd.DataFrame({
+        'id': np.arange(rows, dtype='int64'),
+        'date': pd.to_datetime([f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}' for _ in range(rows)]),
+        'user_id': np.array([rnd.randint(0, 8) for _ in range(rows)], dtype='int64'),
+        'project_id': [f'ev:{rnd.randint(0, 11)}' for _ in range(rows)],
+        'time_in_hs': [rnd.choice([0.5, 1.0, 2.0]) for _ in range(rows)]
+    })
+
+
+def baseline_enrich(models, df):
+    """The per-key masked enrichment the joins replaced, kept as the oracle"""
+    workers_cache = {user_id: models.workers.get_by_everhour_id(user_id) for user_id in df['user_id'].unique()}
+    cases_cache = {project_id: models.cases.get_by_everhour_project_id(project_id) for project_id in df['project_id'].unique()}
+    eh_projects_cache = models.tracker.all_projects
+    clients_cache = {}
+    offers_cache = {}
+    for case in cases_cache.values():
+        if case:
+            if case.client_id:
+                clients_cache[case.client_id] = models.clients.get_by_id(case.client_id)
+            for offer_id in case.offers_ids:
+                offer = models.products_or_services.get_by_id(offer_id)
+                offers_cache[offer_id] = offer.name if offer else None
+
+    n_rows = len(df)
+    client_fields = ['client_id', 'client_name', 'client_slug', 'client_omni_url', 'client', 'account_manager_name', 'account_manager_slug']
+    client_data = {field: np.full(n_rows, "N/A", dtype=object) for field in client_fields}
+
+    date_series = pd.to_datetime(df['date'])
+    df = df.assign(
+        date=date_series.dt.date,
+        day_of_week=date_series.dt.strftime('%A'),
+        n_day_of_week=date_series.dt.weekday.apply(lambda x: (x + 1) % 7),
+        month=date_series.dt.strftime('%B'),
+        year=date_series.dt.strftime('%Y'),
+        year_month=date_series.dt.strftime('%Y-%m')
+    )
+
+    project_ids = df['project_id'].values
+    user_ids = df['user_id'].values
+
+    billing_type = np.full(n_rows, None, dtype=object)
+    billing_fee = np.full(n_rows, None, dtype=object)
+    for pid in np.unique(project_ids):
+        mask = project_ids == pid
+        project = eh_projects_cache.get(pid)
+        if project and project.billing:
+            billing_type[mask] = project.billing.type
+            billing_fee[mask] = project.billing.fee
+    df['billing_type'] = billing_type
+    df['billing_fee'] = billing_fee
+
+    worker_data = {field: np.full(n_rows, None, dtype=object) for field in ['worker_name', 'worker_slug', 'worker_omni_url']}
+    for uid in np.unique(user_ids):
+        mask = user_ids == uid
+        worker = workers_cache.get(uid)
+        if worker:
+            worker_data['worker_name'][mask] = worker.name
+            worker_data['worker_slug'][mask] = worker.slug
+            worker_data['worker_omni_url'][mask] = worker.omni_url
+    df = df.assign(**worker_data)
+
+    valid_worker_mask = df['worker_name'].notna() & df['worker_omni_url'].notna()
+    df['worker'] = None
+    df.loc[valid_worker_mask, 'worker'] = (
+        '<a href="' + df.loc[valid_worker_mask, 'worker_omni_url'] + '">' + df.loc[valid_worker_mask, 'worker_name'] + '</a>'
+    )
+
+    case_data = {field: np.full(n_rows, "N/A", dtype=object) for field in ['case_id', 'case_title', 'case_slug', 'sponsor', 'case_omni_url']}
+    for pid in np.unique(project_ids):
+        mask = project_ids == pid
+        case = cases_cache.get(pid)
+        if case:
+            case_data['case_id'][mask] = case.id
+            case_data['case_title'][mask] = case.title
+            case_data['case_slug'][mask] = case.slug
+            case_data['sponsor'][mask] = case.sponsor or "N/A"
+            case_data['case_omni_url'][mask] = case.omni_url
+            if case.client_id:
+                client = clients_cache.get(case.client_id)
+                if client:
+                    client_data['client_id'][mask] = client.id
+                    client_data['client_name'][mask] = client.name
+                    client_data['client_slug'][mask] = client.slug
+                    client_data['client_omni_url'][mask] = client.omni_url
+                    client_data['client'][mask] = f"<a href='{client.omni_url}'>{client.name}</a>"
+                    if client.account_manager:
+                        client_data['account_manager_name'][mask] = client.account_manager.name
+                        client_data['account_manager_slug'][mask] = client.account_manager.slug
+    df = df.assign(**case_data)
+    df = df.assign(**client_data)
+
+    df['sponsor_slug'] = np.vectorize(slugify)(df['sponsor'].values)
+
+    products = np.full(n_rows, "N/A", dtype=object)
+    for pid in np.unique(project_ids):
+        mask = project_ids == pid
+        case = cases_cache.get(pid)
+        if case:
+            products[mask] = ';'.join(filter(None, [offers_cache.get(oid) for oid in case.offers_ids]))
+    df['products_or_services'] = products
+
+    return df
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_enrichment_matches_the_masked_enrichment(seed):
+    rnd = random.Random(seed)
+    models = build_models(rnd)
+    df = build_appointments(rnd)
+
+    expected = baseline_enrich(models, df)
+    actual = TimesheetEnrichment(models).enrich(df)
+
+    # The links are derived by the schema now, from the columns they were built from
+    links = pd.DataFrame({
+        'WorkerName': actual['worker_name'], 'WorkerOmniUrl': actual['worker_omni_url'],
+        'ClientName': actual['client_name'], 'ClientOmniUrl': actual['client_omni_url']
+    })
+    assert TIMESHEET_SCHEMA.derived['Worker'](links).tolist() == expected['worker'].tolist()
+    assert TIMESHEET_SCHEMA.derived['Client'](links).tolist() == expected['client'].tolist()
+
+    expected = expected.drop(columns=['worker', 'client'])
+    assert sorted(actual.columns) == sorted(expected.columns)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected)
+
+
+def test_enrichment_keeps_the_rows_in_order():
+    rnd = random.Random(3)
+    df = build_appointments(rnd)
+
+    actual = TimesheetEnrichment(build_models(rnd)).enrich(df)
+
+    assert actual['id'].tolist() == df['id'].tolist()
+    assert actual.index.equals(pd.RangeIndex(len(df)))
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.disk_cache import TimesheetDiskCache
+from omni_models.datasets.timesheet_dataset.models.facts import FACT_DIMENSIONS, TimesheetFacts
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+
+JANUARY = pd.Timestamp(2024, 1, 1).to_pydatetime(), pd.Timestamp(2024, 1, 31, 23, 59, 59).to_pydatetime()
+
+
+class FakeModels:
+    """Appointments of January, enriched with whatever client name the models hold"""
+
+    def __init__(self, client_name):
+        self.client_name = client_name
+        self.loads = 0
+
+    def load(self, after, before):
+        self.loads += 1
+        df = pd.DataFrame({
+            'Date': [date(2024, 1, 2), date(2024, 1, 2), date(2024, 1, 3)],
+            'ProjectId': ['p1', 'p1', 'p2'],
+            'WorkerName': ['Ana'] * 3,
+            **{column: ['x'] * 3 for column in FACT_DIMENSIONS},
+            'TimeInHs': [1.0, 2.5, 4.0],
+            'Revenue': [100.0, 250.0, 0.0]
+        })
+        df['ClientName'] = self.client_name
+        return SummarizablePowerDataFrame(TIMESHEET_SCHEMA.apply(df), schema=TIMESHEET_SCHEMA)
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return TimesheetDiskCache(tmp_path, 'api-key')
+
+
+def test_facts_sum_each_key_of_a_closed_month(disk):
+    facts = TimesheetFacts(disk, FakeModels('Client').load, lookback_days=7).get(*JANUARY).data
+
+    assert facts[['ProjectId', 'TimeInHs', 'Revenue']].astype({'ProjectId': str}).values.tolist() == [
+        ['p1', 3.5, 350.0],
+        ['p2', 4.0, 0.0]
+    ]
+
+
+def test_cleared_facts_are_rebuilt_with_the_current_models(disk):
+    before = FakeModels('Old name')
+    TimesheetFacts(disk, before.load, lookback_days=7).get(*JANUARY)
+
+    # A rebuilt dataset reads what the previous models persisted until the facts are cleared
+    after = FakeModels('New name')
+    facts = TimesheetFacts(disk, after.load, lookback_days=7)
+    assert set(facts.get(*JANUARY).data['ClientName']) == {'Old name'}
+    assert after.loads == 0
+
+    facts.clear()
+
+    assert disk.names('facts_') == []
+    assert set(facts.get(*JANUARY).data['ClientName']) == {'New name'}
+    assert after.loads == 1
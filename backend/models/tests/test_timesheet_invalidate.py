@@ -0,0 +1,85 @@
+import logging
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.memory_cache import TimesheetMemoryCache
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+from omni_models.datasets.timesheet_dataset.models.sync import TimesheetSyncEngine
+
+JANUARY = datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59)
+
+
+class FakeEverhour:
+    """January's appointments, one per day, all created on the 31st"""
+
+    def __init__(self):
+        self.hours = {day: 1.0 for day in range(1, 32)}
+        self.fetches = []
+
+    def fetch(self, after, before):
+        self.fetches.append((after.date(), before.date()))
+        days = [day for day in self.hours if after.date() <= date(2024, 1, day) <= before.date()]
+        df = pd.DataFrame({
+            'Id': [f'a{day}' for day in days],
+            'Date': [date(2024, 1, day) for day in days],
+            'CreatedAt': [datetime(2024, 1, 31)] * len(days),
+            'WorkerName': ['Ana'] * len(days),
+            'TimeInHs': [self.hours[day] for day in days]
+        })
+        return SummarizablePowerDataFrame(TIMESHEET_SCHEMA.apply(df), schema=TIMESHEET_SCHEMA)
+
+
+@pytest.fixture(scope='module')
+def dataset_class(stub_globals):
+    from omni_models.datasets.timesheet_dataset.main import TimesheetDataset
+    return TimesheetDataset
+
+
+@pytest.fixture
+def everhour():
+    return FakeEverhour()
+
+
+@pytest.fixture
+def dataset(dataset_class, everhour, shared_cache):
+    """A dataset over the fake API, without the disk partitions and facts that need a key"""
+    dataset = dataset_class.__new__(dataset_class)
+    dataset.logger = logging.getLogger('test')
+    dataset.sync = TimesheetSyncEngine(everhour.fetch, lookback_days=7, full_sync_interval=timedelta(days=1), schema=TIMESHEET_SCHEMA)
+    dataset.memory = TimesheetMemoryCache(on_evict=dataset.sync.forget)
+    dataset.open_month_refresh = timedelta(minutes=5)
+    dataset.facts = SimpleNamespace(invalidate=lambda after, before: None)
+    dataset.version = 0
+    dataset.month_versions = {}
+    dataset._load_from_disk = lambda after, before: None
+    return dataset
+
+
+def test_get_after_invalidate_sees_edits_older_than_the_lookback(dataset, everhour):
+    assert dataset.get(*JANUARY).data['TimeInHs'].sum() == 31
+
+    everhour.hours[2] = 5.0
+    dataset.invalidate(*JANUARY)
+
+    df = dataset.get(*JANUARY).data
+    assert df.loc[df['Date'] == date(2024, 1, 2), 'TimeInHs'].tolist() == [5.0]
+    assert everhour.fetches == [(date(2024, 1, 1), date(2024, 1, 31))] * 2
+
+
+def test_invalidate_refetches_only_from_the_first_invalidated_day(dataset, everhour):
+    february = datetime(2024, 2, 1), datetime(2024, 2, 29, 23, 59, 59)
+    dataset.get(*JANUARY)
+    dataset.get(*february)
+
+    everhour.hours[10] = 3.0
+    dataset.invalidate(date(2024, 1, 10), date(2024, 1, 12))
+
+    assert [state.stale_from for state in dataset.sync.states.values()] == [date(2024, 1, 10), None]
+    df = dataset.get(*JANUARY).data
+    assert df.loc[df['Date'] == date(2024, 1, 10), 'TimeInHs'].tolist() == [3.0]
+    assert len(df) == 31
+    assert everhour.fetches[-1] == (date(2024, 1, 10), date(2024, 1, 31))
@@ -0,0 +1,135 @@
+import calendar
+import time
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.memory_cache import TimesheetMemoryCache
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+
+
+def bounds(month, first=1, last=None):
+    last = last or calendar.monthrange(2024, month)[1]
+    return datetime(2024, month, first), datetime(2024, month, last, 23, 59, 59)
+
+
+@pytest.fixture
+def partition(make_timesheet):
+    def partition(month, first=1, last=None):
+        """A cached range: appointments on every day from `first` to `last` of a month of 2024"""
+        after, before = bounds(month, first, last)
+        df = make_timesheet(month * 100 + first, ['Kind', 'WorkerName'], rows=120, first=after.date(), last=before.date())
+        return after, before, SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA)
+    return partition
+
+
+def days(result):
+    return sorted(set(result.data['Date']))
+
+
+def test_a_range_inside_an_entry_is_sliced_from_it(partition):
+    cache = TimesheetMemoryCache()
+    cache.add(*partition(1))
+
+    result = cache.get(datetime(2024, 1, 10), datetime(2024, 1, 20, 23, 59))
+
+    assert days(result)[0] >= date(2024, 1, 10) and days(result)[-1] <= date(2024, 1, 20)
+    assert len(result.data) == sum(date(2024, 1, 10) <= day <= date(2024, 1, 20) for day in cache.entries[0].result.data['Date'])
+    assert isinstance(result.data['Kind'].dtype, pd.CategoricalDtype)
+
+
+def test_a_range_is_stitched_from_adjacent_entries(partition):
+    cache = TimesheetMemoryCache()
+    entries = [partition(1, 1, 15), partition(1, 16), partition(2)]
+    for entry in entries:
+        cache.add(*entry)
+
+    result = cache.get(datetime(2024, 1, 10), datetime(2024, 2, 5, 23, 59))
+
+    expected = sum(
+        date(2024, 1, 10) <= day <= date(2024, 2, 5)
+        for _, _, stored in entries
+        for day in stored.data['Date']
+    )
+    assert len(result.data) == expected
+    assert cache.hits == 1 and [entry.hits for entry in cache.entries] == [1, 1, 1]
+
+
+def test_a_range_with_a_gap_misses(partition):
+    cache = TimesheetMemoryCache()
+    cache.add(*partition(1))
+    cache.add(*partition(3))
+
+    assert cache.get(datetime(2024, 1, 20), datetime(2024, 3, 5)) is None
+    assert cache.get(*bounds(4)) is None
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert [entry.misses for entry in cache.entries] == [1, 1]
+
+
+def test_a_newer_entry_supersedes_the_ones_it_covers(partition):
+    cache = TimesheetMemoryCache()
+    cache.add(*partition(1, 1, 10))
+    cache.add(*partition(1, 11, 20))
+    cache.add(*partition(2))
+
+    cache.add(*partition(1))
+
+    assert [(entry.start, entry.end) for entry in cache.entries] == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29))
+    ]
+    assert cache.nbytes == sum(entry.nbytes for entry in cache.entries)
+
+
+def test_least_recently_used_entries_are_evicted(partition):
+    evicted = []
+    months = [partition(month) for month in (1, 2, 3, 4)]
+    cache = TimesheetMemoryCache(on_evict=lambda after, before: evicted.append(after.month))
+    cache.add(*months[0])
+    cache.max_bytes = int(cache.nbytes * 2.5)
+
+    time.sleep(0.001)
+    cache.add(*months[1])
+    time.sleep(0.001)
+    cache.get(*bounds(1))
+    time.sleep(0.001)
+    cache.add(*months[2])
+    time.sleep(0.001)
+    cache.add(*months[3])
+
+    assert evicted == [2, 1]
+    assert [entry.start.month for entry in cache.entries] == [3, 4]
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_an_entry_larger_than_the_limit_is_kept(partition):
+    cache = TimesheetMemoryCache(max_bytes=1)
+    cache.add(*partition(1))
+
+    assert len(cache.entries) == 1
+    assert cache.get(*bounds(1)) is not None
+
+
+def test_invalidate_drops_overlapping_entries(partition):
+    cache = TimesheetMemoryCache()
+    for month in (1, 2, 3):
+        cache.add(*partition(month))
+
+    cache.invalidate('2024-02-10', date(2024, 3, 1))
+    assert [entry.start.month for entry in cache.entries] == [1]
+
+    cache.invalidate(None, None)
+    assert cache.entries == [] and cache.nbytes == 0
+
+
+def test_list_cache_lists_the_entries_holding_a_range(partition):
+    cache = TimesheetMemoryCache()
+    cache.add(*partition(1))
+    cache.add(*partition(2))
+
+    listed = cache.list_cache('2024-02-03', '2024-02-04')
+
+    assert [entry['after'] for entry in listed] == [datetime(2024, 2, 1)]
+    assert len(cache.list_cache(None, None)) == 2
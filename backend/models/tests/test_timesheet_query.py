@@ -0,0 +1,101 @@
+import calendar
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.query import TimesheetQueryEngine
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+
+
+class FakeTimesheet:
+    def __init__(self, months):
+        self.months = months
+        self.versions = {month: 0 for month in months}
+        self.loads = []
+
+    def load(self, after, before):
+        self.loads.append((after.year, after.month))
+        df = self.months.get((after.year, after.month), pd.DataFrame())
+        return SummarizablePowerDataFrame(df, schema=TIMESHEET_SCHEMA if len(df.columns) else None)
+
+    def version(self, after, before):
+        return self.versions.get((after.year, after.month), 0)
+
+
+@pytest.fixture
+def timesheet(make_timesheet):
+    return FakeTimesheet({
+        (2024, month): TIMESHEET_SCHEMA.apply(make_timesheet(
+            month, ['Kind', 'CaseId', 'WorkerName'],
+            first=date(2024, month, 1), last=date(2024, month, calendar.monthrange(2024, month)[1])
+        ))
+        for month in (1, 2, 3)
+    })
+
+
+def expected_hours(timesheet, first, last, kind):
+    """Hours per case of a kind, summed row by row"""
+    hours = {}
+    for df in timesheet.months.values():
+        for day, row_kind, case_id, time in zip(df['Date'], df['Kind'], df['CaseId'], df['TimeInHs']):
+            if first <= day <= last and row_kind == kind:
+                case_id = None if pd.isna(case_id) else case_id
+                hours[case_id] = hours.get(case_id, 0) + time
+    return hours
+
+
+@pytest.mark.parametrize('first, last', [
+    (date(2024, 1, 1), date(2024, 3, 31)),
+    (date(2024, 1, 15), date(2024, 2, 10)),
+    (date(2024, 2, 29), date(2024, 2, 29)),
+])
+def test_query_matches_row_by_row_sums(timesheet, first, last):
+    engine = TimesheetQueryEngine(timesheet.load, timesheet.version)
+
+    result = engine.query(
+        "SELECT CaseId, SUM(TimeInHs) AS hours FROM timesheet WHERE Kind = ? GROUP BY CaseId",
+        ['Squad'], after=datetime.combine(first, datetime.min.time()), before=datetime.combine(last, datetime.min.time())
+    )
+
+    actual = {None if pd.isna(case_id) else case_id: hours for case_id, hours in zip(result['CaseId'], result['hours'])}
+    assert actual == pytest.approx(expected_hours(timesheet, first, last, 'Squad'))
+
+
+def test_months_load_once_until_their_version_changes(timesheet):
+    engine = TimesheetQueryEngine(timesheet.load, timesheet.version)
+    sql = "SELECT COUNT(*) AS n FROM timesheet"
+
+    engine.query(sql, after=datetime(2024, 1, 1), before=datetime(2024, 2, 29))
+    engine.query(sql, after=datetime(2024, 2, 1), before=datetime(2024, 2, 29))
+    assert timesheet.loads == [(2024, 1), (2024, 2)]
+
+    timesheet.months[(2024, 2)] = timesheet.months[(2024, 2)].iloc[:10]
+    timesheet.versions[(2024, 2)] += 1
+    assert engine.query(sql, after=datetime(2024, 2, 1), before=datetime(2024, 2, 29))['n'][0] == 10
+    assert timesheet.loads == [(2024, 1), (2024, 2), (2024, 2)]
+
+
+def test_date_filters_prune_months(timesheet):
+    engine = TimesheetQueryEngine(timesheet.load, timesheet.version)
+
+    plan = engine.query(
+        "EXPLAIN SELECT SUM(TimeInHs) FROM timesheet WHERE Date >= ?",
+        [date(2024, 3, 1)], after=datetime(2024, 1, 1), before=datetime(2024, 3, 31)
+    )['explain_value'][0]
+
+    assert plan.count('EMPTY_RESULT') == 2
+    assert 'timesheet_2024_03' in plan
+
+
+def test_empty_months_and_eviction(timesheet):
+    engine = TimesheetQueryEngine(timesheet.load, timesheet.version, max_months=2)
+
+    assert engine.query("SELECT COUNT(*) AS n FROM timesheet", after=datetime(2023, 11, 1), before=datetime(2023, 12, 31))['n'][0] == 0
+    engine.query("SELECT COUNT(*) AS n FROM timesheet", months=[(2024, 1), (2024, 2), (2024, 3)])
+
+    assert list(engine.tables) == [(2024, 2), (2024, 3)]
+    assert engine.query("SELECT COUNT(*) AS n FROM timesheet", months=[])['n'][0] == 0
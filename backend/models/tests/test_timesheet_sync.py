@@ -0,0 +1,173 @@
+import calendar
+import logging
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from omni_models.base.powerdataframe import SummarizablePowerDataFrame
+from omni_models.datasets.timesheet_dataset.models.memory_cache import TimesheetMemoryCache
+from omni_models.datasets.timesheet_dataset.models.schema import TIMESHEET_SCHEMA
+from omni_models.datasets.timesheet_dataset.models.sync import TimesheetSyncEngine
+
+MARCH = datetime(2024, 3, 1), datetime(2024, 3, 31, 23, 59, 59)
+
+
+class FakeEverhour:
+    """Appointments by id, as (work date, creation time, hours); fetches filter by work date only"""
+
+    def __init__(self, appointments):
+        self.appointments = dict(appointments)
+        self.fetches = []
+
+    def fetch(self, after, before):
+        self.fetches.append((after.date(), before.date()))
+        rows = sorted(
+            (id, day, created, hours)
+            for id, (day, created, hours) in self.appointments.items()
+            if after.date() <= day <= before.date()
+        )
+        df = pd.DataFrame(rows, columns=['Id', 'Date', 'CreatedAt', 'TimeInHs'])
+        return SummarizablePowerDataFrame(TIMESHEET_SCHEMA.apply(df), schema=TIMESHEET_SCHEMA)
+
+    def hours(self, after, before):
+        return {
+            id: hours for id, (day, _, hours) in self.appointments.items()
+            if after.date() <= day <= before.date()
+        }
+
+
+def march(day, hours=1.0, created_on=None):
+    """An appointment of a day of March, created on that day unless told otherwise"""
+    created_on = created_on or day
+    return date(2024, 3, day), datetime(2024, 3, created_on, 18), hours
+
+
+def hours_of(result):
+    return dict(zip(result.data['Id'], result.data['TimeInHs']))
+
+
+@pytest.fixture
+def everhour():
+    return FakeEverhour({f'a{day}': march(day) for day in range(1, 21)})
+
+
+@pytest.fixture
+def engine(everhour):
+    return TimesheetSyncEngine(everhour.fetch, lookback_days=7, full_sync_interval=timedelta(days=1), schema=TIMESHEET_SCHEMA)
+
+
+def test_a_second_sync_fetches_only_the_window_and_merges_it(engine, everhour):
+    engine.sync(*MARCH)
+
+    everhour.appointments['a15'] = march(15, hours=4.0)
+    del everhour.appointments['a18']
+    everhour.appointments['b21'] = march(21, hours=2.0)
+    # Older than the window, so only a full reconciliation sees it
+    everhour.appointments['a2'] = march(2, hours=9.0)
+
+    result = engine.sync(*MARCH)
+
+    # The newest appointment was created on the 20th, so the window starts 7 days before
+    assert everhour.fetches == [(date(2024, 3, 1), date(2024, 3, 31)), (date(2024, 3, 13), date(2024, 3, 31))]
+    expected = {**everhour.hours(*MARCH), 'a2': 1.0}
+    assert hours_of(result) == expected
+    assert 'a18' not in hours_of(result)
+    assert engine.states[date(2024, 3, 1), date(2024, 3, 31)].high_water_mark == datetime(2024, 3, 21, 18)
+
+
+def test_the_window_moves_with_the_newest_appointment(engine, everhour):
+    engine.sync(*MARCH)
+    everhour.appointments['b28'] = march(28)
+    engine.sync(*MARCH)
+    everhour.appointments['b29'] = march(29)
+
+    result = engine.sync(*MARCH)
+
+    assert everhour.fetches[-1] == (date(2024, 3, 21), date(2024, 3, 31))
+    assert hours_of(result) == everhour.hours(*MARCH)
+
+
+def test_a_full_reconciliation_runs_after_its_interval(engine, everhour):
+    engine.sync(*MARCH)
+    everhour.appointments['a2'] = march(2, hours=9.0)
+    engine.full_sync_interval = timedelta(0)
+
+    result = engine.sync(*MARCH)
+
+    assert everhour.fetches[-1] == (date(2024, 3, 1), date(2024, 3, 31))
+    assert hours_of(result)['a2'] == 9.0
+
+
+def test_a_range_created_long_after_its_last_day_is_not_fetched_again(everhour):
+    everhour.appointments = {f'a{day}': march(day, created_on=30) for day in range(1, 6)}
+    engine = TimesheetSyncEngine(everhour.fetch, lookback_days=7, full_sync_interval=timedelta(days=1), schema=TIMESHEET_SCHEMA)
+    first_week = datetime(2024, 3, 1), datetime(2024, 3, 7, 23, 59, 59)
+
+    first = engine.sync(*first_week)
+    again = engine.sync(*first_week)
+
+    assert everhour.fetches == [(date(2024, 3, 1), date(2024, 3, 7))]
+    assert hours_of(again) == hours_of(first)
+
+
+def test_invalidate_widens_the_next_window_and_keeps_the_state(engine, everhour):
+    engine.sync(*MARCH)
+    everhour.appointments['a5'] = march(5, hours=6.0)
+    del everhour.appointments['a6']
+
+    engine.invalidate(date(2024, 3, 5), date(2024, 3, 6))
+    assert list(engine.states) == [(date(2024, 3, 1), date(2024, 3, 31))]
+
+    result = engine.sync(*MARCH)
+    assert everhour.fetches[-1] == (date(2024, 3, 5), date(2024, 3, 31))
+    assert hours_of(result) == everhour.hours(*MARCH)
+
+    # Once synced, the window is back to the lookback
+    engine.sync(*MARCH)
+    assert everhour.fetches[-1] == (date(2024, 3, 13), date(2024, 3, 31))
+
+
+def test_invalidating_a_whole_range_fetches_it_whole(engine, everhour):
+    engine.sync(*MARCH)
+
+    engine.invalidate(None, None)
+    engine.sync(*MARCH)
+
+    assert everhour.fetches[-1] == (date(2024, 3, 1), date(2024, 3, 31))
+
+
+@pytest.fixture(scope='module')
+def dataset_class(stub_globals):
+    from omni_models.datasets.timesheet_dataset.main import TimesheetDataset
+    return TimesheetDataset
+
+
+def test_reads_of_the_current_month_are_synced_again_after_the_refresh_interval(dataset_class):
+    today = date.today()
+    first = datetime.combine(today.replace(day=1), datetime.min.time())
+    month = first, datetime.combine(today, datetime.max.time())
+    everhour = FakeEverhour({'a1': (first.date(), first, 1.0)})
+
+    dataset = dataset_class.__new__(dataset_class)
+    dataset.logger = logging.getLogger('test')
+    dataset.sync = TimesheetSyncEngine(everhour.fetch, lookback_days=7, full_sync_interval=timedelta(days=1), schema=TIMESHEET_SCHEMA)
+    dataset.memory = TimesheetMemoryCache(on_evict=dataset.sync.forget)
+    dataset.open_month_refresh = timedelta(minutes=5)
+    dataset.facts = SimpleNamespace(invalidate=lambda after, before: None)
+    dataset.version = 0
+    dataset.month_versions = {}
+    dataset._load_from_disk = lambda after, before: None
+
+    dataset.get(*month)
+    dataset.get(*month)
+    assert len(everhour.fetches) == 1
+
+    everhour.appointments['a2'] = (first.date(), first, 2.0)
+    # As if the refresh interval had passed
+    dataset.memory.entries[0].expires_at = datetime.now()
+
+    assert hours_of(dataset.get(*month)) == {'a1': 1.0, 'a2': 2.0}
+    assert everhour.fetches[-1] == (first.date(), today.replace(day=calendar.monthrange(today.year, today.month)[1]))
+    assert dataset._refresh_after(datetime(2024, 1, 31)) is None
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+from omni_models.syntactic.wordpress.client import Wordpress
+
+
+def site(url):
+    client = Wordpress(url)
+    response = lambda request_url: SimpleNamespace(raise_for_status=lambda: None, json=lambda: {'guid': {'rendered': request_url}})
+    client.session = SimpleNamespace(get=lambda request_url, **_: response(request_url))
+    return client
+
+
+def test_sites_do_not_read_each_others_cached_calls(shared_cache):
+    ontology, insights = site('https://ontology.eximia.co'), site('https://insights.eximia.co')
+
+    assert ontology.fetch_media_url('7') == 'https://ontology.eximia.co/wp-json/wp/v2/media/7'
+    assert insights.fetch_media_url('7') == 'https://insights.eximia.co/wp-json/wp/v2/media/7'
+    assert site('https://ontology.eximia.co').fetch_media_url('7') == 'https://ontology.eximia.co/wp-json/wp/v2/media/7'
@@ -1,5 +1,6 @@
 from omni_models.omnimodels import OmniModels
 from omni_models.omnidatasets import OmniDatasets
+from omni_utils.decorators.cache import clear_calls
 from datetime import datetime
 
 try:
@@ -22,6 +23,10 @@ def update():
     global omni_datasets
     global last_update_time
 
+    # The rebuilt models must fetch from upstream, not from calls cached by the previous ones
+    clear_calls()
     omni_models = OmniModels()
     omni_datasets = OmniDatasets(omni_models)
+    # Facts of closed months outlive the process, and hold what the previous models said
+    omni_datasets.timesheets.clear_facts()
     last_update_time = datetime.now()
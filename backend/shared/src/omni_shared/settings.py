@@ -29,5 +29,47 @@ elk_settings = {
 }
 
 graphql_settings = {
-    "require_auth": os.environ.get("GRAPHQL_REQUIRE_AUTH", "True").lower() == "true"
-}
\ No newline at end of file
+    "require_auth": os.environ.get("GRAPHQL_REQUIRE_AUTH", "True").lower() == "true",
+    # Threads the ASGI server runs synchronous resolvers on
+    "worker_threads": int(os.environ.get("GRAPHQL_WORKER_THREADS", "16")),
+    "persisted_queries_size": int(os.environ.get("GRAPHQL_PERSISTED_QUERIES_SIZE", "1000")),
+    "response_cache_size": int(os.environ.get("GRAPHQL_RESPONSE_CACHE_SIZE", "512")),
+    # Cached responses skip the timesheet sync, so this bounds how stale they get
+    "response_cache_ttl_seconds": int(os.environ.get("GRAPHQL_RESPONSE_CACHE_TTL_SECONDS", "60"))
+}
+
+timesheet_settings = {
+    "sync_lookback_days": int(os.environ.get("TIMESHEET_SYNC_LOOKBACK_DAYS", "7")),
+    "full_sync_interval_minutes": int(os.environ.get("TIMESHEET_FULL_SYNC_INTERVAL_MINUTES", "60")),
+    # Ranges reaching the current month are synced again when read after this long
+    "open_month_refresh_seconds": int(os.environ.get("TIMESHEET_OPEN_MONTH_REFRESH_SECONDS", "300")),
+    "memory_cache_max_mb": int(os.environ.get("TIMESHEET_MEMORY_CACHE_MAX_MB", "512")),
+    "fetch_concurrency": int(os.environ.get("TIMESHEET_FETCH_CONCURRENCY", "4")),
+    # Appointment exports: rows serialized per streamed chunk, and rows per JSON page by default
+    "export_chunk_rows": int(os.environ.get("TIMESHEET_EXPORT_CHUNK_ROWS", "5000")),
+    "export_page_size": int(os.environ.get("TIMESHEET_EXPORT_PAGE_SIZE", "5000")),
+    # Month partitions kept as tables of the embedded query engine
+    "query_max_months": int(os.environ.get("TIMESHEET_QUERY_MAX_MONTHS", "24"))
+}
+
+everhour_settings = {
+    # Shared by every thread calling Everhour, to stay under its per-key rate limit
+    "requests_per_second": float(os.environ.get("EVERHOUR_REQUESTS_PER_SECOND", "2")),
+    "burst": int(os.environ.get("EVERHOUR_BURST", "4")),
+    "page_size": int(os.environ.get("EVERHOUR_PAGE_SIZE", "10000")),
+    "max_pages": int(os.environ.get("EVERHOUR_MAX_PAGES", "100"))
+}
+
+cache_settings = {
+    # sqlite shares a host between workers; kv (redis) shares every pod
+    "backend": os.environ.get("CACHE_BACKEND", "sqlite"),
+    "sqlite_path": os.environ.get("CACHE_SQLITE_PATH", os.path.join("cache", "omni.sqlite3")),
+    "kv_url": os.environ.get("CACHE_KV_URL", "redis://localhost:6379/0"),
+    "max_mb": int(os.environ.get("CACHE_MAX_MB", "1024")),
+    "default_ttl_seconds": int(os.environ.get("CACHE_DEFAULT_TTL_SECONDS", "600")),
+    "lock_timeout_seconds": int(os.environ.get("CACHE_LOCK_TIMEOUT_SECONDS", "120"))
+}
+
+analytics_settings = {
+    "revenue_tracking_cache_size": int(os.environ.get("REVENUE_TRACKING_CACHE_SIZE", "256"))
+}
@@ -2,55 +2,122 @@ from datetime import datetime, timedelta
 import functools
 import hashlib
 import logging
-import os
-import pickle
-from typing import Callable
+from typing import Callable, Optional
+
+from omni_utils.decorators.cache_backends import CacheBackend, MISSING, create_backend
+from omni_utils.decorators.singleflight import group
 
 logger = logging.getLogger(__name__)
 
+CALL_PREFIX = 'call:'
+MEMO_PREFIX = 'memo:'
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        from omni_shared.settings import cache_settings
+        _backend = create_backend(cache_settings)
+    return _backend
+
+
+def set_backend(backend: CacheBackend):
+    global _backend
+    _backend = backend
+
 
-def _make_key(func, args, kwargs):
-    key = f"{func.__module__}.{func.__name__}:{args}:{kwargs}"
-    logger.info(f'Generating a hash key for: {key}')
-    return hashlib.md5(key.encode()).hexdigest()
+def _settings() -> dict:
+    from omni_shared.settings import cache_settings
+    return cache_settings
 
 
-def cache(func=None, *, remember=False):
+def _scope_prefix(instance) -> str:
+    """Prefix of the keys of every call of an instance's methods: its class and `cache_scope`"""
+    cls = type(instance)
+    scope = getattr(instance, 'cache_scope', None)
+    owner = f"{cls.__module__}.{cls.__qualname__}:{scope}"
+    return hashlib.md5(owner.encode()).hexdigest()[:16] + ':'
+
+
+def _make_key(func, args, kwargs, instance=None):
+    """
+    Identifies a call. Calls of a method are told apart by the class of the
+    instance and, when two instances of a class reach different sources (two
+    sites, two accounts), by the instance's `cache_scope`. Both make up the
+    key's prefix, so the calls of an instance can be cleared together.
+    """
+    if instance is None:
+        key = f"{func.__module__}.{func.__name__}:{args}:{kwargs}"
+        logger.info(f'Generating a hash key for: {key}')
+        return hashlib.md5(key.encode()).hexdigest()
+
+    key = f"{func.__name__}:{args}:{kwargs}"
+    logger.info(f'Generating a hash key for: {type(instance).__qualname__}.{key}')
+    return _scope_prefix(instance) + hashlib.md5(key.encode()).hexdigest()
+
+
+def _compute_shared(key: str, compute: Callable, ttl: Optional[float]):
+    """Reads `key` from the shared backend, computing it under its lock on a miss"""
+    backend = get_backend()
+    result = backend.get(key)
+    if result is not MISSING:
+        return result
+
+    with backend.lock(key, timeout=_settings()['lock_timeout_seconds']):
+        # Another worker may have filled it while we waited for the lock
+        result = backend.get(key)
+        if result is not MISSING:
+            logger.info(f"Cache hit (shared, after waiting) for {key}")
+            return result
+
+        result = compute()
+        backend.set(key, result, ttl=ttl)
+        return result
+
+
+def cache(func=None, *, remember=False, ttl: Optional[float] = None, shared=False):
+    """
+    Caches a method's results per instance. Results are also shared with the
+    other workers only when asked to: `shared=True` (for
+    CACHE_DEFAULT_TTL_SECONDS), a `ttl`, or `remember=True` (until forgotten
+    or evicted). Methods returning frames stay out of the shared tier, as
+    pickling them costs more than recomputing them from the cached API calls.
+    """
     if func is None:
-        return lambda func: cache(func, remember=remember)
+        return lambda func: cache(func, remember=remember, ttl=ttl, shared=shared)
 
     @functools.wraps(func)
     def wrapped(instance, *args, **kwargs):
         if not hasattr(instance, 'cache') or instance.cache is None:
             instance.cache = {}
-        key = _make_key(func, args, kwargs)
-        cache_dir = 'cache'
-        cache_file = os.path.join(cache_dir, key)
+        key = _make_key(func, args, kwargs, instance)
 
         if key in instance.cache:
             logger.info(f"Cache hit for {key}")
             return instance.cache[key]
-        elif remember and os.path.isfile(cache_file):
-            logger.info(f"Cache hit (file) for {key}")
-            with open(cache_file, 'rb') as f:
-                result = pickle.load(f)
-            instance.cache[key] = result
-            return result
-        else:
+
+        def compute():
             logger.info(f"Cache miss for {key}")
             start_time = datetime.now()
             result = func(instance, *args, **kwargs)
             elapsed_time = datetime.now() - start_time
             logger.info(f"Time to execute {func.__name__}: {elapsed_time.total_seconds():.2f} seconds")
-            instance.cache[key] = result
+            return result
 
-            if remember:
-                if not os.path.exists(cache_dir):
-                    os.makedirs(cache_dir)
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(result, f)
+        if remember:
+            load = lambda: _compute_shared(CALL_PREFIX + key, compute, None)
+        elif shared or ttl:
+            load = lambda: _compute_shared(CALL_PREFIX + key, compute, ttl or _settings()['default_ttl_seconds'])
+        else:
+            load = compute
 
-            return result
+        # Concurrent misses in this process wait on the first one
+        result = group.do(key, load, name=f"{func.__module__}.{func.__qualname__}")
+
+        instance.cache[key] = result
+        return result
 
     return wrapped
 
@@ -58,62 +125,41 @@ def cache(func=None, *, remember=False):
 def invalidate_cache(instance, func=None, args=None, kwargs=None):
     if hasattr(instance, 'cache') and instance.cache is not None:
         if func and args is not None and kwargs is not None:
-            key = _make_key(func, args, kwargs)
+            key = _make_key(func, args, kwargs, instance)
             if key in instance.cache:
                 del instance.cache[key]
                 logger.info(f"Cache invalidated for {key}")
-                cache_file = os.path.join('cache', key)
-                if os.path.isfile(cache_file):
-                    os.remove(cache_file)
-                    logger.info(f"Cache file removed for {key}")
+            get_backend().delete(CALL_PREFIX + key)
         else:
             instance.cache.clear()
+            # Only this instance's shared calls; other sources and datasets keep theirs
+            get_backend().clear(CALL_PREFIX + _scope_prefix(instance))
             logger.info("Entire cache invalidated")
-            for file in os.listdir('cache'):
-                os.remove(os.path.join('cache', file))
-            logger.info("All cache files removed")
+
+
+def clear_calls():
+    """Drops the method calls shared between workers, so the next calls reach the upstream APIs again"""
+    get_backend().clear(CALL_PREFIX)
+    logger.info("All shared cache entries removed")
 
 
 @staticmethod
 def memoize(key: str, func: Callable):
-    cache_dir = 'cache'
-    cache_file = os.path.join(cache_dir, f"{key}.cache")
-
-    if os.path.isfile(cache_file):
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
-    
-    result = func()
-    
-    if not os.path.exists(cache_dir):
-        os.makedirs(cache_dir)
-        
-    with open(cache_file, 'wb') as f:
-        pickle.dump(result, f)
-        
-    return result
+    return group.do(key, lambda: _compute_shared(MEMO_PREFIX + key, func, ttl=None), name='memoize')
 
 @staticmethod
 def forget(key: str):
-    cache_dir = 'cache'
-    cache_file = os.path.join(cache_dir, f"{key}.cache")
-    if os.path.isfile(cache_file):
-        os.remove(cache_file)
-        logger.info(f"Cache file removed for {key}")
-        
+    get_backend().delete(MEMO_PREFIX + key)
+    logger.info(f"Cache entry removed for {key}")
+
 @staticmethod
 def list_cache():
-    cache_dir = 'cache'
     cache_files = []
-    for file in os.listdir(cache_dir):
-        if file.endswith('.cache'):
-            path = os.path.join(cache_dir, file)
-            created = datetime.fromtimestamp(os.path.getctime(path))
-            # Adjust for GMT-3 timezone
-            created = created + timedelta(hours=3)
-            cache_files.append({
-                'key': os.path.splitext(file)[0],
-                'created_at': created
-            })
+    for item in get_backend().items(MEMO_PREFIX):
+        # Adjust for GMT-3 timezone
+        created = item['created_at'] + timedelta(hours=3)
+        cache_files.append({
+            'key': item['key'][len(MEMO_PREFIX):],
+            'created_at': created
+        })
     return cache_files
-    
\ No newline at end of file
@@ -0,0 +1,322 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class CacheBackend:
+    """Storage shared by every worker for the `cache`/`memoize` decorators.
+
+    Values are pickled, may expire after `ttl` seconds (None keeps them until
+    evicted), and `lock` serializes the computation of a missing key across
+    processes, so concurrent misses only hit the upstream API once.
+    """
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, prefix: str = '') -> None:
+        raise NotImplementedError
+
+    def items(self, prefix: str = '') -> List[Dict]:
+        raise NotImplementedError
+
+    def acquire(self, key: str, owner: str, lease: float) -> bool:
+        raise NotImplementedError
+
+    def release(self, key: str, owner: str) -> None:
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str, timeout: float = 120, poll_interval: float = 0.05):
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        acquired = self.acquire(key, owner, timeout)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, 1)
+            acquired = self.acquire(key, owner, timeout)
+
+        if not acquired:
+            logger.warning(f"Gave up waiting for the lock on {key}, computing it anyway")
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release(key, owner)
+
+    @staticmethod
+    def _dumps(value: Any) -> Optional[bytes]:
+        try:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Value is not shareable between workers: {e}")
+            return None
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache stored in a local SQLite file, shared by the workers of a host.
+
+    Once the stored values exceed `max_bytes`, the least recently read ones
+    are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS locks ("
+            " key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISSING
+
+        value, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+            return MISSING
+
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        try:
+            return pickle.loads(value)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return MISSING
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = self._dumps(value)
+        if payload is None:
+            return
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            logger.warning(f"Value for {key} is larger than the whole cache, not storing it")
+            return
+
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at, expires_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now, now, now + ttl if ttl else None)
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+
+        conn = self._connection()
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cache entries to stay under {self.max_bytes} bytes")
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = '') -> None:
+        self._connection().execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def items(self, prefix: str = '') -> List[Dict]:
+        rows = self._connection().execute(
+            "SELECT key, created_at, size FROM entries"
+            " WHERE substr(key, 1, ?) = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (len(prefix), prefix, time.time())
+        ).fetchall()
+        return [
+            {'key': key, 'created_at': datetime.fromtimestamp(created_at), 'size': size}
+            for key, created_at, size in rows
+        ]
+
+    def acquire(self, key: str, owner: str, lease: float) -> bool:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("DELETE FROM locks WHERE key = ? AND expires_at <= ?", (key, now))
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, owner, now + lease)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, key: str, owner: str) -> None:
+        self._connection().execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner))
+
+
+class KeyValueCacheBackend(CacheBackend):
+    """Cache stored in a network key-value store shared by every pod.
+
+    `client` follows the redis-py interface (`get`, `set` with `ex`/`nx`,
+    `delete`, `scan_iter`). The store's own memory policy bounds the total
+    size; `max_value_bytes` keeps single huge values out of it.
+    """
+
+    def __init__(self, client, namespace: str = 'omni', max_value_bytes: Optional[int] = None):
+        self.client = client
+        self.namespace = namespace
+        self.max_value_bytes = max_value_bytes
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.namespace}:{kind}:{key}"
+
+    def get(self, key: str) -> Any:
+        payload = self.client.get(self._key('entry', key))
+        if payload is None:
+            return MISSING
+
+        try:
+            return pickle.loads(payload)['value']
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return MISSING
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = self._dumps({'value': value, 'created_at': time.time()})
+        if payload is None:
+            return
+        if self.max_value_bytes is not None and len(payload) > self.max_value_bytes:
+            logger.warning(f"Value for {key} exceeds {self.max_value_bytes} bytes, not storing it")
+            return
+
+        self.client.set(self._key('entry', key), payload, ex=int(ttl) if ttl else None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key('entry', key))
+
+    def clear(self, prefix: str = '') -> None:
+        keys = list(self.client.scan_iter(match=self._key('entry', prefix) + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def items(self, prefix: str = '') -> List[Dict]:
+        result = []
+        start = len(self._key('entry', ''))
+        for name in self.client.scan_iter(match=self._key('entry', prefix) + '*'):
+            payload = self.client.get(name)
+            if payload is None:
+                continue
+            name = name.decode() if isinstance(name, bytes) else name
+            result.append({
+                'key': name[start:],
+                'created_at': datetime.fromtimestamp(pickle.loads(payload)['created_at']),
+                'size': len(payload)
+            })
+        return result
+
+    def acquire(self, key: str, owner: str, lease: float) -> bool:
+        return bool(self.client.set(self._key('lock', key), owner, ex=max(int(lease), 1), nx=True))
+
+    def release(self, key: str, owner: str) -> None:
+        name = self._key('lock', key)
+        current = self.client.get(name)
+        if isinstance(current, bytes):
+            current = current.decode()
+        if current == owner:
+            self.client.delete(name)
+
+
+class InMemoryKeyValueClient:
+    """Local stand-in for the network store, with the subset of the redis-py API we use"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, name: str) -> bool:
+        entry = self._data.get(name)
+        if entry is None:
+            return False
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return False
+        return True
+
+    def get(self, name: str):
+        with self._lock:
+            return self._data[name][0] if self._alive(name) else None
+
+    def set(self, name: str, value, ex: Optional[int] = None, nx: bool = False):
+        with self._lock:
+            if nx and self._alive(name):
+                return None
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def scan_iter(self, match: str = '*'):
+        prefix = match.rstrip('*')
+        with self._lock:
+            names = [name for name in list(self._data) if name.startswith(prefix) and self._alive(name)]
+        return iter(names)
+
+
+def create_backend(settings: Dict) -> CacheBackend:
+    max_bytes = settings['max_mb'] * 1024 * 1024 if settings.get('max_mb') else None
+
+    if settings['backend'] == 'kv':
+        # redis is only needed by deployments that share the cache between pods
+        import redis
+        client = redis.Redis.from_url(settings['kv_url'])
+        return KeyValueCacheBackend(client, max_value_bytes=max_bytes)
+
+    if settings['backend'] == 'memory':
+        return KeyValueCacheBackend(InMemoryKeyValueClient(), max_value_bytes=max_bytes)
+
+    return SQLiteCacheBackend(settings['sqlite_path'], max_bytes=max_bytes)
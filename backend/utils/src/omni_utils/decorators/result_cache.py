@@ -0,0 +1,59 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from omni_utils.decorators.singleflight import group
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Process-local results of an expensive computation, bounded by LRU.
+
+    Unlike `cache`, values are kept as live objects (no pickling), so it suits
+    results that are read many times within a request. Callers put whatever
+    identifies the underlying data (e.g. a version) in the key; `scope` is
+    compared by identity and clears everything when it changes, which is how
+    a rebuild of the models drops results computed from the old ones.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._scope = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], scope: Optional[object] = None) -> Any:
+        with self._lock:
+            if scope is not None and scope is not self._scope:
+                self._entries.clear()
+                self._scope = scope
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = group.do(repr(key), compute, name=self.name)
+
+        with self._lock:
+            if scope is None or scope is self._scope:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        logger.info(f"Results of {self.name} cleared")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,88 @@
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller computes the value; callers arriving while it is in
+    flight wait and receive the same result (or exception). Nothing is kept
+    once the call finishes, so this complements caching rather than replacing it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, str], _Call] = {}
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def do(self, key: str, func: Callable[[], Any], name: str = 'default') -> Any:
+        with self._lock:
+            metrics = self._metrics.setdefault(name, {'executions': 0, 'coalesced': 0, 'saved_seconds': 0.0})
+            call = self._calls.get((name, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(name, key)] = _Call()
+                metrics['executions'] += 1
+            else:
+                call.waiters += 1
+                metrics['coalesced'] += 1
+
+        if not leader:
+            logger.info(f"Waiting on in-flight {name} for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        start = time.monotonic()
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                del self._calls[(name, key)]
+                metrics['saved_seconds'] += elapsed * call.waiters
+            call.done.set()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: dict(metrics, in_flight=sum(1 for call_name, _ in self._calls if call_name == name))
+                for name, metrics in self._metrics.items()
+            }
+
+
+group = SingleFlight()
+
+
+def singleflight(func):
+    from omni_utils.decorators.cache import _make_key
+
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        return group.do(_make_key(func, args, kwargs), lambda: func(*args, **kwargs), name=name)
+
+    return wrapped
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    return group.stats()
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import calendar
+
+
+@dataclass(frozen=True)
+class BusinessYear:
+    """Working days of one year, precomputed once.
+
+    `working` holds one flag per day of the year and `prefix[i]` the number of
+    working days among its first `i` days, so counting the working days of any
+    range inside the year is a subtraction.
+    """
+    year: int
+    working: bytes
+    prefix: Tuple[int, ...]
+    holidays: Dict[date, str]
+
+    def index(self, day: date) -> int:
+        return day.toordinal() - date(self.year, 1, 1).toordinal()
+
+    def count(self, start: date, end: date) -> int:
+        """Working days from start to end, both included; both must fall in this year"""
+        return self.prefix[self.index(end) + 1] - self.prefix[self.index(start)]
+
+
+@lru_cache(maxsize=None)
+def get_business_year(year: int) -> BusinessYear:
+    import holidays
+
+    br_holidays = holidays.BR(years=year)
+    first = date(year, 1, 1)
+    size = 366 if calendar.isleap(year) else 365
+
+    working = bytearray(size)
+    prefix = [0] * (size + 1)
+    for i in range(size):
+        day = first + timedelta(days=i)
+        working[i] = day.weekday() < 5 and day not in br_holidays
+        prefix[i + 1] = prefix[i] + working[i]
+
+    return BusinessYear(
+        year=year,
+        working=bytes(working),
+        prefix=tuple(prefix),
+        holidays={day: name for day, name in br_holidays.items() if day.year == year}
+    )
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    return value
+
+
+def is_working_day(day) -> bool:
+    day = _as_date(day)
+    business_year = get_business_year(day.year)
+    return bool(business_year.working[business_year.index(day)])
+
+
+def count_working_days(start, end) -> int:
+    """Working days from start to end, both included"""
+    start, end = _as_date(start), _as_date(end)
+    if end < start:
+        return 0
+
+    total = 0
+    for year in range(start.year, end.year + 1):
+        total += get_business_year(year).count(
+            max(start, date(year, 1, 1)),
+            min(end, date(year, 12, 31))
+        )
+    return total
+
+
+def count_working_days_in_month(year: int, month: int, up_to_day: Optional[int] = None) -> int:
+    """Working days of a month, or of its first `up_to_day` days (clamped to the month's length)"""
+    last_day = calendar.monthrange(year, month)[1]
+    if up_to_day is not None:
+        last_day = min(last_day, up_to_day)
+    if last_day < 1:
+        return 0
+    return get_business_year(year).count(date(year, month, 1), date(year, month, last_day))
+
+
+def get_working_days(start, end) -> List[date]:
+    start, end = _as_date(start), _as_date(end)
+    return [
+        start + timedelta(days=i)
+        for i in range((end - start).days + 1)
+        if is_working_day(start + timedelta(days=i))
+    ]
+
+
+def get_holidays(start, end) -> List[Tuple[date, str]]:
+    """Holidays from start to end, both included, in date order"""
+    start, end = _as_date(start), _as_date(end)
+    return sorted(
+        (day, name)
+        for year in range(start.year, end.year + 1)
+        for day, name in get_business_year(year).holidays.items()
+        if start <= day <= end
+    )
@@ -43,20 +43,13 @@ def get_last_day_of_month(date_of_interest):
     return datetime(y, m, last_day, 23, 59, 59, 999999)
 
 def get_working_days_in_month(year, month):
-    import holidays
-    
-    # Get all days in month
-    num_days = calendar.monthrange(year, month)[1]
-    
-    # Get Brazil holidays
-    br_holidays = holidays.BR(years=year)
-    
-    # Create list of all dates in month
-    working_days = []
-    for day in range(1, num_days + 1):
-        date = datetime(year, month, day)
-        # Check if weekday (0=Monday, 6=Sunday) and not a holiday
-        if date.weekday() < 5 and date.date() not in br_holidays:  # 0-4 are weekdays
-            working_days.append(date)
-            
-    return working_days
\ No newline at end of file
+    from omni_utils.helpers.business_calendar import get_business_year
+
+    business_year = get_business_year(year)
+    first = datetime(year, month, 1)
+    offset = business_year.index(first.date())
+    return [
+        first.replace(day=day)
+        for day in range(1, calendar.monthrange(year, month)[1] + 1)
+        if business_year.working[offset + day - 1]
+    ]
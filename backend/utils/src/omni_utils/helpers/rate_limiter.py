@@ -0,0 +1,38 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by the threads calling a rate-limited API.
+
+    Up to `burst` calls go through at once; after that callers block so the
+    sustained rate stays under `rate_per_second`.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Blocks until a call is allowed and returns how long it waited"""
+        if not self.rate_per_second:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                delay = (1 - self._tokens) / self.rate_per_second
+
+            time.sleep(delay)
+            waited += delay
@@ -1,4 +1,14 @@
 from datetime import timedelta, datetime, date
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Label of each week seen so far, by the day its Sunday falls on (days since
+# 1970-01-01). There are only ~52 entries per year of data, so it is never pruned.
+_WEEK_LABELS: Dict[int, str] = {}
+_EPOCH = date(1970, 1, 1)
+
 
 class Weeks:
 
@@ -66,3 +76,49 @@ class Weeks:
         star_f = start.strftime('%d/%m')
         end_f = end.strftime('%d/%m')
         return f'{star_f} - {end_f}'
+
+    @staticmethod
+    def week_starts(values) -> pd.Series:
+        """Sunday (at midnight) of the week of each value, computed over the whole column"""
+        days, missing, index = Weeks._to_days(values)
+        starts = (days - (days + 4) % 7).astype('datetime64[D]').astype('datetime64[ns]')
+        starts[missing] = np.datetime64('NaT')
+        return pd.Series(starts, index=index)
+
+    @staticmethod
+    def week_labels(values) -> pd.Series:
+        """Vectorized `get_week_string`: the 'dd/mm - dd/mm' label of each value's week.
+
+        Accepts anything `pd.to_datetime` does; missing values give None.
+        """
+        days, missing, index = Weeks._to_days(values)
+        # 1970-01-01 was a Thursday, so (days + 4) % 7 counts the days since Sunday
+        starts = days - (days + 4) % 7
+        codes, uniques = pd.factorize(starts[~missing])
+
+        labels = np.empty(len(days), dtype=object)
+        labels[~missing] = np.array([Weeks._week_label(start) for start in uniques], dtype=object)[codes]
+        return pd.Series(labels, index=index)
+
+    @staticmethod
+    def _week_label(start: int) -> str:
+        label = _WEEK_LABELS.get(start)
+        if label is None:
+            first = _EPOCH + timedelta(days=int(start))
+            label = Weeks.to_string(first, first + timedelta(days=6))
+            _WEEK_LABELS[start] = label
+        return label
+
+    @staticmethod
+    def _to_days(values) -> (np.ndarray, np.ndarray, pd.Index):
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            # Text columns hold ISO strings, as get_weekly_summary used to parse them
+            series = pd.to_datetime(series, format='ISO8601')
+        if series.dt.tz is not None:
+            # Weeks follow the local calendar date, as in get_week_dates
+            series = series.dt.tz_localize(None)
+        missing = series.isna().to_numpy()
+        days = series.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype('int64')
+        days[missing] = 0
+        return days, missing, series.index
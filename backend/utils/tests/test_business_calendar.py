@@ -0,0 +1,50 @@
+import random
+from datetime import date, datetime, timedelta
+
+import holidays
+import pytest
+
+from omni_utils.helpers import business_calendar as bc
+from omni_utils.helpers.dates import get_working_days_in_month
+
+BR_HOLIDAYS = holidays.BR()
+
+
+def reference_working_days(start, end):
+    days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+    return [day for day in days if day.weekday() < 5 and day not in BR_HOLIDAYS]
+
+def test_christmas_and_new_year_are_not_working_days():
+    assert not bc.is_working_day(date(2024, 12, 25))
+    assert not bc.is_working_day(datetime(2025, 1, 1, 10, 30))
+    assert bc.is_working_day('2024-12-26')
+    assert not bc.is_working_day(date(2024, 12, 28))  # Saturday
+
+def test_ranges_across_years_match_the_day_by_day_count():
+    rnd = random.Random(11)
+    for _ in range(200):
+        start = date(2019, 1, 1) + timedelta(days=rnd.randint(0, 2500))
+        end = start + timedelta(days=rnd.randint(0, 800))
+        expected = reference_working_days(start, end)
+        assert bc.count_working_days(start, end) == len(expected)
+        assert bc.get_working_days(start, end) == expected
+
+def test_empty_range_has_no_working_days():
+    assert bc.count_working_days(date(2024, 5, 10), date(2024, 5, 9)) == 0
+
+@pytest.mark.parametrize("year, month", [(2024, 2), (2024, 11), (2025, 3), (2025, 12)])
+def test_month_counts_match_the_month_listing(year, month):
+    working_days = get_working_days_in_month(year, month)
+    assert all(isinstance(day, datetime) for day in working_days)
+    assert [day.date() for day in working_days] == reference_working_days(
+        date(year, month, 1), (date(year, month, 28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    )
+    assert bc.count_working_days_in_month(year, month) == len(working_days)
+    for up_to_day in (1, 15, 31, 40):
+        assert bc.count_working_days_in_month(year, month, up_to_day) == len([d for d in working_days if d.day <= up_to_day])
+
+def test_holidays_are_listed_in_order_with_their_names():
+    assert bc.get_holidays(date(2024, 12, 20), date(2025, 1, 3)) == [
+        (date(2024, 12, 25), BR_HOLIDAYS.get(date(2024, 12, 25))),
+        (date(2025, 1, 1), BR_HOLIDAYS.get(date(2025, 1, 1)))
+    ]
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import pytest
+from omni_utils.decorators import cache as c
+from omni_utils.decorators.cache_backends import (
+    InMemoryKeyValueClient,
+    KeyValueCacheBackend,
+    MISSING,
+    SQLiteCacheBackend,
+)
+
+
+@pytest.fixture(params=['sqlite', 'kv'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), max_bytes=10_000)
+    return KeyValueCacheBackend(InMemoryKeyValueClient(), max_value_bytes=10_000)
+
+
+@pytest.fixture
+def shared(backend):
+    previous = c._backend
+    c.set_backend(backend)
+    yield backend
+    c.set_backend(previous)
+
+
+def test_set_and_get(backend):
+    backend.set('a', {'x': [1, 2, 3]})
+    assert backend.get('a') == {'x': [1, 2, 3]}
+    assert backend.get('b') is MISSING
+
+def test_ttl_expires(backend):
+    backend.set('a', 1, ttl=1)
+    assert backend.get('a') == 1
+    time.sleep(1.1)
+    assert backend.get('a') is MISSING
+
+def test_delete_and_clear_by_prefix(backend):
+    backend.set('memo:a', 1)
+    backend.set('memo:b', 2)
+    backend.set('call:c', 3)
+    backend.delete('memo:a')
+    assert backend.get('memo:a') is MISSING
+    backend.clear('memo:')
+    assert [item['key'] for item in backend.items()] == ['call:c']
+
+def test_values_larger_than_the_limit_are_not_stored(backend):
+    backend.set('big', 'x' * 20_000)
+    assert backend.get('big') is MISSING
+
+def test_sqlite_evicts_least_recently_read(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), max_bytes=2_500)
+    backend.set('a', 'x' * 1_000)
+    time.sleep(0.01)
+    backend.set('b', 'x' * 1_000)
+    time.sleep(0.01)
+    backend.get('a')
+    backend.set('c', 'x' * 1_000)
+    assert backend.get('a') != MISSING
+    assert backend.get('b') is MISSING
+    assert backend.get('c') != MISSING
+
+def test_lock_is_exclusive(backend):
+    assert backend.acquire('k', 'one', 10)
+    assert not backend.acquire('k', 'two', 10)
+    backend.release('k', 'two')
+    assert not backend.acquire('k', 'two', 10)
+    backend.release('k', 'one')
+    assert backend.acquire('k', 'two', 10)
+
+def test_memoize_and_forget(shared):
+    calls = []
+    fetch = lambda: calls.append(1) or 'value'
+    assert c.memoize('workers', fetch) == 'value'
+    assert c.memoize('workers', fetch) == 'value'
+    assert len(calls) == 1
+    assert [item['key'] for item in c.list_cache()] == ['workers']
+    c.forget('workers')
+    assert c.memoize('workers', fetch) == 'value'
+    assert len(calls) == 2
+
+def test_cache_is_shared_between_instances(shared):
+    calls = []
+
+    class Client:
+        @c.cache(ttl=60)
+        def fetch(self, x):
+            calls.append(x)
+            return x * 2
+
+    assert Client().fetch(2) == 4
+    assert Client().fetch(2) == 4
+    assert calls == [2]
+
+def test_concurrent_misses_compute_once(shared):
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(c.memoize('slow', slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+
+def test_instances_with_different_scopes_do_not_share(shared):
+    class Site:
+        def __init__(self, url):
+            self.cache_scope = url
+            self.url = url
+
+        @c.cache(ttl=60)
+        def fetch_users(self):
+            return f'users of {self.url}'
+
+    assert Site('https://ontology').fetch_users() == 'users of https://ontology'
+    assert Site('https://insights').fetch_users() == 'users of https://insights'
+    assert Site('https://ontology').fetch_users() == 'users of https://ontology'
+
+def test_methods_of_different_classes_do_not_share(shared):
+    class Workers:
+        @c.cache(ttl=60)
+        def fetch(self):
+            return 'workers'
+
+    class Clients:
+        @c.cache(ttl=60)
+        def fetch(self):
+            return 'clients'
+
+    assert Workers().fetch() == 'workers'
+    assert Clients().fetch() == 'clients'
+
+def test_clear_calls_refetches(shared):
+    calls = []
+
+    class Client:
+        @c.cache(ttl=60)
+        def fetch(self):
+            calls.append(1)
+            return len(calls)
+
+    assert Client().fetch() == 1
+    c.memoize('kept', lambda: 'memo')
+    c.clear_calls()
+
+    assert Client().fetch() == 2
+    assert [item['key'] for item in c.list_cache()] == ['kept']
+
+def test_only_opted_in_methods_are_shared(shared):
+    calls = []
+
+    class Dataset:
+        @c.cache
+        def get(self):
+            calls.append('get')
+            return 'frame'
+
+        @c.cache(shared=True)
+        def fetch(self):
+            calls.append('fetch')
+            return 'json'
+
+    assert Dataset().get() == 'frame'
+    assert Dataset().get() == 'frame'
+    assert Dataset().fetch() == 'json'
+    assert Dataset().fetch() == 'json'
+
+    assert calls == ['get', 'get', 'fetch']
+    assert len(shared.items('call:')) == 1
+
+def test_invalidating_an_instance_keeps_the_calls_of_others(shared):
+    calls = []
+
+    class Site:
+        def __init__(self, url):
+            self.cache_scope = url
+
+        @c.cache(shared=True)
+        def fetch(self):
+            calls.append(self.cache_scope)
+            return self.cache_scope
+
+    ontology, insights = Site('https://ontology'), Site('https://insights')
+    ontology.fetch()
+    insights.fetch()
+
+    c.invalidate_cache(ontology)
+
+    assert Site('https://ontology').fetch() == 'https://ontology'
+    assert Site('https://insights').fetch() == 'https://insights'
+    assert calls == ['https://ontology', 'https://insights', 'https://ontology']
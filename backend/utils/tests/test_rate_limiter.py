@@ -0,0 +1,24 @@
+import threading
+import time
+
+from omni_utils.helpers.rate_limiter import RateLimiter
+
+
+def test_burst_goes_through_without_waiting():
+    limiter = RateLimiter(rate_per_second=1, burst=3)
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+def test_sustained_rate_is_respected_across_threads():
+    limiter = RateLimiter(rate_per_second=20, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The first call is free, the other five wait 1/20s each
+    assert time.monotonic() - start >= 0.24
+
+def test_no_rate_means_no_limit():
+    limiter = RateLimiter(rate_per_second=0)
+    assert all(limiter.acquire() == 0.0 for _ in range(100))
@@ -0,0 +1,27 @@
+from omni_utils.decorators.result_cache import ResultCache
+
+
+def test_computes_each_key_once():
+    results = ResultCache('test')
+    calls = []
+    compute = lambda: calls.append(1) or 'value'
+    assert results.get_or_compute(('2025-01-31', ()), compute) == 'value'
+    assert results.get_or_compute(('2025-01-31', ()), compute) == 'value'
+    assert len(calls) == 1
+    assert results.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+def test_evicts_least_recently_used():
+    results = ResultCache('test', max_entries=2)
+    results.get_or_compute('a', lambda: 1)
+    results.get_or_compute('b', lambda: 2)
+    results.get_or_compute('a', lambda: 1)
+    results.get_or_compute('c', lambda: 3)
+    assert results.get_or_compute('a', lambda: 'recomputed') == 1
+    assert results.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+
+def test_changing_scope_drops_previous_results():
+    results = ResultCache('test')
+    first, second = object(), object()
+    results.get_or_compute('a', lambda: 1, scope=first)
+    assert results.get_or_compute('a', lambda: 2, scope=first) == 1
+    assert results.get_or_compute('a', lambda: 3, scope=second) == 3
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from omni_utils.decorators.singleflight import SingleFlight, singleflight
+
+
+def _run_concurrently(target, count=5):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    results = _run_concurrently(lambda: group.do('k', slow, name='slow'))
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+    stats = group.stats()['slow']
+    assert stats['executions'] == 1
+    assert stats['coalesced'] == 4
+    assert stats['in_flight'] == 0
+
+def test_sequential_calls_execute_again():
+    group = SingleFlight()
+    calls = []
+    group.do('k', lambda: calls.append(1))
+    group.do('k', lambda: calls.append(1))
+    assert len(calls) == 2
+
+def test_waiters_receive_the_error():
+    group = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError('boom')
+
+    errors = []
+
+    def call():
+        try:
+            group.do('k', failing)
+        except ValueError as e:
+            errors.append(e)
+
+    _run_concurrently(call, count=3)
+    assert len(errors) == 3
+    assert group.stats()['default']['executions'] == 1
+
+def test_decorator_keys_on_arguments():
+    calls = []
+
+    @singleflight
+    def compute(x):
+        calls.append(x)
+        time.sleep(0.1)
+        return x * 2
+
+    assert _run_concurrently(lambda: compute(2), count=3) == [4, 4, 4]
+    assert compute(3) == 6
+    assert calls == [2, 3]
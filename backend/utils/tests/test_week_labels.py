@@ -0,0 +1,40 @@
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from omni_utils.helpers.weeks import Weeks
+
+
+@pytest.fixture
+def moments():
+    rnd = random.Random(3)
+    return [datetime(1990, 1, 1) + timedelta(seconds=rnd.randint(0, 50 * 365 * 86400)) for _ in range(2000)]
+
+def test_week_labels_match_get_week_string(moments):
+    expected = [Weeks.get_week_string(moment) for moment in moments]
+    assert Weeks.week_labels(pd.Series(moments)).tolist() == expected
+    assert Weeks.week_labels([moment.isoformat() for moment in moments]).tolist() == expected
+
+def test_week_starts_match_get_week_dates(moments):
+    expected = [Weeks.get_week_dates(moment)[0] for moment in moments]
+    assert Weeks.week_starts(moments).tolist() == expected
+
+@pytest.mark.parametrize("value, expected", [
+    ('2023-05-07', '07/05 - 13/05'),  # Sunday
+    ('2023-05-13T23:59:59', '07/05 - 13/05'),  # Saturday
+    ('2023-12-31T10:00:00', '31/12 - 06/01'),
+])
+def test_week_labels_boundaries(value, expected):
+    assert Weeks.week_labels([value]).tolist() == [expected]
+
+def test_week_labels_keep_local_dates_and_index():
+    series = pd.Series(pd.to_datetime(['2023-05-14 01:00']).tz_localize('America/Sao_Paulo'), index=[42])
+    labels = Weeks.week_labels(series)
+    assert labels.index.tolist() == [42]
+    assert labels.tolist() == ['14/05 - 20/05']
+
+def test_missing_values_have_no_label():
+    assert Weeks.week_labels(['2023-05-10', None]).tolist() == ['07/05 - 13/05', None]
+    assert Weeks.week_labels(pd.Series([], dtype=object)).tolist() == []